@@ -21,6 +21,7 @@ from here_search_demo.entity.request import Request
 from here_search_demo.entity.response import Response
 from here_search_demo.entity.response_data import ResponseData, make_response
 from here_search_demo.http import HTTPSession, IS_BROWSER_RUNTIME
+from here_search_demo.tracing import trace_stage
 
 import orjson
 from yarl import URL
@@ -140,7 +141,8 @@ class API:
             req_headers,
         )
         rsp_x_headers = self.get_x_headers(rsp_headers)
-        immutable_payload = make_response(cast(ResponseData, payload)) if isinstance(payload, dict) else payload
+        with trace_stage("parse"):
+            immutable_payload = make_response(cast(ResponseData, payload)) if isinstance(payload, dict) else payload
         response = Response(data=immutable_payload, req=request, x_headers=rsp_x_headers, raw=rsp_text)
         self.cache[cache_key] = response
         self.do_log(request)
@@ -209,19 +211,22 @@ class API:
         data: str | None,
         headers: dict,
     ) -> tuple[str | URL, dict, str, Mapping[str, str]]:  # pragma: no cover
-        if IS_BROWSER_RUNTIME:
-            token = await self._credentials.atoken
-        else:
-            token = self._credentials.token
+        with trace_stage("token"):
+            if IS_BROWSER_RUNTIME:
+                token = await self._credentials.atoken
+            else:
+                token = self._credentials.token
         req_headers = {"Authorization": f"Bearer {token}"}
         if headers:
             req_headers.update(headers)
 
-        async with session.request(method, url, params=params, data=data, headers=req_headers) as get_response:
-            rsp_headers: Mapping[str, str] = get_response.headers
-            text = await get_response.text()
-            self.raise_for_status and get_response.raise_for_status()
-            content_type = rsp_headers.get("content-type") or rsp_headers.get("Content-Type", "")
+        with trace_stage("network"):
+            async with session.request(method, url, params=params, data=data, headers=req_headers) as get_response:
+                rsp_headers: Mapping[str, str] = get_response.headers
+                text = await get_response.text()
+                self.raise_for_status and get_response.raise_for_status()
+        content_type = rsp_headers.get("content-type") or rsp_headers.get("Content-Type", "")
+        with trace_stage("parse"):
             if "application/json" in content_type or "application/geo+json" in content_type:
                 payload = orjson.loads(text)
             else:
@@ -241,6 +246,7 @@ class API:
             x_headers=cached_response.x_headers,
             req=cached_response.req,
             raw=cached_response.raw,
+            cached=True,
         )
         self.do_log(cached_response.req, extra_columns=["(cached)"])
         return response
@@ -10,6 +10,7 @@
 import asyncio
 import traceback
 from dataclasses import dataclass, replace
+from time import perf_counter_ns
 from typing import Callable, Mapping, Protocol, Tuple, runtime_checkable
 
 from here_search_demo import __version__
@@ -37,6 +38,8 @@ from here_search_demo.event import (
     TextSearchEvent,
 )
 from here_search_demo.http import HTTPSession
+from here_search_demo.segmented_search import SegmentedSearch
+from here_search_demo.tracing import LatencyTracer, LoopLagMonitor, trace_stage
 from here_search_demo.user import DefaultUser, UserProfile
 
 
@@ -95,6 +98,14 @@ class OneBoxCore:
     :param suggestions_limit: Number of autosuggest items to expose.
     :param terms_limit: Number of term suggestions to expose.
     :param max_transient_keep: Maximum queued transient-text intents retained.
+    :param tracer: Optional :class:`~here_search_demo.tracing.LatencyTracer` recording
+        per-intent stage latencies from queue wait to paint.
+    :param loop_lag: Optional :class:`~here_search_demo.tracing.LoopLagMonitor`
+        sampling the event-loop lag while the app runs.
+    :param segmented_search: :class:`~here_search_demo.segmented_search.SegmentedSearch`
+        sending discover and browse events once per route segment when the
+        request context carries several. Defaults to one with
+        ``max_concurrency`` concurrent segment requests.
     """
 
     default_results_limit = 20
@@ -115,6 +126,9 @@ class OneBoxCore:
         suggestions_limit: int | None = None,
         terms_limit: int | None = None,
         max_transient_keep: int | None = None,
+        tracer: LatencyTracer | None = None,
+        loop_lag: LoopLagMonitor | None = None,
+        segmented_search: SegmentedSearch | None = None,
     ):
         self.task = None
         self.api = api or API()
@@ -135,6 +149,9 @@ class OneBoxCore:
         self.x_headers = None
         self._running: bool = False
         self._postprocess_callbacks: list[Callable] = []
+        self.tracer = tracer
+        self.loop_lag = loop_lag
+        self.segmented_search = segmented_search or SegmentedSearch()
 
     def triage_intent(
         self, intent: SearchIntent, context: RequestContext
@@ -187,8 +204,11 @@ class OneBoxCore:
         # because the sentinel is only used by the long-running loop.
         if intent is None or event is None or handler is None:
             raise RuntimeError("wait_for_search_event returned sentinel values in handle_search_event")
-        resp = await event.get_response(api=self.api, config=config, session=session)
+        sent_ns = perf_counter_ns()
+        resp = await self._get_response(event, config, session)
+        self._on_search_round_trip(intent, resp, perf_counter_ns() - sent_ns)
         self._handle_search_response(intent, handler, resp)
+        self._finish_trace(intent)
         return intent, event, resp
 
     async def handle_search_events(self):
@@ -209,15 +229,19 @@ class OneBoxCore:
                     is_transient = intent.kind == "transient_text"
 
                     try:
-                        resp = await event.get_response(api=self.api, config=config, session=session)
+                        sent_ns = perf_counter_ns()
+                        resp = await self._get_response(event, config, session)
                     except asyncio.CancelledError:
                         raise
+                    self._on_search_round_trip(intent, resp, perf_counter_ns() - sent_ns)
 
                     if is_transient and self._has_pending_newer_transient(intent):
+                        self._finish_trace(intent, painted=False)
                         self.queue.task_done()
                         continue
 
                     self._handle_search_response(intent, handler, resp)
+                    self._finish_trace(intent)
 
                     # Run any post-processing hooks before marking the task as done,
                     # so await app.stop() only completes after UI handlers finish.
@@ -232,10 +256,26 @@ class OneBoxCore:
                     except asyncio.QueueEmpty:
                         break
 
+    async def _get_response(
+        self, event: SearchEvent, config: EndpointConfig | LookupConfig | NoConfig | None, session: HTTPSession
+    ) -> Response:
+        """Return the response of *event*, segmented along the route when its context asks for it."""
+        if self.segmented_search.supports(event):
+            return await self.segmented_search.get_response(event, self.api, config, session)
+        return await event.get_response(api=self.api, config=config, session=session)
+
     def _handle_search_response(
         self, intent: SearchIntent, handler: Callable[[SearchIntent, Response], None], resp: Response
     ) -> None:
-        handler(intent, resp)  # pragma: no cover
+        with trace_stage("paint"):
+            handler(intent, resp)  # pragma: no cover
+
+    def _on_search_round_trip(self, intent: SearchIntent, resp: Response, elapsed_ns: int) -> None:
+        """Instrumentation hook called with the time spent in ``event.get_response``."""
+
+    def _finish_trace(self, intent: SearchIntent, painted: bool = True) -> None:
+        if self.tracer is not None:
+            self.tracer.finish(intent, painted=painted)
 
     def _has_pending_newer_transient(self, intent: SearchIntent) -> bool:
         pending = getattr(self.queue, "_queue", None)
@@ -258,6 +298,7 @@ class OneBoxCore:
     ]:
         """Wait for the next intent, and resolve it via triage_intent."""
         intent: SearchIntent = await self.queue.get()
+        dequeued_ns = perf_counter_ns()
 
         if intent.kind == "__stop__":
             # Mark this item as done; caller will handle the sentinel.
@@ -287,8 +328,12 @@ class OneBoxCore:
             for _ in range(extra_gets):
                 self.queue.task_done()
 
-        context = self._get_context()
-        event, handler, config = self.triage_intent(intent=intent, context=context)
+        if self.tracer is not None:
+            self.tracer.record(intent, "queue", intent.time, dequeued_ns)
+            self.tracer.activate(intent)
+        with trace_stage("triage"):
+            context = self._get_context()
+            event, handler, config = self.triage_intent(intent=intent, context=context)
         return intent, event, handler, config
 
     def _get_context(self) -> RequestContext:
@@ -361,6 +406,8 @@ class OneBoxCore:
         :rtype: OneBoxCore
         """
         self._running = True
+        if self.loop_lag is not None:
+            self.loop_lag.start()
         coro = (handle_search_events or self.handle_search_events)()
         self.task = asyncio.ensure_future(coro)
         self.task.add_done_callback(OneBoxCore._done_handler)
@@ -374,6 +421,8 @@ class OneBoxCore:
           * the consumer task has exited.
         """
         self._running = False
+        if self.loop_lag is not None:
+            self.loop_lag.stop()
 
         # Wake up handle_search_events if it is blocked on queue.get\(\).
         try:
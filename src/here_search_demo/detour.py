@@ -17,22 +17,102 @@ The excursion distance for a given result is:
 
     dist(at → result) + dist(result → stop) − route_length
 
-The polylines for both legs are stored on each reranked item so they can be
-displayed without an additional routing call.
+The ``"via"`` engine issues one ``at → via(result) → stop`` routing call per
+result and stores the polylines of both legs on each reranked item, so they
+can be displayed without an additional routing call.
+
+The ``"matrix"`` engine gets the same travel times and distances from two
+matrix computations, ``at → (results, stop)`` and ``results → stop``, and
+leaves the leg polylines to be fetched (:meth:`DetourRanker.detour_polylines`)
+for the results the user actually selects.
+
+Both engines use the HERE Routing and Matrix Routing APIs, or any
+:class:`RoutingBackend`, such as the local :class:`StraightLineRouter`.
+
+Given the :class:`~here_search_demo.widgets.route_geometry.RouteIndex` of the
+route, results are first estimated locally (:func:`estimate_detours`): those
+whose estimated excursion already exceeds ``max_excursion``, or which fall
+outside the ``top_k`` best estimates, are not routed at all.
+
+Routing requests are bounded: at most ``max_concurrency`` via routes are in
+flight, and a rerank waits at most ``deadline_s`` seconds for them.  Results
+whose route did not arrive in time (or failed) are ranked on a great-circle
+estimate calibrated on the direct route, and flagged ``"estimated"``.
 """
 
 import asyncio
 import logging
-from collections.abc import Callable
-from dataclasses import dataclass
-from typing import Any
+import math
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from itertools import pairwise
+from typing import TYPE_CHECKING, Any, Protocol
+
+import orjson
 
 from here_search_demo.auth import Credentials
 from here_search_demo.entity.response import Response
 from here_search_demo.http import HTTPSession, IS_BROWSER_RUNTIME
 
+if TYPE_CHECKING:
+    from here_search_demo.widgets.route_geometry import RouteIndex
+
 logger = logging.getLogger(__name__)
 
+_LatLon = tuple[float, float]
+
+
+class RoutingBackend(Protocol):
+    """Routing service used by :class:`DetourRanker` in place of the HERE APIs."""
+
+    async def route(self, session: HTTPSession, waypoints: list[_LatLon]) -> list[tuple[int, int, str]]:
+        """Return the ``(duration_s, length_m, polyline)`` of each section of the route through *waypoints*."""
+        ...
+
+    async def matrix(
+        self, session: HTTPSession, origins: list[_LatLon], destinations: list[_LatLon]
+    ) -> tuple[list[list[int | None]], list[list[int | None]]]:
+        """Return the travel durations (s) and lengths (m), indexed ``[origin][destination]``.
+
+        Entries are ``None`` for unroutable pairs.
+        """
+        ...
+
+
+class StraightLineRouter:
+    """Local :class:`RoutingBackend` travelling along great circles.
+
+    Good enough as an offline stand-in for the routing services and in tests.
+
+    :param speed_kmh: Average speed
+    :param circuity: Ratio of road to great-circle distances
+    """
+
+    default_speed_kmh = 60.0
+    default_circuity = 1.3
+
+    def __init__(self, speed_kmh: float | None = None, circuity: float | None = None):
+        self.speed_kmh = speed_kmh or StraightLineRouter.default_speed_kmh
+        self.circuity = circuity or StraightLineRouter.default_circuity
+
+    def _leg(self, a: _LatLon, b: _LatLon) -> tuple[int, int]:
+        from here_search_demo.widgets.route_geometry import haversine_m
+
+        length = haversine_m(*a, *b) * self.circuity
+        return round(length / (self.speed_kmh / 3.6)), round(length)
+
+    async def route(self, session: HTTPSession, waypoints: list[_LatLon]) -> list[tuple[int, int, str]]:
+        from flexpolyline import encode
+
+        return [(*self._leg(a, b), encode([a, b])) for a, b in pairwise(waypoints)]
+
+    async def matrix(
+        self, session: HTTPSession, origins: list[_LatLon], destinations: list[_LatLon]
+    ) -> tuple[list[list[int | None]], list[list[int | None]]]:
+        legs = [[self._leg(origin, destination) for destination in destinations] for origin in origins]
+        return [[dur for dur, _ in row] for row in legs], [[length for _, length in row] for row in legs]
+
 
 @dataclass
 class _DetourLegs:
@@ -47,10 +127,10 @@ class _DetourLegs:
 
     dur_to: int
     dist_to: int
-    poly_to: str
+    poly_to: str | None
     dur_from: int
     dist_from: int
-    poly_from: str
+    poly_from: str | None
 
     def excursion_m(self, direct_dist_m: int) -> int:
         """Extra distance vs. the direct ``at → stop`` route, in metres."""
@@ -62,6 +142,106 @@ class _DetourLegs:
         return seconds / 60
 
 
+@dataclass
+class _DetourEstimate:
+    """Excursion estimated from the projection of a result onto the route.
+
+    * ``off_route_m`` – distance from the result to the route
+    * ``excursion_m`` – estimate of the excursion distance (see :func:`estimate_detours`)
+    * ``dur_to``      – estimated seconds from the current position to the result
+    * ``detour_s``    – estimated seconds added to the journey
+    """
+
+    off_route_m: float
+    excursion_m: float
+    dur_to: float
+    detour_s: float
+
+    def sort_key(self, all_along: bool) -> float:
+        """Estimate of :meth:`_DetourLegs.sort_key`, less the constant ``at → stop`` time when *all_along*."""
+        return (self.detour_s if all_along else self.dur_to) / 60
+
+
+def estimate_detours(
+    index: "RouteIndex",
+    at_pos: _LatLon,
+    stop_pos: _LatLon,
+    vias: list[_LatLon],
+    default_speed_mps: float = 50 / 3.6,
+    direct_slack: float = 1.25,
+) -> list[_DetourEstimate]:
+    """Estimate the excursions to *vias* from their projection onto the route.
+
+    Roads are no shorter than great circles, so ``at → via → stop`` is at
+    least as long as its great-circle legs.  The routed direct ``at → stop``
+    trip is not known yet: it is assumed at most *direct_slack* times as long
+    as the way back to the route from *at_pos* plus the route ahead.  The sum
+    of the great-circle legs minus that length is then a lower bound of the
+    excursion distance; it is only an estimate when the fastest direct trip
+    is longer still.
+
+    Times assume the result is reached by driving along the route to its
+    projection, then straight to it, at the speed of the route span there
+    (back along the route, if the projection lies behind *at_pos*).
+
+    :param index: Route index
+    :param at_pos: Current position, projected onto the route
+    :param stop_pos: Route destination
+    :param vias: Result positions
+    :param default_speed_mps: Speed used on spans without duration
+    :param direct_slack: Assumed maximum ratio of the direct trip length to
+        the route length ahead
+    """
+    from here_search_demo.widgets.route_geometry import haversine_m
+
+    cum, elapsed = index.coords.cumulative_m, index.elapsed_s
+    at_segment, at_t, at_off_route_m = index.locate(*at_pos)
+    at_elapsed = index.elapsed_on(at_segment, at_t)
+    direct_max_m = (at_off_route_m + float(cum[-1]) - index.distance_on(at_segment, at_t)) * direct_slack
+    estimates = []
+    for lat, lon in vias:
+        segment, t, off_route_m = index.locate(lat, lon)
+        if len(cum) > 1:
+            length = float(cum[segment + 1] - cum[segment])
+            duration = elapsed[segment + 1] - elapsed[segment]
+        else:
+            length = duration = 0.0
+        speed = length / duration if duration > 0 and length > 0 else default_speed_mps
+        via_elapsed = index.elapsed_on(segment, t)
+        behind_s = max(0.0, at_elapsed - via_elapsed)
+        off_route_s = off_route_m / speed
+        estimates.append(
+            _DetourEstimate(
+                off_route_m=off_route_m,
+                excursion_m=max(0.0, haversine_m(*at_pos, lat, lon) + haversine_m(lat, lon, *stop_pos) - direct_max_m),
+                dur_to=abs(via_elapsed - at_elapsed) + off_route_s,
+                detour_s=2 * (off_route_s + behind_s),
+            )
+        )
+    return estimates
+
+
+@dataclass
+class DetourReport:
+    """Outcome of the pre-filter of the last :meth:`DetourRanker.rerank`.
+
+    * ``positioned``     – results with a position
+    * ``pruned_excursion`` – results whose estimated excursion exceeds ``max_excursion``
+    * ``pruned_top_k``   – results outside the ``top_k`` best estimates
+    * ``routed``         – results routed
+    * ``calls_avoided``  – routing requests saved by the pruning
+    * ``excluded``       – indices of the positioned results left out of the
+      ranking so far: pruned, or dropped once routed
+    """
+
+    positioned: int
+    pruned_excursion: int = 0
+    pruned_top_k: int = 0
+    routed: int = 0
+    calls_avoided: int = 0
+    excluded: set[int] = field(default_factory=set, repr=False)
+
+
 class DetourRanker:
     """Reranks search result items by minimal excursion distance from a route.
 
@@ -74,6 +254,19 @@ class DetourRanker:
         Used as the origin for routing calculations.
     stop_pos:
         ``(latitude, longitude)`` of the route destination.
+    backend:
+        :class:`RoutingBackend` replacing the HERE Routing and Matrix Routing APIs.
+    engine:
+        ``"via"`` for one routing call per result, ``"matrix"`` for two matrix
+        computations per rerank, the leg polylines being fetched on demand.
+    route_index:
+        :class:`~here_search_demo.widgets.route_geometry.RouteIndex` of the
+        route, enabling the pre-filter of results before routing.
+    max_concurrency:
+        Maximum number of via routing requests in flight.
+    deadline_s:
+        Maximum time a rerank waits for its routes, in seconds; ``math.inf``
+        waits for all of them.
     """
 
     routing_url_tpl = (
@@ -83,6 +276,13 @@ class DetourRanker:
         "&return=summary,polyline"
         "&transportMode=car"
     )
+    matrix_url = "https://matrix.router.hereapi.com/v8/matrix?async=false"
+    # Synchronous (flexible) matrix requests are limited to 15 origins and 100 destinations.
+    matrix_max_origins = 15
+    matrix_max_destinations = 100
+    engines = ("via", "matrix")
+    default_max_concurrency = 8
+    default_deadline_s = 10.0
 
     def __init__(
         self,
@@ -91,18 +291,37 @@ class DetourRanker:
         stop_pos: tuple[float, float],
         on_routing_request: Callable[[], None] | None = None,
         route_cache: dict | None = None,
+        backend: RoutingBackend | None = None,
+        engine: str = "via",
+        route_index: "RouteIndex | None" = None,
+        max_concurrency: int | None = None,
+        deadline_s: float | None = None,
     ):
+        if engine not in DetourRanker.engines:
+            raise ValueError(f"invalid detour engine {engine!r}: expected one of {DetourRanker.engines}")
         self.credentials = credentials
         self.at_pos = at_pos
         self.stop_pos = stop_pos
         self.on_routing_request = on_routing_request
-        self._route_cache = route_cache or {}
+        self._route_cache = route_cache if route_cache is not None else {}
+        self.backend = backend
+        self.engine = engine
+        self.route_index = route_index
+        self.max_concurrency = max_concurrency or DetourRanker.default_max_concurrency
+        self.deadline_s = deadline_s or DetourRanker.default_deadline_s
+        self.last_report: DetourReport | None = None
 
     async def _get_token(self) -> str:
         if IS_BROWSER_RUNTIME:
             return await self.credentials.atoken  # pragma: no cover
         return self.credentials.token
 
+    async def _get_headers(self) -> dict:
+        if self.backend is not None:
+            return {}
+        token = await self._get_token()
+        return {"Authorization": f"Bearer {token}"}
+
     async def _fetch_route(self, session: HTTPSession, url: str, headers: dict) -> dict:
         """Make a single GET request to the Routing API and return parsed JSON."""
         async with session.get(url, headers=headers) as resp:
@@ -136,6 +355,12 @@ class DetourRanker:
         )
         if self.on_routing_request is not None:
             self.on_routing_request()
+        if self.backend is not None:
+            ((duration, length, polyline),) = await self.backend.route(
+                session, [(start_lat, start_lon), (stop_lat, stop_lon)]
+            )
+            self._route_cache[cache_key] = duration, length, polyline
+            return duration, length, polyline
         data = await self._fetch_route(session, url, headers)
         section = data["routes"][0]["sections"][0]
         summary = section["summary"]
@@ -181,6 +406,13 @@ class DetourRanker:
 
         if self.on_routing_request is not None:
             self.on_routing_request()
+        if self.backend is not None:
+            (dur_to, dist_to, poly_to), (dur_from, dist_from, poly_from) = await self.backend.route(
+                session, [(start_lat, start_lon), (via_lat, via_lon), (stop_lat, stop_lon)]
+            )
+            result = dur_to, dist_to, poly_to, dur_from, dist_from, poly_from
+            self._route_cache[cache_key] = result
+            return result
         data = await self._fetch_route(session, url, headers)
 
         sections = data["routes"][0]["sections"]
@@ -200,11 +432,87 @@ class DetourRanker:
         self._route_cache[cache_key] = result
         return result
 
+    async def _fetch_matrix(self, session: HTTPSession, body: dict, headers: dict) -> dict:
+        """Make a single synchronous Matrix Routing request and return the parsed ``matrix`` object."""
+        async with session.post(
+            self.matrix_url,
+            data=orjson.dumps(body).decode(),
+            headers={**headers, "Content-Type": "application/json"},
+        ) as resp:
+            resp.raise_for_status()
+            return (await resp.json())["matrix"]
+
+    async def _get_here_matrix(
+        self, session: HTTPSession, origins: list[_LatLon], destinations: list[_LatLon], headers: dict
+    ) -> tuple[list[list[int | None]], list[list[int | None]]]:
+        """Matrix Routing API travel times and distances, one request per block of origins and destinations."""
+        step_o, step_d = DetourRanker.matrix_max_origins, DetourRanker.matrix_max_destinations
+        blocks = [(o, d) for o in range(0, len(origins), step_o) for d in range(0, len(destinations), step_d)]
+
+        async def fetch(o: int, d: int) -> dict:
+            if self.on_routing_request is not None:
+                self.on_routing_request()
+            body = {
+                "origins": [{"lat": lat, "lng": lng} for lat, lng in origins[o : o + step_o]],
+                "destinations": [{"lat": lat, "lng": lng} for lat, lng in destinations[d : d + step_d]],
+                "regionDefinition": {"type": "autoCircle"},
+                "matrixAttributes": ["travelTimes", "distances"],
+                "transportMode": "car",
+            }
+            return await self._fetch_matrix(session, body, headers)
+
+        durations = [[None] * len(destinations) for _ in origins]
+        lengths = [[None] * len(destinations) for _ in origins]
+        for (o, d), matrix in zip(blocks, await asyncio.gather(*(fetch(o, d) for o, d in blocks))):
+            columns = matrix["numDestinations"]
+            errors = matrix.get("errorCodes")
+            for k, (duration, length) in enumerate(zip(matrix["travelTimes"], matrix["distances"])):
+                if errors and errors[k]:
+                    continue
+                durations[o + k // columns][d + k % columns] = duration
+                lengths[o + k // columns][d + k % columns] = length
+        return durations, lengths
+
+    async def _get_matrix(
+        self, session: HTTPSession, origins: list[_LatLon], destinations: list[_LatLon], headers: dict
+    ) -> tuple[list[list[int | None]], list[list[int | None]]]:
+        """Return the travel durations and lengths ``[origin][destination]`` between two lists of positions."""
+        cache_key = "matrix", tuple(origins), tuple(destinations)
+        cached = self._route_cache.get(cache_key)
+        if cached:
+            return cached
+        if self.backend is not None:
+            if self.on_routing_request is not None:
+                self.on_routing_request()
+            result = await self.backend.matrix(session, origins, destinations)
+        else:
+            result = await self._get_here_matrix(session, origins, destinations, headers)
+        self._route_cache[cache_key] = result
+        return result
+
+    async def detour_polylines(self, via_lat: float, via_lon: float, name_hint: str | None = None) -> tuple[str, str]:
+        """Return the ``(at → via, via → stop)`` leg polylines, routing them when not cached yet.
+
+        Used to draw the excursion of a result selected after a ``"matrix"`` rerank.
+        """
+        at_lat, at_lon = self.at_pos
+        stop_lat, stop_lon = self.stop_pos
+        cached = self._route_cache.get(("via", at_lat, at_lon, via_lat, via_lon, stop_lat, stop_lon))
+        if not cached:
+            headers = await self._get_headers()
+            async with HTTPSession() as session:
+                cached = await self.get_route_with_via(
+                    session, at_lat, at_lon, via_lat, via_lon, stop_lat, stop_lon, headers, name_hint=name_hint
+                )
+        _, _, poly_to, _, _, poly_from = cached
+        return poly_to, poly_from
+
     async def rerank(
         self,
         resp: Response,
         all_along: bool = False,
         max_excursion: int | None = None,
+        top_k: int | None = None,
     ) -> Response:
         """Return a new :class:`~here_search_demo.entity.response.Response`
         whose items are sorted by ascending travel time.
@@ -221,10 +529,21 @@ class DetourRanker:
         * ``_detour["polyline_to"]``   – encoded polyline for the ``at → item`` leg
         * ``_detour["polyline_from"]`` – encoded polyline for the ``item → stop`` leg
 
+        With the ``"matrix"`` engine both polylines are ``None`` (see
+        :meth:`detour_polylines`) and items the matrix cannot route are dropped.
+        Items whose routes failed or did not arrive within :attr:`deadline_s`
+        are ranked on an estimate, with ``_detour["estimated"]`` set and no
+        polylines; so is a direct route that failed or cannot be routed.
+
         The excursion distance is computed relative to the direct ``at → stop``
         route (not the full route from its origin), so it correctly reflects
         the extra distance added to the remaining journey.
 
+        With a :attr:`route_index`, items whose estimated excursion (see
+        :func:`estimate_detours`) exceeds ``max_excursion`` or that are not
+        among the ``top_k`` best estimates are dropped before routing (see
+        :attr:`last_report`).
+
         Parameters
         ----------
         resp:
@@ -232,54 +551,196 @@ class DetourRanker:
         max_excursion:
             Maximum allowed excursion in metres.  Items beyond this threshold
             are dropped from the reranked response.
+        top_k:
+            Maximum number of items routed, the best estimates first.
+            Ignored without :attr:`route_index`.
         """
-        items = list(resp.data.get("items", []))
-        if not items:
+        items = resp.data.get("items", [])
+        if not any("position" in item for item in items):
             return resp
+        async with aclosing(self.iter_scored(resp, all_along, max_excursion, top_k)) as scored:
+            scored_items = [entry async for entry in scored]
+        return DetourRanker.ranked_response(resp, scored_items)
 
+    async def iter_scored(
+        self,
+        resp: Response,
+        all_along: bool = False,
+        max_excursion: int | None = None,
+        top_k: int | None = None,
+    ) -> AsyncIterator[tuple[float, int, dict]]:
+        """Yield ``(sort key, item index, annotated item)`` for the items of *resp* as their routes arrive.
+
+        Items are filtered and annotated as by :meth:`rerank`.  The ``"via"``
+        engine yields them in completion order, the ``"matrix"`` engine all at
+        once.  Closing the iterator, or cancelling its consumer, cancels the
+        pending routing requests.
+        """
+        items = resp.data.get("items", [])
         positioned_indices = [i for i, item in enumerate(items) if "position" in item]
+        positioned_indices = self._prefilter(items, positioned_indices, all_along, max_excursion, top_k)
         if not positioned_indices:
-            return resp
-
+            return
         detours_waypoints = [
             (items[i]["position"]["lat"], items[i]["position"]["lng"], items[i].get("address", {}).get("street"))
             for i in positioned_indices
         ]
 
-        summary, detours_routes = await self.retrieve_detours(detours_waypoints)
+        if self.engine == "matrix":
+            try:
+                summary, detours_routes = await asyncio.wait_for(
+                    self.retrieve_matrix_detours(detours_waypoints), self.deadline_s
+                )
+            except TimeoutError:
+                logger.warning("Matrix detours not retrieved within %ss: ranking on estimates", self.deadline_s)
+                summary, detours_routes = None, [None] * len(detours_waypoints)
+            except Exception:
+                logger.exception("Matrix detours retrieval failed: ranking on estimates")
+                summary, detours_routes = None, [None] * len(detours_waypoints)
+            for orig_idx, route_details in zip(positioned_indices, detours_routes):
+                scored = self._score(items, orig_idx, route_details, summary, all_along, max_excursion)
+                if scored is not None:
+                    yield scored
+            return
+        async with aclosing(self.iter_detours(detours_waypoints)) as detours:
+            async for summary, k, route_details in detours:
+                scored = self._score(items, positioned_indices[k], route_details, summary, all_along, max_excursion)
+                if scored is not None:
+                    yield scored
+
+    def _score(
+        self,
+        items: list[dict],
+        orig_idx: int,
+        route_details: tuple,
+        summary: tuple,
+        all_along: bool,
+        max_excursion: int | None,
+    ) -> tuple[float, int, dict] | None:
+        """Return the ``(sort key, index, annotated item)`` of a routed item, ``None`` when it is dropped.
+
+        A ``None`` *summary* or *route_details* (not routed in time, or not
+        routable) is replaced by its estimate.
+        """
+        if summary is not None and summary[1] is None:
+            logger.debug("No direct route from %s to %s: using its estimate", self.at_pos, self.stop_pos)
+            summary = None
+        estimated = summary is None or route_details is None
+        if summary is None:
+            summary = self._estimate_summary()
         _, direct_dist_m, _ = summary
+        if route_details is None:
+            position = items[orig_idx]["position"]
+            route_details = self._estimate_legs((position["lat"], position["lng"]), summary)
+        legs = _DetourLegs(*route_details)
+        if legs.dur_to is None or legs.dur_from is None:
+            logger.debug("Dropping item %d (%s): not routable", orig_idx, items[orig_idx].get("title", ""))
+            self.last_report.excluded.add(orig_idx)
+            return None
+        excursion = legs.excursion_m(direct_dist_m)
+        if max_excursion is not None and excursion > max_excursion:
+            self.last_report.excluded.add(orig_idx)
+            logger.debug(
+                "Dropping item %d (%s): excursion %dm > max %dm",
+                orig_idx,
+                items[orig_idx].get("title", ""),
+                excursion,
+                max_excursion,
+            )
+            return None
+        return legs.sort_key(all_along), orig_idx, self._annotate_item(items[orig_idx], legs, excursion, estimated)
 
-        scored_items: list[tuple[float, int, dict]] = []
-        for orig_idx, route_details in zip(positioned_indices, detours_routes):
-            legs = _DetourLegs(*route_details)
-            excursion = legs.excursion_m(direct_dist_m)
-            if max_excursion is not None and excursion > max_excursion:
-                logger.debug(
-                    "Dropping item %d (%s): excursion %dm > max %dm",
-                    orig_idx,
-                    items[orig_idx].get("title", ""),
-                    excursion,
-                    max_excursion,
-                )
-                continue
-            annotated = self._annotate_item(items[orig_idx], legs, excursion)
-            scored_items.append((legs.sort_key(all_along), orig_idx, annotated))
+    def _estimate_summary(self) -> tuple[int, int, None]:
+        """Direct ``at → stop`` route estimate, at the :class:`StraightLineRouter` defaults."""
+        duration, length = StraightLineRouter()._leg(self.at_pos, self.stop_pos)
+        return duration, length, None
+
+    def _estimate_legs(self, via: _LatLon, summary: tuple) -> tuple[int, int, None, int, int, None]:
+        """Estimate the ``at → via → stop`` legs along great circles.
+
+        The circuity and speed are those of the direct route *summary*.
+        """
+        from here_search_demo.widgets.route_geometry import haversine_m
+
+        direct_s, direct_m, _ = summary
+        crow_m = haversine_m(*self.at_pos, *self.stop_pos)
+        router = StraightLineRouter(
+            speed_kmh=direct_m / direct_s * 3.6 if direct_s and direct_m else None,
+            circuity=max(1.0, direct_m / crow_m) if crow_m and direct_m else None,
+        )
+        dur_to, dist_to = router._leg(self.at_pos, via)
+        dur_from, dist_from = router._leg(via, self.stop_pos)
+        return dur_to, dist_to, None, dur_from, dist_from, None
 
-        scored_items.sort(key=lambda x: x[0])
+    @staticmethod
+    def ranked_response(
+        resp: Response, scored_items: list[tuple[float, int, dict]], pending: list[dict] | None = None
+    ) -> Response:
+        """Return *resp* with the scored items by ascending sort key, followed by the *pending* ones."""
+        ranked = sorted(scored_items, key=lambda x: x[:2])
         reranked_data = dict(resp.data)
-        reranked_data["items"] = [item for _, _, item in scored_items]
+        reranked_data["items"] = [item for _, _, item in ranked] + (pending or [])
         return Response(req=resp.req, data=reranked_data, x_headers=resp.x_headers)
 
+    def _prefilter(
+        self,
+        items: list[dict],
+        positioned_indices: list[int],
+        all_along: bool,
+        max_excursion: int | None,
+        top_k: int | None,
+    ) -> list[int]:
+        """Return the indices of the items worth routing, in their original order, and update :attr:`last_report`."""
+        report = self.last_report = DetourReport(positioned=len(positioned_indices))
+        if self.route_index is not None and (max_excursion is not None or top_k is not None):
+            vias = [(items[i]["position"]["lat"], items[i]["position"]["lng"]) for i in positioned_indices]
+            estimates = estimate_detours(self.route_index, self.at_pos, self.stop_pos, vias)
+            candidates = [
+                (estimate.sort_key(all_along), i)
+                for i, estimate in zip(positioned_indices, estimates)
+                if max_excursion is None or estimate.excursion_m <= max_excursion
+            ]
+            report.pruned_excursion = len(positioned_indices) - len(candidates)
+            if top_k is not None and len(candidates) > top_k:
+                candidates.sort()
+                report.pruned_top_k = len(candidates) - top_k
+                candidates = candidates[:top_k]
+            kept = sorted(i for _, i in candidates)
+        else:
+            kept = positioned_indices
+        report.routed = len(kept)
+        report.excluded = set(positioned_indices).difference(kept)
+        report.calls_avoided = self._routing_requests(report.positioned) - self._routing_requests(report.routed)
+        if report.calls_avoided:
+            logger.debug("Detour pre-filter: %s", report)
+        return kept
+
+    def _routing_requests(self, count: int) -> int:
+        """Number of routing requests of a rerank of *count* positioned items, uncached."""
+        if not count:
+            return 0
+        if self.engine == "via":
+            return count + 1
+        if self.backend is not None:
+            return 2
+        return math.ceil(count / DetourRanker.matrix_max_origins) + math.ceil(
+            (count + 1) / DetourRanker.matrix_max_destinations
+        )
+
     @staticmethod
-    def _annotate_item(item: dict, legs: _DetourLegs, excursion_m: int) -> dict:
-        """Return a copy of *item* with a ``_detour`` annotation attached."""
+    def _annotate_item(item: dict, legs: _DetourLegs, excursion_m: int, estimated: bool = False) -> dict:
+        """Return a copy of *item* with a ``_detour`` annotation attached; estimated figures are marked ``~``."""
         dur_to_min = int(legs.dur_to / 60)
         dur_from_min = int(legs.dur_from / 60)
         excursion_km = abs(int(excursion_m / 1000))
         excursion_sign = "+" if excursion_m >= 0 else "-"
+        about = "~" if estimated else ""
         annotated = dict(item)
         annotated["_detour"] = {
-            "label": f"{item.get('title', '')} ({dur_to_min}min, {dur_from_min}min, {excursion_sign}{excursion_km}km)",
+            "label": (
+                f"{item.get('title', '')} "
+                f"({about}{dur_to_min}min, {about}{dur_from_min}min, {about}{excursion_sign}{excursion_km}km)"
+            ),
             "dur_to_sec": legs.dur_to,
             "dur_from_sec": legs.dur_from,
             "dist_to_m": legs.dist_to,
@@ -287,35 +748,106 @@ class DetourRanker:
             "excursion_m": excursion_m,
             "polyline_to": legs.poly_to,
             "polyline_from": legs.poly_from,
+            "estimated": estimated,
         }
         return annotated
 
-    async def retrieve_detours(self, detours_waypoints: list[tuple[Any, Any, Any]]) -> tuple[tuple[int, int, str], Any]:
-        token = await self._get_token()
-        headers = {"Authorization": f"Bearer {token}"}
+    async def retrieve_detours(
+        self, detours_waypoints: list[tuple[Any, Any, Any]]
+    ) -> tuple[tuple[int, int, str] | None, list[tuple | None]]:
+        """Return the direct ``at → stop`` summary and the via route of each detour.
+
+        Routes that did not arrive within :attr:`deadline_s` are ``None``.
+        """
+        summary, detours_routes = None, [None] * len(detours_waypoints)
+        async with aclosing(self.iter_detours(detours_waypoints)) as detours:
+            async for summary, k, route_details in detours:
+                detours_routes[k] = route_details
+        return summary, detours_routes
+
+    async def retrieve_matrix_detours(
+        self, detours_waypoints: list[tuple[Any, Any, Any]]
+    ) -> tuple[tuple[int, int, None], list[tuple]]:
+        """Return the direct ``at → stop`` summary and the legs of each detour, without polylines.
+
+        Same result shape as :meth:`retrieve_detours`, from an ``at → (items, stop)``
+        and an ``items → stop`` matrix.
+        """
+        headers = await self._get_headers()
+        vias = [(lat, lon) for lat, lon, _ in detours_waypoints]
+        async with HTTPSession() as session:
+            (to_durations, to_lengths), (from_durations, from_lengths) = await asyncio.gather(
+                self._get_matrix(session, [self.at_pos], [*vias, self.stop_pos], headers),
+                self._get_matrix(session, vias, [self.stop_pos], headers),
+            )
+        summary = to_durations[0][-1], to_lengths[0][-1], None
+        detours_routes = [
+            (to_durations[0][i], to_lengths[0][i], None, from_durations[i][0], from_lengths[i][0], None)
+            for i in range(len(vias))
+        ]
+        return summary, detours_routes
+
+    async def iter_detours(
+        self, detours_waypoints: list[tuple[Any, Any, Any]]
+    ) -> AsyncIterator[tuple[tuple[int, int, str] | None, int, tuple | None]]:
+        """Streaming :meth:`retrieve_detours`: yield ``(summary, index, route details)`` as each via route arrives.
 
+        At most :attr:`max_concurrency` via routes are requested at a time.
+        Detours whose route failed, or is still pending once :attr:`deadline_s`
+        has elapsed, are yielded with ``None`` route details; the summary is
+        ``None`` when the direct route did not arrive.  The routing requests
+        left when the iterator is closed are cancelled.
+        """
+        headers = await self._get_headers()
         at_lat, at_lon = self.at_pos
         stop_lat, stop_lon = self.stop_pos
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_s
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def via_route(lat: float, lon: float, name_hint: str | None) -> tuple:
+            async with semaphore:
+                return await self.get_route_with_via(
+                    session, at_lat, at_lon, lat, lon, stop_lat, stop_lon, headers, name_hint=name_hint
+                )
+
+        def route_details(future: asyncio.Future, k: int) -> tuple | None:
+            if future.exception() is not None:
+                logger.warning("Detour %d not routed: %r", k, future.exception())
+                return None
+            return future.result()
 
         async with HTTPSession() as session:
-            all_results = await asyncio.gather(
-                # Baseline: direct route from at_pos to stop_pos
-                self._get_route_summary(session, at_lat, at_lon, stop_lat, stop_lon, headers),
-                # Per-item: at_pos → via(item) → stop_pos in a single call
-                *(
-                    self.get_route_with_via(
-                        session,
-                        at_lat,
-                        at_lon,
-                        detour_waypoint[0],
-                        detour_waypoint[1],
-                        stop_lat,
-                        stop_lon,
-                        headers,
-                        name_hint=detour_waypoint[2],
-                    )
-                    for detour_waypoint in detours_waypoints
-                ),
+            baseline = asyncio.ensure_future(
+                self._get_route_summary(session, at_lat, at_lon, stop_lat, stop_lon, headers)
             )
-        summary, detours_routes = all_results[0], all_results[1:]
-        return summary, detours_routes
+            pending = {
+                asyncio.ensure_future(via_route(lat, lon, name_hint)): k
+                for k, (lat, lon, name_hint) in enumerate(detours_waypoints)
+            }
+            try:
+                await asyncio.wait([baseline], timeout=max(0.0, deadline - loop.time()))
+                summary = None
+                if not baseline.done():
+                    logger.warning("Direct route not retrieved within %ss: ranking on estimates", self.deadline_s)
+                elif baseline.exception() is not None:
+                    logger.warning("Direct route not retrieved (%r): ranking on estimates", baseline.exception())
+                else:
+                    summary = baseline.result()
+                while pending:
+                    done, _ = await asyncio.wait(
+                        pending, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        break
+                    for future in sorted(done, key=pending.get):
+                        k = pending.pop(future)
+                        yield summary, k, route_details(future, k)
+                if pending:
+                    logger.warning("%d detours not routed within %ss", len(pending), self.deadline_s)
+                for k in sorted(pending.values()):
+                    yield summary, k, None
+            finally:
+                baseline.cancel()
+                for future in pending:
+                    future.cancel()
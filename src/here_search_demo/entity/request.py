@@ -66,6 +66,8 @@ class RequestContext:
     :ivar x_headers: optional request-scoped ``X-*`` headers
     :ivar share_experience: whether user opted into experience sharing
     :ivar user_id: optional user id for signaling endpoints
+    :ivar route_segments: optional route sub-corridors searched separately
+        (see :mod:`here_search_demo.segmented_search`)
     """
 
     latitude: float
@@ -77,3 +79,4 @@ class RequestContext:
     x_headers: dict | None = None
     share_experience: bool = False
     user_id: str | None = None
+    route_segments: tuple | None = None
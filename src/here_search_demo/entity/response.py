@@ -26,12 +26,14 @@ class Response:
     :ivar data: parsed JSON payload view
     :ivar x_headers: captured response ``X-*`` headers
     :ivar raw: optional raw response body
+    :ivar cached: whether the response was served from the API cache
     """
 
     req: Request | None
     data: ResponseDataView | None
     x_headers: dict = field(default_factory=dict)
     raw: str | None = None
+    cached: bool = False
 
     @property
     def titles(self):
@@ -31,12 +31,13 @@ else:  # pragma: no cover
     IS_BROWSER_RUNTIME = True
 
 if IS_BROWSER_RUNTIME:
-    from .lite import HTTPConnectionError, HTTPResponseError, HTTPSession
+    from .lite import HTTPClientError, HTTPConnectionError, HTTPResponseError, HTTPSession
 else:  # Fallback to aiohttp, a python asyncio client
     from aiohttp import (
         ClientConnectorError as HTTPConnectionError,
+        ClientError as HTTPClientError,
         ClientResponseError as HTTPResponseError,
         ClientSession as HTTPSession,
     )
 
-__all__ = ["HTTPSession", "HTTPConnectionError", "HTTPResponseError", "IS_BROWSER_RUNTIME"]
+__all__ = ["HTTPSession", "HTTPClientError", "HTTPConnectionError", "HTTPResponseError", "IS_BROWSER_RUNTIME"]
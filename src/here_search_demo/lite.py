@@ -17,11 +17,15 @@ except ImportError:  # pragma: no cover - plain CPython / tests / JupyterLab
     js = None  # type: ignore[assignment]
 
 
-class HTTPConnectionError(Exception):
+class HTTPClientError(Exception):
     pass
 
 
-class HTTPResponseError(Exception):
+class HTTPConnectionError(HTTPClientError):
+    pass
+
+
+class HTTPResponseError(HTTPClientError):
     pass
 
 
@@ -0,0 +1,133 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Run CPU-heavy pure functions off the event loop.
+
+Corridor buffering, polyline decoding and simplification, and the JSON pane
+payload preparation are pure functions of their arguments.  Awaiting them
+through :func:`offload` runs them in a worker pool so that the event loop
+keeps handling keystrokes and widget messages meanwhile.
+
+Calls can be given a *key*: a new call with the same key supersedes the
+previous one, whose awaiting caller gets :class:`asyncio.CancelledError` (a
+not-yet-started job is also dropped from the pool).
+
+In Pyodide there are no threads; functions then run inline, as if awaited
+synchronously.
+
+This module has no widget dependency and can be used by headless heads.
+"""
+
+import asyncio
+import functools
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from here_search_demo.http import IS_BROWSER_RUNTIME
+
+_T = TypeVar("_T")
+
+
+class Offloader:
+    """Executor front-end with keyed supersession.
+
+    :param max_workers: Worker count; ``0`` runs every function inline.
+    :param processes: Use a process pool instead of a thread pool. Functions
+        and arguments must then be picklable.  Threads suit GEOS (shapely
+        releases the GIL) and keep the worker start-up cost out of the way.
+    """
+
+    default_max_workers = 2
+
+    def __init__(self, max_workers: int | None = None, processes: bool = False):
+        self.max_workers = self.default_max_workers if max_workers is None else max_workers
+        self.processes = processes
+        self._executor: Executor | None = None
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self.submitted = 0
+        self.inlined = 0
+        self.superseded = 0
+
+    @property
+    def inline(self) -> bool:
+        """Whether functions run inline on the calling thread."""
+        return IS_BROWSER_RUNTIME or self.max_workers == 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            executor_cls = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            self._executor = executor_cls(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable[..., _T], /, *args: Any, key: Hashable | None = None, **kwargs: Any) -> _T:
+        """Return ``fn(*args, **kwargs)``, computed in the worker pool.
+
+        :param fn: Pure function
+        :param key: Supersession key: cancels the pending call with the same key
+        """
+        if self.inline:
+            self.inlined += 1
+            return fn(*args, **kwargs)
+        if key is not None:
+            previous = self._pending.pop(key, None)
+            if previous is not None and not previous.done():
+                previous.cancel()
+                self.superseded += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+        self.submitted += 1
+        if key is not None:
+            self._pending[key] = future
+        try:
+            return await future
+        finally:
+            if key is not None and self._pending.get(key) is future:
+                del self._pending[key]
+
+    def stats(self) -> dict[str, int]:
+        """Return ``submitted``, ``inlined``, ``superseded`` and ``pending`` call counts."""
+        return {
+            "submitted": self.submitted,
+            "inlined": self.inlined,
+            "superseded": self.superseded,
+            "pending": len(self._pending),
+        }
+
+    def shutdown(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_default_offloader: Offloader | None = None
+
+
+def get_offloader() -> Offloader:
+    """Return the process-wide :class:`Offloader`, creating it on first use."""
+    global _default_offloader
+    if _default_offloader is None:
+        _default_offloader = Offloader()
+    return _default_offloader
+
+
+def set_offloader(offloader: Offloader | None) -> None:
+    """Replace the process-wide :class:`Offloader` (``None`` resets it to the default)."""
+    global _default_offloader
+    if _default_offloader is not None and _default_offloader is not offloader:
+        _default_offloader.shutdown()
+    _default_offloader = offloader
+
+
+async def offload(fn: Callable[..., _T], /, *args: Any, key: Hashable | None = None, **kwargs: Any) -> _T:
+    """Await ``fn(*args, **kwargs)`` computed by the process-wide :class:`Offloader`."""
+    return await get_offloader().run(fn, *args, key=key, **kwargs)
@@ -30,6 +30,10 @@ The combination of both flags yields four modes:
 +------------------+---------------------+-------------------------------+
 | True             | True                | Server + client reranking     |
 +------------------+---------------------+-------------------------------+
+
+Independently, ``time_window`` restricts the searched corridor to the part
+of the route reached within a range of minutes ahead (e.g. fuel between 30
+and 60 minutes ahead).
 """
 
 from dataclasses import dataclass
@@ -49,10 +53,15 @@ class RankingMode:
         When ``True`` the client applies :class:`~here_search_demo.detour.DetourRanker`
         to reorder results by actual driving time and annotate each item
         with detour polylines.
+    time_window:
+        ``(from_mins, to_mins)``: when set, the corridor sent with the search
+        request only covers the route travelled between ``from_mins`` and
+        ``to_mins`` minutes ahead of the current position.
     """
 
     all_along: bool = False
     travel_time: bool = False
+    time_window: tuple[int, int] | None = None
 
     @property
     def server_ranking(self) -> str | None:
@@ -67,4 +76,4 @@ class RankingMode:
     @property
     def needs_route_polyline(self) -> bool:
         """Whether a route (corridor) must be sent with the search request."""
-        return self.all_along or self.travel_time
+        return self.all_along or self.travel_time or self.time_window is not None
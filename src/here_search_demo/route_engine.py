@@ -9,20 +9,103 @@
 
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable
-
-from flexpolyline import decode, encode
+import asyncio
+import math
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from itertools import pairwise
+from typing import Any
 
 from here_search_demo.auth import Credentials
 from here_search_demo.http import HTTPSession, IS_BROWSER_RUNTIME
+from here_search_demo.offload import offload
 from here_search_demo.ranking import RankingMode
+from here_search_demo.route_tracker import RouteProgress, RouteTracker
+from here_search_demo.segmented_search import RouteSegment, RouteSegments
 from here_search_demo.widgets.route_geometry import (
-    elapsed_sec_at_position,
-    position_at_x_sec_ahead,
+    RouteIndex,
     simplify_polyline,
+    simplify_polyline_within,
 )
 
 
+def _decode_route(flexpolyline: str, spans: list) -> tuple[list[tuple[float, float]], RouteIndex]:
+    """Return the waypoints of a route flexpolyline and their :class:`RouteIndex`."""
+    from flexpolyline import decode
+
+    waypoints = decode(flexpolyline)
+    return waypoints, RouteIndex(spans, waypoints)
+
+
+def _encode_search_flexpolyline(
+    waypoints: list[tuple[float, float]], max_waypoints_count: int, tolerance_m: float | None = None
+) -> str:
+    """Return the flexpolyline of *waypoints*, simplified within *tolerance_m* metres, then when too long."""
+    from flexpolyline import encode
+
+    if tolerance_m:
+        waypoints = simplify_polyline_within(waypoints, tolerance_m)
+    if len(waypoints) > max_waypoints_count:
+        waypoints = simplify_polyline(waypoints, max_waypoints_count)
+    return encode(waypoints)
+
+
+def _encode_search_flexpolylines(
+    waypoint_lists: list[list[tuple[float, float]]], max_waypoints_count: int, tolerance_m: float | None = None
+) -> list[str]:
+    """Return the :func:`_encode_search_flexpolyline` of each waypoint list."""
+    return [_encode_search_flexpolyline(waypoints, max_waypoints_count, tolerance_m) for waypoints in waypoint_lists]
+
+
+def _slice_covers(key: tuple[int, int | None], wanted: tuple[int, int | None]) -> bool:
+    """Whether the route slice *key* contains the route slice *wanted*."""
+    return key[0] <= wanted[0] and (key[1] is None or (wanted[1] is not None and key[1] >= wanted[1]))
+
+
+def _split_route(
+    index: RouteIndex, first_m: float, last_m: float, count: int, by: str, overlap_m: float
+) -> list[tuple[float, float]]:
+    """Return ``count`` overlapping ``(start_m, end_m)`` ranges covering the route between two distances.
+
+    Ranges are of equal length (``by="distance"``) or equal travel time
+    (``by="time"``), then extended by half of *overlap_m* on both ends.
+    """
+    if by == "time":
+        cum, elapsed = index.coords.cumulative_m, index.elapsed_s
+        first_s = elapsed[index.segment_at_distance(first_m)]
+        last_s = elapsed[min(index.segment_at_distance(last_m) + 1, len(elapsed) - 1)]
+        bounds = [
+            min(
+                max(
+                    float(cum[min(bisect_left(elapsed, first_s + (last_s - first_s) * k / count), len(cum) - 1)]),
+                    first_m,
+                ),
+                last_m,
+            )
+            for k in range(count + 1)
+        ]
+        bounds[0], bounds[-1] = first_m, last_m
+    else:
+        bounds = [first_m + (last_m - first_m) * k / count for k in range(count + 1)]
+    half = overlap_m / 2
+    return [(max(first_m, start - half), min(last_m, end + half)) for start, end in pairwise(bounds)]
+
+
+def _encode_route_flexpolylines(
+    flexpolyline: str, waypoints: list[tuple[float, float]], max_waypoints_count: int, tolerance_m: float | None = None
+) -> tuple[str, str]:
+    """Return the route flexpolyline and the (simplified, see :func:`_encode_search_flexpolyline`) search flexpolyline."""
+    from flexpolyline import encode
+
+    route_flexpolyline = encode(waypoints)
+    if len(waypoints) > max_waypoints_count or (
+        tolerance_m and len(simplify_polyline_within(waypoints, tolerance_m)) < len(waypoints)
+    ):
+        flexpolyline = _encode_search_flexpolyline(waypoints, max_waypoints_count, tolerance_m)
+    return route_flexpolyline, flexpolyline
+
+
 class RouteEngine:
     """Head-agnostic route state and routing retrieval service.
 
@@ -39,6 +122,12 @@ class RouteEngine:
         "&transportMode=car"
     )
     max_waypoints_count = 2000
+    trim_bucket_m = 5000
+    #: Overlap between consecutive segments of a segmented search, in metres.
+    segment_overlap_m = 2000
+    #: Search polylines are simplified within this fraction of the corridor
+    #: width (``0`` disables the width-aware simplification).
+    simplify_width_fraction = 0.25
 
     def __init__(
         self,
@@ -66,11 +155,46 @@ class RouteEngine:
         self.mins_from_pos: int = 0
         self.ranking_mode = RankingMode()
         self.route_flexpolyline: str | None = None
-        self.search_flexpolyline: str | None = None
+        self.search_flexpolyline = None
         self.waypoints_count: int | None = None
         self.route_summary_length: int | None = None
         self._current_waypoints: list | None = None
         self._cached_spans: list | None = None
+        self._route_index: RouteIndex | None = None
+        self._tracker: RouteTracker | None = None
+        self.progress: RouteProgress | None = None
+        self._search_slice: tuple[int, int | None] | None = None
+        self._slice_task: asyncio.Task | None = None
+        self._segments_task: asyncio.Task | None = None
+        self.segment_count = 0
+        self.segment_by = "distance"
+
+    @property
+    def search_flexpolyline(self) -> str | None:
+        """Flexpolyline sent with along-route searches.
+
+        Once the search position has progressed along the route, this is the
+        part of the route ahead of it.  With a :attr:`time_window`, it is the
+        part of the route travelled within that window from the current
+        progress (or from the route start).  Slices are cut at
+        ``trim_bucket_m`` boundaries around the spans involved and encoded off
+        the event loop once per bucket; until the current slice is ready, the
+        closest encoded slice covering it, or the whole route, is used.
+        """
+        wanted = self._search_slice
+        if wanted is not None and self._slices:
+            ready = [key for key in self._slices if _slice_covers(key, wanted)]
+            if ready:
+                return self._slices[max(ready, key=lambda key: (key[0], -(math.inf if key[1] is None else key[1])))]
+        return self._search_flexpolyline
+
+    @search_flexpolyline.setter
+    def search_flexpolyline(self, value: str | None) -> None:
+        self._search_flexpolyline = value
+        self._slices: dict[tuple[int, int | None], str] = {}
+        self._slice_pending: tuple[int, int | None] | None = None
+        self._segment_sets: dict[tuple, RouteSegments] = {}
+        self._segments_pending: tuple | None = None
 
     @property
     def all_along(self) -> bool:
@@ -78,7 +202,7 @@ class RouteEngine:
 
     @all_along.setter
     def all_along(self, value: bool) -> None:
-        self.ranking_mode = RankingMode(all_along=value, travel_time=self.ranking_mode.travel_time)
+        self.ranking_mode = replace(self.ranking_mode, all_along=value)
 
     @property
     def minimal_detour(self) -> bool:
@@ -86,7 +210,140 @@ class RouteEngine:
 
     @minimal_detour.setter
     def minimal_detour(self, value: bool) -> None:
-        self.ranking_mode = RankingMode(all_along=self.ranking_mode.all_along, travel_time=value)
+        self.ranking_mode = replace(self.ranking_mode, travel_time=value)
+
+    @property
+    def time_window(self) -> tuple[int, int] | None:
+        return self.ranking_mode.time_window
+
+    def set_time_window(self, window: tuple[int, int] | None) -> None:
+        """Restrict along-route searches to the route travelled between two delays.
+
+        :param window: ``(from_mins, to_mins)`` ahead of the current progress,
+            ``None`` to search the whole route ahead
+        """
+        if window is not None:
+            from_mins, to_mins = window
+            if not 0 <= from_mins < to_mins:
+                raise ValueError(f"invalid time window {window!r}: expected 0 <= from < to minutes")
+            window = (from_mins, to_mins)
+        self.ranking_mode = replace(self.ranking_mode, time_window=window)
+        self._update_search_slice()
+
+    def set_segmented_search(self, count: int | None, by: str = "distance") -> None:
+        """Search long routes as *count* overlapping sub-corridors, see :meth:`search_segments`.
+
+        :param count: Number of segments; ``0`` or ``1`` searches a single corridor
+        :param by: ``"distance"`` for segments of equal length, ``"time"`` for
+            segments of equal travel time
+        """
+        if by not in ("distance", "time"):
+            raise ValueError(f"invalid segmentation {by!r}: expected 'distance' or 'time'")
+        if count is not None and count < 0:
+            raise ValueError(f"invalid segment count {count!r}")
+        self.segment_count = count or 0
+        self.segment_by = by
+        self._update_search_segments()
+
+    def search_segments(self) -> RouteSegments | None:
+        """Return the sub-corridors searched in place of :attr:`search_flexpolyline`.
+
+        The searched part of the route (see :attr:`search_flexpolyline`) is split
+        into :attr:`segment_count` segments overlapping by :attr:`segment_overlap_m`,
+        each simplified like the search polyline.  The segments are encoded off
+        the event loop, like the route slices; until they are ready, the
+        segments of a slice covering the searched one are used, or ``None``.
+        ``None`` when segmented search is disabled or there is no route.
+        """
+        key = self._segments_key()
+        if key is None:
+            return None
+        self._update_search_segments()
+        if key in self._segment_sets:
+            return self._segment_sets[key]
+        count, by, wanted, tolerance = key
+        ready = [
+            other
+            for other in self._segment_sets
+            if other[:2] == (count, by)
+            and other[3] == tolerance
+            and (other[2] is None or (wanted is not None and _slice_covers(other[2], wanted)))
+        ]
+        if not ready:
+            return None
+        # The closest covering slice, as for search_flexpolyline.
+        return self._segment_sets[
+            max(
+                ready,
+                key=lambda other: (
+                    (0, -math.inf)
+                    if other[2] is None
+                    else (other[2][0], -(math.inf if other[2][1] is None else other[2][1]))
+                ),
+            )
+        ]
+
+    def _segments_key(self) -> tuple | None:
+        if self.segment_count < 2 or self._search_flexpolyline is None or not self._current_waypoints:
+            return None
+        return self.segment_count, self.segment_by, self._search_slice, self._simplify_tolerance_m()
+
+    def _update_search_segments(self) -> None:
+        key = self._segments_key()
+        if key is None or key in self._segment_sets or key == self._segments_pending:
+            return
+        index = self.route_index
+        bucket_m = RouteEngine.trim_bucket_m
+        total_m = float(index.coords.cumulative_m[-1])
+        first_m, last_m = 0.0, total_m
+        if self._search_slice is not None:
+            first, last = self._search_slice
+            first_m = min(first * bucket_m, total_m)
+            last_m = total_m if last is None else min((last + 1) * bucket_m, total_m)
+        count = len(index.coords)
+        ranges = _split_route(
+            index, first_m, last_m, self.segment_count, self.segment_by, RouteEngine.segment_overlap_m
+        )
+        waypoint_lists = []
+        for start_m, end_m in ranges:
+            cut = min(index.segment_at_distance(start_m), count - 2)
+            stop = max(cut + 2, min(count, index.segment_at_distance(end_m) + 2))
+            waypoint_lists.append(self._current_waypoints[cut:stop])
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            flexpolylines = _encode_search_flexpolylines(
+                waypoint_lists, RouteEngine.max_waypoints_count, self._simplify_tolerance_m()
+            )
+            self._segment_sets[key] = self._route_segments(index, ranges, flexpolylines)
+            return
+        self._segments_pending = key
+        self._segments_task = loop.create_task(self._encode_segments(key, index, ranges, waypoint_lists))
+
+    async def _encode_segments(
+        self, key: tuple, index: RouteIndex, ranges: list[tuple[float, float]], waypoint_lists: list
+    ) -> None:
+        segment_sets = self._segment_sets
+        flexpolylines = await offload(
+            _encode_search_flexpolylines,
+            waypoint_lists,
+            RouteEngine.max_waypoints_count,
+            key[3],
+            key=("route-segments", id(self)),
+        )
+        if segment_sets is self._segment_sets:  # the route did not change meanwhile
+            segment_sets[key] = self._route_segments(index, ranges, flexpolylines)
+            self._segments_pending = None
+
+    @staticmethod
+    def _route_segments(
+        index: RouteIndex, ranges: list[tuple[float, float]], flexpolylines: list[str]
+    ) -> RouteSegments:
+        segments = [
+            RouteSegment(i, flexpolyline, start_m, end_m)
+            for i, ((start_m, end_m), flexpolyline) in enumerate(zip(ranges, flexpolylines))
+        ]
+        return RouteSegments(segments, lambda lat, lon: index.distance_on(*index.project(lat, lon)))
 
     @property
     def search_at_position(self) -> tuple[float, float] | None:
@@ -96,14 +353,27 @@ class RouteEngine:
         self.start_position = latlon
         self._current_waypoints = None
         self._cached_spans = None
+        self._route_index = None
+        self.progress = None
 
     def set_route_stop(self, latlon: tuple[float, float]) -> None:
         self.stop_position = latlon
         self._current_waypoints = None
         self._cached_spans = None
+        self._route_index = None
+        self.progress = None
 
     def set_current_position(self, latlon: tuple[float, float] | None) -> None:
+        """Set the current position, matching it onto the route when there is one.
+
+        Successive positions are matched incrementally by :attr:`tracker`, so
+        that a GPS feed costs amortized constant time per fix.
+        """
         self.current_position = latlon
+        if latlon is not None and self._cached_spans and self._current_waypoints:
+            self.progress = self.tracker.update(*latlon)
+        else:
+            self.progress = None
         self._apply_mins_from_pos()
 
     def set_mins_from_pos(self, mins: int | None) -> None:
@@ -113,24 +383,100 @@ class RouteEngine:
     def set_route_width(self, width: int | None) -> None:
         self.width = width
 
+    def _simplify_tolerance_m(self) -> float | None:
+        """Return the search polyline simplification tolerance, in metres, for the current width."""
+        fraction = RouteEngine.simplify_width_fraction
+        return (self.width or self._default_width) * fraction if fraction else None
+
     def _apply_mins_from_pos(self) -> None:
         if self.current_position is None:
             self.future_position = None
             return
-        if (self.mins_from_pos or 0) > 0 and self._cached_spans and self._current_waypoints:
-            elapsed = elapsed_sec_at_position(self._cached_spans, self._current_waypoints, *self.current_position)
-            self.future_position = position_at_x_sec_ahead(
-                self._cached_spans, self._current_waypoints, elapsed, self.mins_from_pos * 60
+        if (self.mins_from_pos or 0) > 0 and self.progress is not None and self.progress.on_route:
+            self.future_position = self.route_index.position_at(self.progress.elapsed_s + self.mins_from_pos * 60)
+        else:
+            self.future_position = None
+        self._update_search_slice()
+
+    def _search_slice_key(self) -> tuple[int, int | None] | None:
+        """Return the ``(first, last)`` buckets of the route to search; ``None`` searches the whole route.
+
+        ``last`` is ``None`` for the rest of the route.
+        """
+        if self._search_flexpolyline is None or not self._cached_spans or not self._current_waypoints:
+            return None
+        progress = self.progress if self.progress is not None and self.progress.on_route else None
+        window = self.ranking_mode.time_window
+        bucket_m = RouteEngine.trim_bucket_m
+        index = self.route_index
+        cum = index.coords.cumulative_m
+        if window is None:
+            if progress is None:
+                return None
+            elapsed = progress.elapsed_s + (60 * self.mins_from_pos if self.future_position is not None else 0)
+            first = int(float(cum[index.span_start_at(elapsed)]) // bucket_m)
+            return (first, None) if first else None
+        elapsed = progress.elapsed_s if progress is not None else 0.0
+        first = int(float(cum[index.span_start_at(elapsed + 60 * window[0])]) // bucket_m)
+        last = int(float(cum[index.span_end_at(elapsed + 60 * window[1])]) // bucket_m)
+        return first, last
+
+    def _update_search_slice(self) -> None:
+        key = self._search_slice = self._search_slice_key()
+        self._update_search_segments()
+        if key is None or key in self._slices or key == self._slice_pending:
+            return
+        first, last = key
+        index = self.route_index
+        bucket_m = RouteEngine.trim_bucket_m
+        count = len(index.coords)
+        cut = min(index.segment_at_distance(first * bucket_m), count - 2)
+        stop = count if last is None else max(cut + 2, min(count, index.segment_at_distance((last + 1) * bucket_m) + 2))
+        waypoints = self._current_waypoints[cut:stop]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._slices[key] = _encode_search_flexpolyline(
+                waypoints, RouteEngine.max_waypoints_count, self._simplify_tolerance_m()
             )
             return
-        self.future_position = None
+        self._slice_pending = key
+        self._slice_task = loop.create_task(self._encode_slice(key, waypoints))
+
+    async def _encode_slice(self, key: tuple[int, int | None], waypoints: list[tuple[float, float]]) -> None:
+        slices = self._slices
+        flexpolyline = await offload(
+            _encode_search_flexpolyline,
+            waypoints,
+            RouteEngine.max_waypoints_count,
+            self._simplify_tolerance_m(),
+            key=("route-slice", id(self)),
+        )
+        if slices is self._slices:  # the route did not change meanwhile
+            slices[key] = flexpolyline
+            self._slice_pending = None
+
+    @property
+    def route_index(self) -> RouteIndex:
+        """:class:`RouteIndex` of the current route, rebuilt only when its waypoints or spans change."""
+        index = self._route_index
+        if index is None or index.coords.points is not self._current_waypoints or index.spans is not self._cached_spans:
+            index = self._route_index = RouteIndex(self._cached_spans or [], self._current_waypoints)
+        return index
+
+    @property
+    def tracker(self) -> RouteTracker:
+        """:class:`RouteTracker` of the current route."""
+        index = self.route_index
+        if self._tracker is None or self._tracker.index is not index:
+            self._tracker = RouteTracker(index)
+        return self._tracker
 
     def build_flexpolyline(self, flexpolyline: str, waypoints: list[tuple[float, float]]) -> None:
-        self.route_flexpolyline = encode(waypoints)
-        if len(waypoints) > RouteEngine.max_waypoints_count:
-            simplified_waypoints = simplify_polyline(waypoints, RouteEngine.max_waypoints_count)
-            flexpolyline = encode(simplified_waypoints)
-        self.search_flexpolyline = flexpolyline
+        self.route_flexpolyline, self.search_flexpolyline = _encode_route_flexpolylines(
+            flexpolyline, waypoints, RouteEngine.max_waypoints_count, self._simplify_tolerance_m()
+        )
+        self._update_search_slice()
 
     async def update_route_attributes(self) -> dict:
         if self.start_position is None or self.stop_position is None:
@@ -151,13 +497,17 @@ class RouteEngine:
             # TODO: Check if we should not take more sections....
             section = route["routes"][0]["sections"][0]
             route_flexpolyline = section["polyline"]
-            waypoints = decode(route_flexpolyline)
+            spans = section.get("spans", [])
+            waypoints, route_index = await offload(
+                _decode_route, route_flexpolyline, spans, key=("route-decode", id(self))
+            )
             summary = section.get("summary", {})
             self._route_cache[cache_key] = {
                 "flexpolyline_raw": route_flexpolyline,
                 "waypoints": waypoints,
                 "route_summary_length": summary.get("length"),
-                "spans": section.get("spans", []),
+                "spans": spans,
+                "index": route_index,
             }
             # Pre-populate the summary key so DetourRanker reuses this fetch
             # when at_pos == start_position (the common default).
@@ -172,7 +522,16 @@ class RouteEngine:
         self.waypoints_count = len(cached["waypoints"])
         self.route_summary_length = cached["route_summary_length"]
         self._cached_spans = cached.get("spans", [])
-        self.build_flexpolyline(cached["flexpolyline_raw"], cached["waypoints"])
+        self._route_index = cached.get("index")
+        self.route_flexpolyline, self.search_flexpolyline = await offload(
+            _encode_route_flexpolylines,
+            cached["flexpolyline_raw"],
+            cached["waypoints"],
+            RouteEngine.max_waypoints_count,
+            self._simplify_tolerance_m(),
+            key=("route-encode", id(self)),
+        )
+        self._update_search_slice()
         self.has_route = True
         return cached
 
@@ -0,0 +1,109 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Incremental matching of a stream of GPS fixes onto a route.
+
+A :class:`RouteTracker` remembers where the previous fix was matched and
+matches the next one only against the route segments from slightly behind
+that point to ``window_m`` metres ahead of it.  The cost of a fix therefore
+does not depend on the route length, and a route that comes back close to
+itself (a loop, a return leg on the other carriageway) is not matched to the
+wrong pass.
+
+A fix farther than ``off_route_m`` metres from the window is looked up on the
+whole route (a jump, e.g. a position picked on the map); if it is also far
+from the whole route, the fix is reported off-route and the tracker keeps its
+last on-route match.
+
+This module has no widget dependency and can be used by headless heads.
+"""
+
+from dataclasses import dataclass
+
+from here_search_demo.widgets.route_geometry import RouteIndex
+
+
+@dataclass(frozen=True)
+class RouteProgress:
+    """Where a fix was matched on the route.
+
+    :param segment: Matched segment (waypoints ``segment`` to ``segment + 1``)
+    :param fraction: Position on the segment, in ``[0, 1]``
+    :param elapsed_s: Travel time from the route start
+    :param distance_m: Distance along the route from its start
+    :param offset_m: Distance between the fix and the route
+    :param on_route: Whether the fix is within the off-route threshold
+    """
+
+    segment: int
+    fraction: float
+    elapsed_s: float
+    distance_m: float
+    offset_m: float
+    on_route: bool = True
+
+
+class RouteTracker:
+    """Stateful matcher of successive positions onto a :class:`RouteIndex`.
+
+    :param index: Route index
+    :param window_m: Length of the route searched ahead of the last match
+    :param off_route_m: Distance from the route above which a fix is off-route
+    """
+
+    default_window_m = 1000.0
+    default_off_route_m = 50.0
+
+    def __init__(self, index: RouteIndex, window_m: float | None = None, off_route_m: float | None = None):
+        self.index = index
+        self.window_m = window_m or RouteTracker.default_window_m
+        self.off_route_m = off_route_m or RouteTracker.default_off_route_m
+        self.fixes = 0
+        self.relocations = 0
+        self.off_route = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the last match: the next fix is looked up on the whole route."""
+        self.last: RouteProgress | None = None
+
+    def update(self, lat: float, lon: float) -> RouteProgress:
+        """Match a new fix and return the route progress."""
+        self.fixes += 1
+        index = self.index
+        last = self.last
+        if last is not None:
+            # Slightly behind the last match (GPS noise), then the window ahead.
+            first = index.segment_at_distance(last.distance_m - self.off_route_m)
+            stop = index.segment_at_distance(last.distance_m + self.window_m) + 1
+            segment, t, offset_m = index.locate(lat, lon, first, stop)
+            if offset_m <= self.off_route_m:
+                return self._matched(segment, t, offset_m)
+        segment, t, offset_m = index.locate(lat, lon)
+        if offset_m <= self.off_route_m or last is None:
+            if last is not None:
+                self.relocations += 1
+            return self._matched(segment, t, offset_m, on_route=offset_m <= self.off_route_m)
+        self.off_route += 1
+        return RouteProgress(
+            last.segment, last.fraction, last.elapsed_s, last.distance_m, offset_m=offset_m, on_route=False
+        )
+
+    def _matched(self, segment: int, t: float, offset_m: float, on_route: bool = True) -> RouteProgress:
+        index = self.index
+        progress = RouteProgress(
+            segment, t, index.elapsed_on(segment, t), index.distance_on(segment, t), offset_m, on_route
+        )
+        if on_route:
+            self.last = progress
+        return progress
+
+    def stats(self) -> dict[str, int]:
+        """Return the ``fixes``, ``relocations`` and ``off_route`` counts."""
+        return {"fixes": self.fixes, "relocations": self.relocations, "off_route": self.off_route}
@@ -0,0 +1,189 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Search a long route as several overlapping sub-corridors.
+
+A single corridor request returns at most ``limit`` items, clustered where
+the server ranks highest.  For cross-country routes, :class:`SegmentedSearch`
+sends one discover or browse request per :class:`RouteSegment`, at most
+``max_concurrency`` at a time over the shared HTTP session, then merges the
+responses: items are deduplicated by place ``id`` and ordered by their
+progress along the route.  When the merged list is displayed in a limited
+number of rows, ``max_items`` keeps the best ranked items of every segment
+rather than the first items along the route.
+
+The segments come with the request context (see
+:meth:`here_search_demo.route_engine.RouteEngine.search_segments`).
+
+This module has no widget dependency and can be used by headless heads.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from itertools import islice, zip_longest
+from time import perf_counter_ns
+
+from here_search_demo.api import API
+from here_search_demo.entity.endpoint import EndpointConfig
+from here_search_demo.entity.response import Response
+from here_search_demo.event import PlaceTaxonomySearchEvent, SearchEvent, TextSearchEvent
+from here_search_demo.http import HTTPClientError, HTTPSession
+from here_search_demo.tracing import trace_stage
+
+
+@dataclass(frozen=True)
+class RouteSegment:
+    """One sub-corridor of a route.
+
+    :ivar index: position of the segment along the route
+    :ivar polyline: flexpolyline of the segment
+    :ivar start_m: distance from the route start to the segment start
+    :ivar end_m: distance from the route start to the segment end
+    """
+
+    index: int
+    polyline: str
+    start_m: float
+    end_m: float
+
+
+class RouteSegments(tuple):
+    """The segments of a route, with the projection ordering results along it.
+
+    :param segments: Route segments, in route order
+    :param progress_m: Return the distance along the route of the route point
+        closest to ``(lat, lon)``
+    """
+
+    def __new__(cls, segments, progress_m: Callable[[float, float], float]):
+        self = super().__new__(cls, segments)
+        self.progress_m = progress_m
+        return self
+
+
+@dataclass
+class SegmentMetrics:
+    """Outcome of the request of one segment.
+
+    :ivar index: segment index
+    :ivar elapsed_ms: request latency, including the wait for a concurrency slot
+    :ivar items: number of items returned
+    :ivar error: error message when the request failed
+    """
+
+    index: int
+    elapsed_ms: float
+    items: int = 0
+    error: str | None = None
+
+
+class SegmentedSearch:
+    """Fan a discover or browse event out over route segments.
+
+    :param max_concurrency: Maximum number of segment requests in flight
+    :param max_items: Maximum number of merged items, see :meth:`merge`
+    """
+
+    default_max_concurrency = 4
+    event_types = (TextSearchEvent, PlaceTaxonomySearchEvent)
+
+    def __init__(self, max_concurrency: int | None = None, max_items: int | None = None):
+        self.max_concurrency = max_concurrency or SegmentedSearch.default_max_concurrency
+        self.max_items = max_items
+        self.last_metrics: list[SegmentMetrics] = []
+
+    def supports(self, event: SearchEvent) -> bool:
+        """Whether *event* is a discover or browse event whose context carries several segments."""
+        if not isinstance(event, SegmentedSearch.event_types) or event.context is None:
+            return False
+        segments = event.context.route_segments
+        return segments is not None and len(segments) > 1
+
+    async def get_response(
+        self, event: SearchEvent, api: API, config: EndpointConfig, session: HTTPSession
+    ) -> Response:
+        """Return the merged response of *event* sent once per route segment."""
+        segments: RouteSegments = event.context.route_segments
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        metrics = [SegmentMetrics(segment.index, 0.0) for segment in segments]
+
+        async def search(segment: RouteSegment) -> Response | None:
+            start_ns = perf_counter_ns()
+            segment_event = replace(
+                event, context=replace(event.context, polyline=segment.polyline, route_segments=None)
+            )
+            try:
+                async with semaphore:
+                    with trace_stage(f"segment {segment.index}"):
+                        resp = await segment_event.get_response(api=api, config=config, session=session)
+            except (HTTPClientError, OSError, ValueError) as exc:
+                # Network, HTTP status and payload errors of this segment only.
+                metrics[segment.index].error = repr(exc)
+                return None
+            finally:
+                metrics[segment.index].elapsed_ms = (perf_counter_ns() - start_ns) / 1e6
+            metrics[segment.index].items = len((resp.data or {}).get("items", []))
+            return resp
+
+        responses = await asyncio.gather(*(search(segment) for segment in segments))
+        self.last_metrics = metrics
+        if all(resp is None for resp in responses):
+            raise RuntimeError(f"all {len(segments)} segment requests failed: {metrics[0].error}")
+        return SegmentedSearch.merge(
+            [resp for resp in responses if resp is not None], segments.progress_m, max_items=self.max_items
+        )
+
+    @staticmethod
+    def merge(
+        responses: list[Response], progress_m: Callable[[float, float], float], max_items: int | None = None
+    ) -> Response:
+        """Merge segment responses: first occurrence of each place ``id``, in route progress order.
+
+        Items without a position keep their relative order, after the positioned ones.
+
+        :param max_items: Keep at most this many items, taken in turn from each
+            segment in the order the server ranked them
+        """
+        seen: set = set()
+        per_segment: list[list[dict]] = []
+        for resp in responses:
+            segment_items = []
+            for item in (resp.data or {}).get("items", []):
+                item_id = item.get("id")
+                if item_id is not None:
+                    if item_id in seen:
+                        continue
+                    seen.add(item_id)
+                segment_items.append(item)
+            per_segment.append(segment_items)
+        if max_items is None:
+            selected = [item for segment_items in per_segment for item in segment_items]
+        else:
+            interleaved = (item for ranked in zip_longest(*per_segment) for item in ranked if item is not None)
+            selected = list(islice(interleaved, max_items))
+        positioned: list[tuple[float, int, dict]] = []
+        others: list[dict] = []
+        for item in selected:
+            position = item.get("position")
+            if position is None:
+                others.append(item)
+            else:
+                positioned.append((progress_m(position["lat"], position["lng"]), len(positioned), item))
+        items = [item for _, _, item in sorted(positioned, key=lambda entry: entry[:2])] + others
+        first = responses[0]
+        return Response(req=first.req, data={**(first.data or {}), "items": items}, x_headers=first.x_headers)
+
+    def stats(self) -> dict[str, float]:
+        """Return the segment count, slowest latency and error count of the last segmented search."""
+        return {
+            "segments": len(self.last_metrics),
+            "max_ms": max((m.elapsed_ms for m in self.last_metrics), default=0.0),
+            "errors": sum(m.error is not None for m in self.last_metrics),
+        }
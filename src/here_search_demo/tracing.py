@@ -0,0 +1,305 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Keystroke-to-paint latency tracing.
+
+A :class:`LatencyTracer` follows a single
+:class:`~here_search_demo.entity.intent.SearchIntent` from the keystroke that
+produced it until its response has been painted, recording one
+:class:`StageSpan` per pipeline stage:
+
+``debounce`` → ``queue`` → ``triage`` → ``token`` → ``network`` → ``parse``
+→ ``paint`` (``vicinity``, ``render``, ``geojson``, ``labels``)
+
+Stages are recorded either explicitly with :meth:`LatencyTracer.record` (when
+start and end happen in different places, e.g. debounce and queue wait) or
+with the :func:`trace_stage` context manager.  ``trace_stage`` writes into the
+trace activated for the current asyncio task by :meth:`LatencyTracer.activate`
+so that deep callees (``API.do_send``, ``SearchState.hydrate``, …) need no
+reference to the tracer; it is a no-op when no trace is active.
+
+:class:`LoopLagMonitor` measures how late the event loop runs a periodic
+timer: work blocking the loop (e.g. geometry computed inline instead of
+offloaded, see :mod:`here_search_demo.offload`) shows up as lag.
+
+This module has no widget dependency and can be used by headless heads.
+"""
+
+import asyncio
+import math
+import statistics
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter, perf_counter_ns
+
+STAGES = (
+    "debounce",
+    "queue",
+    "triage",
+    "token",
+    "network",
+    "parse",
+    "paint",
+    "vicinity",
+    "render",
+    "geojson",
+    "labels",
+)
+
+
+@dataclass
+class StageSpan:
+    """One timed pipeline stage, in ``perf_counter_ns`` units."""
+
+    name: str
+    start_ns: int
+    end_ns: int
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class IntentTrace:
+    """All stage spans recorded for one intent.
+
+    :ivar kind: intent kind
+    :ivar label: short printable form of the intent materialization
+    :ivar origin_ns: earliest recorded timestamp (keystroke or intent creation)
+    :ivar spans: recorded stage spans, in recording order
+    :ivar done_ns: timestamp at which the response was painted, if it was
+    """
+
+    kind: str
+    label: str
+    origin_ns: int
+    spans: list[StageSpan] = field(default_factory=list)
+    done_ns: int | None = None
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        self.spans.append(StageSpan(name, start_ns, end_ns))
+        self.origin_ns = min(self.origin_ns, start_ns)
+
+    def durations_ms(self) -> dict[str, float]:
+        """Return the summed duration of each recorded stage, in milliseconds."""
+        durations: dict[str, float] = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration_ms
+        return durations
+
+    @property
+    def total_ms(self) -> float:
+        end_ns = self.done_ns or max((span.end_ns for span in self.spans), default=self.origin_ns)
+        return (end_ns - self.origin_ns) / 1e6
+
+
+_current_trace: ContextVar[IntentTrace | None] = ContextVar("here_search_demo_trace", default=None)
+
+
+def current_trace() -> IntentTrace | None:
+    """Return the trace activated for the current asyncio task, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_stage(name: str) -> Iterator[None]:
+    """Time the enclosed block as stage *name* of the currently active trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start_ns = perf_counter_ns()
+    try:
+        yield
+    finally:
+        trace.record(name, start_ns, perf_counter_ns())
+
+
+class LatencyTracer:
+    """Per-session store of :class:`IntentTrace` objects.
+
+    Traces are keyed by ``(intent.kind, intent.time)``; only the most recent
+    ``max_traces`` are kept.
+
+    :param max_traces: Maximum number of retained traces.
+    """
+
+    default_max_traces = 500
+    default_waterfall_width = 40
+
+    def __init__(self, max_traces: int | None = None):
+        self.max_traces = max_traces or LatencyTracer.default_max_traces
+        self.traces: OrderedDict[tuple[str, float], IntentTrace] = OrderedDict()
+
+    @staticmethod
+    def _key(intent) -> tuple[str, float]:
+        return intent.kind, intent.time
+
+    def trace_for(self, intent) -> IntentTrace:
+        """Return the trace of *intent*, creating it when needed."""
+        key = self._key(intent)
+        trace = self.traces.get(key)
+        if trace is None:
+            label = intent.materialization if isinstance(intent.materialization, str) else ""
+            trace = IntentTrace(kind=intent.kind, label=label, origin_ns=int(intent.time))
+            self.traces[key] = trace
+            while len(self.traces) > self.max_traces:
+                self.traces.popitem(last=False)
+        return trace
+
+    def record(self, intent, name: str, start_ns: int, end_ns: int) -> None:
+        """Record stage *name* of *intent* between two ``perf_counter_ns`` stamps."""
+        self.trace_for(intent).record(name, start_ns, end_ns)
+
+    def activate(self, intent) -> IntentTrace:
+        """Make the trace of *intent* the target of :func:`trace_stage` in the current task."""
+        trace = self.trace_for(intent)
+        _current_trace.set(trace)
+        return trace
+
+    def finish(self, intent, painted: bool = True) -> None:
+        """Mark *intent* as painted and deactivate its trace.
+
+        When *painted* is ``False`` (response superseded before display) the
+        trace is dropped so it does not skew the aggregates.
+        """
+        key = self._key(intent)
+        trace = self.traces.get(key)
+        if trace is not None:
+            if painted:
+                trace.done_ns = perf_counter_ns()
+            else:
+                del self.traces[key]
+        _current_trace.set(None)
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+    def completed(self) -> list[IntentTrace]:
+        return [trace for trace in self.traces.values() if trace.done_ns is not None]
+
+    def aggregates(self) -> dict[str, dict[str, float]]:
+        """Return per-stage ``count``/``mean_ms``/``p50_ms``/``p95_ms``/``max_ms`` over completed traces.
+
+        The ``total`` entry aggregates the keystroke-to-paint latency.
+        """
+        samples: dict[str, list[float]] = {}
+        for trace in self.completed():
+            for name, duration_ms in trace.durations_ms().items():
+                samples.setdefault(name, []).append(duration_ms)
+            samples.setdefault("total", []).append(trace.total_ms)
+        order = {name: i for i, name in enumerate(STAGES + ("total",))}
+        result = {}
+        for name in sorted(samples, key=lambda n: order.get(n, len(order))):
+            values = sorted(samples[name])
+            result[name] = {
+                "count": len(values),
+                "mean_ms": statistics.fmean(values),
+                "p50_ms": _percentile(values, 50),
+                "p95_ms": _percentile(values, 95),
+                "max_ms": values[-1],
+            }
+        return result
+
+    def export(self) -> list[dict]:
+        """Return one flat row per recorded span, e.g. for CSV or a DataFrame."""
+        rows = []
+        for trace in self.traces.values():
+            for span in trace.spans:
+                rows.append(
+                    {
+                        "kind": trace.kind,
+                        "label": trace.label,
+                        "origin_ns": trace.origin_ns,
+                        "stage": span.name,
+                        "offset_ms": (span.start_ns - trace.origin_ns) / 1e6,
+                        "duration_ms": span.duration_ms,
+                        "total_ms": trace.total_ms,
+                    }
+                )
+        return rows
+
+    def waterfall(self, last: int = 10, width: int | None = None) -> str:
+        """Render the *last* completed traces as a text waterfall.
+
+        Each stage is drawn on a line, offset and scaled relative to its
+        trace's total duration.
+        """
+        width = width or LatencyTracer.default_waterfall_width
+        lines = []
+        for trace in self.completed()[-last:]:
+            total_ms = trace.total_ms or 1e-6
+            lines.append(f"{trace.kind} {trace.label!r}: {trace.total_ms:.1f} ms")
+            for span in trace.spans:
+                offset = int((span.start_ns - trace.origin_ns) / 1e6 / total_ms * width)
+                length = max(1, int(span.duration_ms / total_ms * width))
+                offset = min(offset, width - 1)
+                bar = " " * offset + "█" * min(length, width - offset)
+                lines.append(f"  {span.name:<9}|{bar:<{width}}| {span.duration_ms:7.1f} ms")
+        return "\n".join(lines)
+
+
+class LoopLagMonitor:
+    """Sample the event-loop lag: how late a timer of ``interval_s`` fires.
+
+    :param interval_s: Sampling period, in seconds.
+    :param max_samples: Number of most recent samples kept.
+    """
+
+    default_interval_s = 0.02
+    default_max_samples = 3000
+
+    def __init__(self, interval_s: float | None = None, max_samples: int | None = None):
+        self.interval_s = interval_s or LoopLagMonitor.default_interval_s
+        self.samples_ms: deque[float] = deque(maxlen=max_samples or LoopLagMonitor.default_max_samples)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> "LoopLagMonitor":
+        """Start sampling on the running loop; return ``self``."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sample())
+        return self
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self) -> None:
+        interval_s = self.interval_s
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(interval_s)
+            self.samples_ms.append(max(0.0, (perf_counter() - start - interval_s) * 1000))
+
+    def clear(self) -> None:
+        self.samples_ms.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Return ``count``/``mean_ms``/``p50_ms``/``p95_ms``/``max_ms`` of the lag samples."""
+        values = sorted(self.samples_ms)
+        if not values:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": len(values),
+            "mean_ms": statistics.fmean(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": values[-1],
+        }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted, non-empty list."""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
@@ -10,25 +10,14 @@
 from functools import reduce, wraps
 from typing import Sequence, Tuple
 from reprlib import repr as short_repr
+from logging import basicConfig, getLogger
 import inspect
-import logging
-
-try:
-    from IPython import get_ipython
-except ImportError:
-    get_ipython = None
+import sys
 
 from here_search_demo.entity.constants import berlin
 from here_search_demo.http import HTTPConnectionError, HTTPSession
 
-# isort: off
-from importlib import reload
-
-reload(logging)
-from logging import basicConfig, getLogger  # noqa: E402
-
 logger = getLogger("here_search_demo")
-# isort: on
 
 
 def log_signature(func):
@@ -92,7 +81,9 @@ def log_signature(func):
 
 
 def setLevel(level: int):
-    basicConfig()
+    # In notebooks the kernel may already have configured the root logger;
+    # force our handler rather than reloading the logging module at import time.
+    basicConfig(force=is_running_in_jupyter)
     logger.setLevel(level)
     client_logger = getLogger("aiohttp.client")
     client_logger.setLevel(level)
@@ -125,4 +116,14 @@ async def get_lat_lon() -> Tuple[float, float]:
         return berlin
 
 
-is_running_in_jupyter = False if not get_ipython else get_ipython().__class__.__name__ == "ZMQInteractiveShell"
+def _running_in_jupyter() -> bool:
+    # A Jupyter kernel has always imported IPython before user code runs, so
+    # there is no need to import it (and pay its startup cost) to find out.
+    ipython = sys.modules.get("IPython")
+    get_ipython = getattr(ipython, "get_ipython", None)
+    if get_ipython is None:
+        return False
+    return get_ipython().__class__.__name__ == "ZMQInteractiveShell"
+
+
+is_running_in_jupyter = _running_in_jupyter()
@@ -9,10 +9,11 @@
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import aclosing
 from ipyleaflet import WidgetControl
 from IPython.display import display
-from ipywidgets import HBox, Label, VBox
+from ipywidgets import HBox, Label, VBox, Widget
 
 from ..api import API
 from ..auth import Credentials
@@ -26,12 +27,14 @@ from ..api_options import (
     build_api_options,
 )
 from ..base import OneBoxCore, UserProfileMixin
-from ..detour import DetourRanker
+from ..detour import DetourRanker, RoutingBackend
 from ..entity.endpoint import Endpoint
 from ..entity.intent import SearchIntent
 from ..entity.place import PlaceTaxonomyExample
 from ..entity.request import RequestContext
 from ..entity.response import QuerySuggestionItem, Response
+from ..segmented_search import SegmentedSearch
+from ..tracing import LatencyTracer, LoopLagMonitor
 from .state import SearchState
 from ..user import UserProfile
 from .credentials import CredentialsLoader
@@ -39,6 +42,7 @@ from .input_text import PlaceTaxonomyButtons, SubmittableTextBox, TermsButtons
 from .output_map import ResponseMap
 from .output_buttons import SearchResultButtons
 from .output_json import SearchResultJson, SearchResultList
+from .render import RenderTransaction, render_transaction
 from .util import TableLogWidget
 
 style_refactor = True
@@ -64,6 +68,16 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
     :param map_only: Hide JSON/log panels and keep map-centric layout.
     :param options: Optional prebuilt API options.
     :param testing_header: Include NLP testing header for API calls.
+    :param tracer: Optional latency tracer; its waterfall and aggregates
+        cover every intent from keystroke to paint.
+    :param loop_lag: Optional event-loop lag monitor, started and stopped with the app.
+    :param detour_engine: ``"via"`` (one routing call per result) or ``"matrix"``
+        (two matrix computations per result list) minimal-detour reranking.
+    :param routing_backend: Optional routing backend replacing the HERE routing
+        services for minimal-detour reranking.
+    :param segmented_search: Optional segmented search settings (concurrency) used
+        when the route is searched in several segments (see :meth:`RouteController.set_segmented_search`).
+        By default, the merged results are limited to the number of displayed results.
     :param kwargs: Forwarded widget/layout options.
     """
 
@@ -85,6 +99,15 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
     # via RequestContext.user_id, leaving regular API calls free of the header.
     cors_allow_user_id_header: bool = False
 
+    # Maximum number of results routed by the minimal-detour reranking, the
+    # closest to the route first (None routes as many as the result list shows).
+    detour_top_k: int | None = None
+    # Minimum delay between two repaints of a result list being reranked.
+    detour_repaint_interval_s = 0.25
+    # Backend limit of the recommendation requests made without a route
+    # (the largest limit accepted by the Search API).
+    recommendations_backend_limit = 100
+
     logger: logging.Logger
     result_queue: asyncio.Queue
     state: SearchState
@@ -127,6 +150,11 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         map_only: bool = False,
         options: APIOptions | None = None,
         testing_header: bool = False,
+        tracer: LatencyTracer | None = None,
+        loop_lag: LoopLagMonitor | None = None,
+        segmented_search: SegmentedSearch | None = None,
+        detour_engine: str = "via",
+        routing_backend: RoutingBackend | None = None,
         **kwargs,
     ):
         self.logger = logging.getLogger("here_search")
@@ -159,15 +187,28 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             testing_header=testing_header,
         )
 
+        results_limit = results_limit or OneBoxMap.default_results_limit
+        suggestions_limit = suggestions_limit or OneBoxMap.default_suggestions_limit
+        if segmented_search is None:
+            # Keep the best results of every segment in the rows displayed.
+            displayed = (
+                SearchResultList.default_max_results_count if recommendations else max(results_limit, suggestions_limit)
+            )
+            segmented_search = SegmentedSearch(max_items=displayed)
         super().__init__(
             api=api,
             user_profile=user_profile,
-            results_limit=results_limit or OneBoxMap.default_results_limit,
-            suggestions_limit=suggestions_limit or OneBoxMap.default_suggestions_limit,
+            results_limit=results_limit,
+            suggestions_limit=suggestions_limit,
             terms_limit=terms_limit or OneBoxMap.default_terms_limit,
+            tracer=tracer,
+            loop_lag=loop_lag,
+            segmented_search=segmented_search,
         )
 
         self.extra_api_params = extra_api_params or {}
+        self.detour_engine = detour_engine
+        self.routing_backend = routing_backend
 
         # X-User-ID must NOT be added to self.x_headers until the HERE Search
         # API explicitly allows it via CORS (Access-Control-Allow-Headers).
@@ -179,8 +220,8 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         self._base_autosuggest_limit = self.autosuggest_backend_limit
         self._base_discover_limit = self.discover_backend_limit
         if self._recommendations:
-            self.autosuggest_backend_limit = max(self.autosuggest_backend_limit, 100)
-            self.discover_backend_limit = max(self.discover_backend_limit, 100)
+            self.autosuggest_backend_limit = max(self.autosuggest_backend_limit, self.recommendations_backend_limit)
+            self.discover_backend_limit = max(self.discover_backend_limit, self.recommendations_backend_limit)
 
         self.map_w = ResponseMap(
             credentials=self.credentials,
@@ -190,6 +231,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             state=self.state,
             more_details_for_suggestion=self.more_details_for_suggestion,
             routing_api_call_handler=self._increment_routing_api_calls,
+            detour_polylines=self._detour_polylines,
         )
 
         # Storage for the last result list so we can re-display it when the
@@ -211,6 +253,9 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         _route.on_drawn(self._clear_results_on_route_change)
         _route.on_removed(self._clear_results_on_route_change)
 
+        # Comm messages sent by the last response paint (see _paint_transaction).
+        self.last_paint_messages: int | None = None
+
         # The JSON output (omitted in map-only mode).
         self.result_json_w = None
         if not self.map_only:
@@ -219,6 +264,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
                 queue=self.queue,
                 max_results_number=max(self.results_limit, self.suggestions_limit),
                 layout={"width": "400px", "max_height": "600px"},
+                lazy=True,
             )
 
         # The Search input box
@@ -227,6 +273,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             state=self.state,
             layout=kwargs.pop("layout", self.__class__.default_search_box_layout),
             placeholder=kwargs.pop("placeholder", self.__class__.default_placeholder),
+            tracer=self.tracer,
             **kwargs,
         )
         self.query_terms_w = TermsButtons(
@@ -302,6 +349,12 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             f" | api: {self.search_api_calls}/{self.routing_api_calls}"
         )
 
+    def _on_search_round_trip(self, intent: SearchIntent, resp: Response, elapsed_ns: int) -> None:
+        # Autosuggest latency drives the adaptive debounce of the query box;
+        # cache hits say nothing about the backend.
+        if intent.kind == "transient_text" and not resp.cached:
+            self.query_box_w.debounce.observe_rtt(elapsed_ns / 1e9)
+
     def _on_search_api_call(self, request) -> None:
         if request.endpoint != Endpoint.SIGNALS:
             self.search_api_calls += 1
@@ -359,8 +412,8 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
                 self.autosuggest_backend_limit = self._base_autosuggest_limit
                 self.discover_backend_limit = self._base_discover_limit
             else:
-                self.autosuggest_backend_limit = max(self._base_autosuggest_limit, 100)
-                self.discover_backend_limit = max(self._base_discover_limit, 100)
+                self.autosuggest_backend_limit = max(self._base_autosuggest_limit, self.recommendations_backend_limit)
+                self.discover_backend_limit = max(self._base_discover_limit, self.recommendations_backend_limit)
         return super().triage_intent(intent, context)
 
     def _get_context(self) -> RequestContext:
@@ -379,6 +432,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             x_headers=self.x_headers,
             share_experience=self.user_profile.share_experience,
             user_id=self.user_profile.id if self.user_profile.share_experience else None,
+            route_segments=route.search_segments(),
         )
 
     def _set_minimal_detour_with_refresh(self, value: bool):
@@ -388,6 +442,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             return
         if not value:
             # Turning off: restore original labels without reranking.
+            self._cancel_detour_rerank()
             self._display_result_list(self._last_result_intent, self._last_result_resp, fit=False, clear_query=False)
         else:
             # Turning on: re-apply detour ranking when route data is available.
@@ -406,10 +461,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
                 and route.current_position is not None
                 and route.route_summary_length is not None
             ):
-                self._rerank_task = asyncio.create_task(
-                    self._handle_result_list_with_detour(self._last_result_intent, self._last_result_resp)
-                )
-                route.detour_task = self._rerank_task
+                self._start_detour_rerank(self._last_result_intent, self._last_result_resp)
 
     def _set_mins_from_pos_with_clear_results(self, mins: int | None):
         """Update min-from-pos and clear displayed results so they match the new center."""
@@ -417,6 +469,7 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         self._clear_results_on_route_change()
 
     def _clear_results_on_route_change(self, route=None):
+        self._cancel_detour_rerank()
         self.map_w.clear_results()
         self.result_buttons_w._inner_box.children = ()
         self._last_result_resp = None
@@ -468,7 +521,8 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         if self._results_event is not None:
             await self._results_event.wait()
         if self._rerank_task is not None:
-            await self._rerank_task
+            # A superseded rerank is cancelled: wait for it without raising.
+            await asyncio.wait([self._rerank_task])
         if self.map_w._fit_task is not None:
             await self.map_w._fit_task
 
@@ -483,14 +537,23 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             self.query_terms_w.apply_style()
             # Apply CSS styling for result buttons as well.
             self.result_buttons_w.apply_style()
-            # Some IPython versions return a DisplayHandle, others None; store
+        # Some IPython versions return a DisplayHandle, others None; store
         # the display_id if available so we can update it on deletion.
         try:
             self._display_id = getattr(handle, "display_id", None)
         except Exception:
             self._display_id = None
+        # Build the rest of the result button pool now that the UI is visible.
+        self.result_buttons_w.warm_pool()
 
     def _limit_ui_response(self, resp: Response) -> Response:
+        """Cut a recommendation response to the rows of the result list.
+
+        The map is painted with the whole response, clustered when it is large
+        enough: only the result buttons and the JSON pane get the limited one.
+        The minimal-detour reranking routes the best estimates of the whole
+        response (see ``detour_top_k``).
+        """
         if not self._recommendations:
             return resp
         endpoint = getattr(getattr(resp, "req", None), "endpoint", None)
@@ -513,10 +576,10 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         :param autosuggest_resp: the Response instance to handle
         :return: None
         """
-        limited_resp = self._limit_ui_response(autosuggest_resp)
-        self._display_suggestions(limited_resp, intent)
-        self._display_result_map(limited_resp, intent, fit=False)
-        self._display_terms(limited_resp, intent)
+        with self._paint_transaction(intent, self._result_rows(autosuggest_resp)):
+            self._display_suggestions(autosuggest_resp, intent)
+            self._display_result_map(autosuggest_resp, intent, fit=False)
+            self._display_terms(autosuggest_resp, intent)
 
     def _display_suggestions(self, autosuggest_resp: Response, intent: SearchIntent) -> None:
         # Used by handle_suggestion_list
@@ -548,13 +611,13 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         :param resp: the Response instance to handle
         :return: None
         """
-        limited_resp = self._limit_ui_response(resp)
         route = self.map_w.route
 
         # Always keep the original (non-reranked) response so we can restore
         # it when the "travel time" checkbox is turned off.
-        self._last_result_resp = limited_resp
+        self._last_result_resp = resp
         self._last_result_intent = intent
+        self._cancel_detour_rerank()
 
         if (
             (
@@ -567,42 +630,118 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
             and route.current_position is not None
             and route.route_summary_length is not None
         ):
-            # Kick off async reranking; display immediately once done.
-            self._rerank_task = asyncio.create_task(self._handle_result_list_with_detour(intent, limited_resp))
-            route.detour_task = self._rerank_task
+            # Display immediately, then rerank as the routes arrive.
+            self._start_detour_rerank(intent, resp)
         else:
-            self._display_result_list(intent, limited_resp)
+            self._display_result_list(intent, resp)
+
+    def _start_detour_rerank(self, intent: SearchIntent, resp: Response) -> None:
+        self._cancel_detour_rerank()
+        self._rerank_task = asyncio.create_task(self._handle_result_list_with_detour(intent, resp))
+        self.map_w.route.detour_task = self._rerank_task
+
+    def _cancel_detour_rerank(self) -> None:
+        """Cancel the rerank in progress, and its pending routing requests."""
+        if self._rerank_task is not None and not self._rerank_task.done():
+            self._rerank_task.cancel()
 
     async def _handle_result_list_with_detour(self, intent: SearchIntent, resp: Response):
-        """Rerank *resp* items by minimal excursion distance, then display."""
+        """Display *resp*, then rerank its items by minimal excursion as their routes arrive.
+
+        While routes arrive, the list is repainted at most every
+        ``detour_repaint_interval_s`` seconds, and once more that long after a
+        skipped update: the reranked items first, then the items still waiting
+        for their route, in their original order.  Items the ranker left out
+        (pruned before routing, or dropped once routed) are not listed.
+        """
         route = self.map_w.route
-        ranker = DetourRanker(
-            credentials=self.credentials,
-            at_pos=route.search_at_position or route.current_position,
-            stop_pos=route.stop_position,
-            on_routing_request=self._increment_routing_api_calls,
-            route_cache=self.map_w.route._route_cache,
-        )
+        ranker = self._detour_ranker()
+        self._display_result_list(intent, resp)
+        items = resp.data.get("items", [])
+        if not any("position" in item for item in items):
+            return
+        loop = asyncio.get_running_loop()
+        scored: list[tuple[float, int, dict]] = []
+        painted_at = loop.time()
+        repaint: asyncio.TimerHandle | None = None
+
+        def paint_progress() -> None:
+            nonlocal painted_at, repaint
+            repaint = None
+            ranked = {index for _, index, _ in scored}
+            excluded = ranker.last_report.excluded
+            pending = [
+                item
+                for index, item in enumerate(items)
+                if "position" in item and index not in ranked and index not in excluded
+            ]
+            self._display_result_list(
+                intent, DetourRanker.ranked_response(resp, scored, pending), fit=False, clear_query=False
+            )
+            painted_at = loop.time()
+
         try:
-            reranked_resp = await ranker.rerank(
+            stream = ranker.iter_scored(
                 resp,
                 all_along=route.all_along,
                 # max_excursion=route.width * 3
+                top_k=self.result_buttons_w._max if self.detour_top_k is None else self.detour_top_k,
             )
+            async with aclosing(stream):
+                async for entry in stream:
+                    scored.append(entry)
+                    wait_s = painted_at + self.detour_repaint_interval_s - loop.time()
+                    if wait_s <= 0:
+                        if repaint is not None:
+                            repaint.cancel()
+                        paint_progress()
+                    elif repaint is None:
+                        repaint = loop.call_later(wait_s, paint_progress)
+            reranked_resp = DetourRanker.ranked_response(resp, scored)
+            self.logger.debug("Minimal-detour reranking: %s", ranker.last_report)
         except Exception:
             self.logger.exception("Minimal-detour reranking failed; falling back to original order")
             reranked_resp = resp
-        self._display_result_list(intent, reranked_resp)
+        finally:
+            if repaint is not None:
+                repaint.cancel()
+        self._display_result_list(intent, reranked_resp, fit=False, clear_query=False)
+
+    def _detour_ranker(self) -> DetourRanker:
+        route = self.map_w.route
+        return DetourRanker(
+            credentials=self.credentials,
+            at_pos=route.search_at_position or route.current_position,
+            stop_pos=route.stop_position,
+            on_routing_request=self._increment_routing_api_calls,
+            route_cache=route._route_cache,
+            backend=self.routing_backend,
+            engine=self.detour_engine,
+            route_index=route.engine.route_index if route.has_route else None,
+        )
+
+    async def _detour_polylines(self, item: dict) -> tuple[str, str] | None:
+        """Route the excursion to a result selected after a ``"matrix"`` rerank."""
+        position = item.get("position", {})
+        try:
+            return await self._detour_ranker().detour_polylines(
+                position["lat"], position["lng"], name_hint=item.get("address", {}).get("street")
+            )
+        except Exception:
+            self.logger.exception("Detour routing failed")
+            return None
 
     def _display_result_list(self, intent: SearchIntent, resp: Response, fit: bool = True, clear_query: bool = True):
         """Perform the actual UI update for a result list response."""
-        # Hydrate state (result_buttons_w) first so result_json_w can reuse _vicinity.
-        self.result_buttons_w.display(resp, intent=intent)
-        if self.result_json_w is not None:
-            self.result_json_w.display(resp)
-        self._display_result_map(resp, intent, fit=fit)
-        if clear_query:
-            self.clear_query_text()
+        limited_resp = self._limit_ui_response(resp)
+        with self._paint_transaction(intent, self._result_rows(limited_resp)):
+            # Hydrate state (result_buttons_w) first so result_json_w can reuse _vicinity.
+            self.result_buttons_w.display(limited_resp, intent=intent)
+            if self.result_json_w is not None:
+                self.result_json_w.display(limited_resp)
+            self._display_result_map(resp, intent, fit=fit)
+            if clear_query:
+                self.clear_query_text()
 
     def handle_result_details(self, intent: SearchIntent, lookup_resp: Response):
         """
@@ -613,10 +752,46 @@ class OneBoxMap(UserProfileMixin, OneBoxCore):
         :param lookup_resp: the lookup Response instance to handle
         :return: None
         """
+        with self._paint_transaction(intent, (intent.materialization.rank,)):
+            if self.result_json_w is not None:
+                self.result_json_w.display(lookup_resp)
+            self.result_buttons_w.modify(lookup_resp, intent=intent)
+            self._display_result_map(lookup_resp, intent, fit=True)
+
+    def _result_rows(self, resp: Response) -> range:
+        """Return the ranks of the result rows a paint of *resp* shows."""
+        items = resp.data.get("items", []) if resp.data else []
+        return range(min(len(items), self.result_buttons_w._max))
+
+    def _paint_transaction(self, intent: SearchIntent, ranks: Iterable[int] = ()):
+        """Coalesce the widget updates of one response paint, see :mod:`here_search_demo.widgets.render`."""
+        return render_transaction(
+            self._paint_widgets(ranks), on_commit=lambda transaction: self._on_paint_committed(intent, transaction)
+        )
+
+    def _paint_widgets(self, ranks: Iterable[int]) -> Iterator[Widget]:
+        """Yield the widgets a response paint updates several traits of.
+
+        Only the result rows at *ranks* are held: the other rows of the pool
+        are not touched by the paint.
+        """
+        buttons = self.result_buttons_w
+        yield buttons._inner_box
+        for rank in ranks:
+            if rank < len(buttons.buttons):
+                box = buttons.buttons[rank]
+                yield from (box, box.label, box.button, box.button_box)
+        yield self.query_terms_w
+        yield from self.query_terms_w.children
         if self.result_json_w is not None:
-            self.result_json_w.display(lookup_resp)
-        self.result_buttons_w.modify(lookup_resp, intent=intent)
-        self._display_result_map(lookup_resp, intent, fit=True)
+            yield self.result_json_w
+        yield self.map_w
+        if self.map_w.collection is not None:
+            yield self.map_w.collection
+
+    def _on_paint_committed(self, intent: SearchIntent, transaction: RenderTransaction) -> None:
+        """Record the comm messages sent to paint the response to *intent*."""
+        self.last_paint_messages = transaction.messages
 
     def clear_query_text(self):
         self.query_box_w.text_w.value = ""
@@ -0,0 +1,237 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Hierarchical point clustering of result features, in the style of *supercluster*.
+
+:class:`ClusterIndex` is built once per response: points are projected to unit
+web-Mercator coordinates and, from ``max_zoom`` down to ``min_zoom``, the
+points and clusters of the level above are greedily merged with their
+neighbours closer than ``radius`` pixels at that zoom.  Each level is bucketed
+by the map tiles of its zoom so that :meth:`ClusterIndex.clusters` only visits
+the tiles covering the requested viewport: the cost of a zoom or pan does not
+depend on the number of results outside the view.
+
+Clusters are returned as GeoJSON point features with a ``"cluster"`` property;
+individual results are returned as their original feature.
+"""
+
+import math
+from collections.abc import Iterator
+
+_Bounds = tuple[tuple[float, float], tuple[float, float]]
+
+
+def _project(lng: float, lat: float) -> tuple[float, float]:
+    """Return the unit web-Mercator ``(x, y)`` of a position, ``y`` growing southwards."""
+    sin_lat = max(-0.9999, min(0.9999, math.sin(math.radians(lat))))
+    return (lng + 180) / 360, 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+
+
+def _unproject(x: float, y: float) -> tuple[float, float]:
+    """Return the ``(lng, lat)`` of a unit web-Mercator ``(x, y)``."""
+    lat = math.degrees(2 * math.atan(math.exp((1 - 2 * y) * math.pi)) - math.pi / 2)
+    return x * 360 - 180, lat
+
+
+class _Node:
+    """A point or a cluster of one index level.
+
+    :ivar index: feature index of a point, ``None`` for a cluster
+    :ivar cluster_id: unique id of a cluster, ``None`` for a point
+    :ivar zoom: zoom level at which the cluster was formed
+    :ivar children: points and clusters of the level above merged into this cluster
+    """
+
+    __slots__ = ("children", "cluster_id", "count", "index", "x", "y", "zoom")
+
+    def __init__(self, x: float, y: float, count: int, index: int | None = None):
+        self.x = x
+        self.y = y
+        self.count = count
+        self.index = index
+        self.cluster_id: int | None = None
+        self.zoom: int | None = None
+        self.children: list[_Node] = []
+
+
+class _Level:
+    """The nodes of one zoom level, bucketed by the map tiles of that zoom."""
+
+    __slots__ = ("nodes", "tiles", "zoom")
+
+    def __init__(self, zoom: int, nodes: list[_Node]):
+        self.zoom = zoom
+        self.nodes = nodes
+        scale = 2**zoom
+        self.tiles: dict[tuple[int, int], list[_Node]] = {}
+        for node in nodes:
+            self.tiles.setdefault(
+                (min(scale - 1, int(node.x * scale)), min(scale - 1, int(node.y * scale))), []
+            ).append(node)
+
+    def within(self, x_min: float, y_min: float, x_max: float, y_max: float) -> Iterator[_Node]:
+        """Yield the nodes inside the unit-coordinate box, visiting only the tiles it covers."""
+        scale = 2**self.zoom
+        last = scale - 1
+        tx_min, tx_max = max(0, int(x_min * scale)), min(last, int(x_max * scale))
+        ty_min, ty_max = max(0, int(y_min * scale)), min(last, int(y_max * scale))
+        tiles = self.tiles
+        if (tx_max - tx_min + 1) * (ty_max - ty_min + 1) > len(tiles):
+            # Zoomed out: fewer occupied tiles than tiles in view.
+            candidates = (
+                node
+                for (tx, ty), nodes in tiles.items()
+                if tx_min <= tx <= tx_max and ty_min <= ty <= ty_max
+                for node in nodes
+            )
+        else:
+            candidates = (
+                node
+                for tx in range(tx_min, tx_max + 1)
+                for ty in range(ty_min, ty_max + 1)
+                for node in tiles.get((tx, ty), ())
+            )
+        for node in candidates:
+            if x_min <= node.x <= x_max and y_min <= node.y <= y_max:
+                yield node
+
+
+class ClusterIndex:
+    """Zoom-indexed clusters of GeoJSON point features.
+
+    :param features: GeoJSON point Features, in priority (rank) order
+    :param min_zoom: Lowest zoom level clustered
+    :param max_zoom: Highest zoom level clustered; above it every point is
+        returned individually
+    :param radius: Cluster radius, in pixels of 256-pixel tiles
+    """
+
+    default_radius = 60.0
+
+    def __init__(
+        self,
+        features: list[dict],
+        min_zoom: int = 0,
+        max_zoom: int = 16,
+        radius: float | None = None,
+    ):
+        self.features = features
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.radius = radius or ClusterIndex.default_radius
+        self._clusters_by_id: dict[int, _Node] = {}
+        points = []
+        for index, feature in enumerate(features):
+            lng, lat = feature["geometry"]["coordinates"][:2]
+            points.append(_Node(*_project(lng, lat), count=1, index=index))
+        self._levels: dict[int, _Level] = {max_zoom + 1: _Level(max_zoom + 1, points)}
+        nodes = points
+        for zoom in range(max_zoom, min_zoom - 1, -1):
+            nodes = self._cluster(nodes, zoom)
+            self._levels[zoom] = _Level(zoom, nodes)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _cluster(self, nodes: list[_Node], zoom: int) -> list[_Node]:
+        """Merge *nodes* (the level ``zoom + 1``) closer than :attr:`radius` pixels at *zoom*."""
+        r = self.radius / (256 * 2**zoom)
+        r2 = r * r
+        # Grid with cells of the cluster radius: neighbours lie in the 3×3 cells around a node.
+        cells: dict[tuple[int, int], list[_Node]] = {}
+        for node in nodes:
+            cells.setdefault((int(node.x / r), int(node.y / r)), []).append(node)
+        merged: set[int] = set()
+        clusters = []
+        for node in nodes:
+            if id(node) in merged:
+                continue
+            merged.add(id(node))
+            cx, cy = int(node.x / r), int(node.y / r)
+            neighbours = [
+                other
+                for gx in (cx - 1, cx, cx + 1)
+                for gy in (cy - 1, cy, cy + 1)
+                for other in cells.get((gx, gy), ())
+                if id(other) not in merged and (other.x - node.x) ** 2 + (other.y - node.y) ** 2 <= r2
+            ]
+            if not neighbours:
+                clusters.append(node)
+                continue
+            members = [node, *neighbours]
+            merged.update(id(other) for other in neighbours)
+            count = sum(member.count for member in members)
+            cluster = _Node(
+                sum(member.x * member.count for member in members) / count,
+                sum(member.y * member.count for member in members) / count,
+                count=count,
+            )
+            cluster.cluster_id = len(self._clusters_by_id)
+            cluster.zoom = zoom
+            cluster.children = members
+            self._clusters_by_id[cluster.cluster_id] = cluster
+            clusters.append(cluster)
+        return clusters
+
+    def level_zoom(self, zoom: float) -> int:
+        """Return the index level used for map zoom *zoom*."""
+        return max(self.min_zoom, min(self.max_zoom + 1, int(zoom)))
+
+    def clusters(self, bounds: _Bounds | None, zoom: float) -> list[dict]:
+        """Return the clusters and points displayed at *zoom* within *bounds*.
+
+        :param bounds: ``((south, west), (north, east))`` viewport, ``None`` for the whole world.
+            A ``west`` greater than ``east`` denotes a viewport crossing the antimeridian.
+        :param zoom: Map zoom level
+        :return: GeoJSON Features, points in their original order, then clusters
+        """
+        level = self._levels[self.level_zoom(zoom)]
+        if bounds is None:
+            nodes = level.nodes
+        else:
+            (south, west), (north, east) = bounds
+            x_min, y_max = _project(west, max(-90.0, south))
+            x_max, y_min = _project(east, min(90.0, north))
+            if west <= east:
+                nodes = list(level.within(x_min, y_min, x_max, y_max))
+            else:
+                nodes = [*level.within(x_min, y_min, 1.0, y_max), *level.within(0.0, y_min, x_max, y_max)]
+        points = sorted(node.index for node in nodes if node.index is not None)
+        clusters = sorted((node for node in nodes if node.index is None), key=lambda node: node.cluster_id)
+        return [self.features[index] for index in points] + [self._cluster_feature(node) for node in clusters]
+
+    def leaves(self, cluster_id: int) -> list[dict]:
+        """Return the features of all the points in a cluster, in their original order."""
+        stack = [self._clusters_by_id[cluster_id]]
+        indexes = []
+        while stack:
+            node = stack.pop()
+            if node.index is not None:
+                indexes.append(node.index)
+            stack.extend(node.children)
+        return [self.features[index] for index in sorted(indexes)]
+
+    def expansion_zoom(self, cluster_id: int) -> int:
+        """Return the zoom level at which a cluster splits into its children."""
+        return self._clusters_by_id[cluster_id].zoom + 1
+
+    def _cluster_feature(self, node: _Node) -> dict:
+        lng, lat = _unproject(node.x, node.y)
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lng, lat]},
+            "properties": {
+                "id": f"cluster:{node.cluster_id}",
+                "cluster": True,
+                "cluster_id": node.cluster_id,
+                "point_count": node.count,
+                "title": f"{node.count} results",
+                "position": {"lat": lat, "lng": lng},
+            },
+        }
@@ -9,6 +9,7 @@
 """Text-input and taxonomy-button widgets.
 
 This module contains all *non-map* input widgets:
+- :class:`AdaptiveDebounce`
 - :class:`SubmittableText`
 - :class:`SubmittableTextBox`
 - :class:`SearchTermsBox`
@@ -18,6 +19,7 @@ This module contains all *non-map* input widgets:
 """
 
 import asyncio
+from collections import Counter
 from time import perf_counter_ns
 from typing import Callable, Sequence
 
@@ -27,10 +29,117 @@ from traitlets.utils.bunch import Bunch
 
 from here_search_demo.entity.intent import SearchIntent
 from here_search_demo.entity.place import PlaceTaxonomy, PlaceTaxonomyItem
+from here_search_demo.tracing import LatencyTracer
 from here_search_demo.util import set_dict_values
 from here_search_demo.widgets.state import SearchState
 
 
+class AdaptiveDebounce:
+    """Debounce-delay controller driven by autosuggest latency and typing cadence.
+
+    The controller keeps an EWMA of the autosuggest round-trip time (RTT) and
+    of the inter-keystroke interval (IKI, only intervals shorter than
+    ``burst_gap`` count as typing cadence).  On each keystroke it picks:
+
+    * ``iki * cadence_factor`` when that still leaves the suggestion fresh,
+      i.e. ``delay + rtt <= freshness_target``: no request is fired in the
+      middle of a typing burst (reason ``"cadence"``),
+    * else ``freshness_target - rtt`` when that is at least ``min_delay``:
+      freshness wins over a few wasted requests (reason ``"freshness"``),
+    * else ``iki * cadence_factor``: the backend is too slow to be fresh
+      anyway, so only wasted requests are minimized (reason ``"slow_backend"``).
+
+    Before any cadence has been observed the previous delay is nudged down
+    (reason ``"idle"``).  The result is clamped to ``[min_delay, max_delay]``.
+    A queue depth at or above ``backlog_threshold`` overrides the model and
+    grows the previous delay by 50% (reason ``"backlog"``).  Decisions are
+    exposed by :meth:`metrics`.
+    """
+
+    default_alpha = 0.3
+    default_freshness_target = 0.5
+    default_burst_gap = 1.0
+    default_cadence_factor = 1.2
+
+    def __init__(
+        self,
+        delay: float,
+        min_delay: float,
+        max_delay: float,
+        backlog_threshold: int,
+        freshness_target: float | None = None,
+        alpha: float | None = None,
+    ):
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backlog_threshold = backlog_threshold
+        self.freshness_target = freshness_target or AdaptiveDebounce.default_freshness_target
+        self.alpha = alpha or AdaptiveDebounce.default_alpha
+        self.rtt_ewma: float | None = None
+        self.iki_ewma: float | None = None
+        self._last_keystroke: float | None = None
+        self.keystrokes = 0
+        self.emitted = 0
+        self.reasons: Counter[str] = Counter()
+        self.last_reason: str | None = None
+
+    def _ewma(self, previous: float | None, sample: float) -> float:
+        return sample if previous is None else previous + self.alpha * (sample - previous)
+
+    def observe_keystroke(self, now: float) -> None:
+        """Record a keystroke at *now* (seconds, monotonic clock)."""
+        if self._last_keystroke is not None:
+            interval = now - self._last_keystroke
+            if 0 <= interval <= AdaptiveDebounce.default_burst_gap:
+                self.iki_ewma = self._ewma(self.iki_ewma, interval)
+        self._last_keystroke = now
+        self.keystrokes += 1
+
+    def observe_rtt(self, rtt: float) -> None:
+        """Record one autosuggest round-trip time, in seconds."""
+        self.rtt_ewma = self._ewma(self.rtt_ewma, rtt)
+
+    def observe_emit(self) -> None:
+        """Record that a debounced transient intent has been queued."""
+        self.emitted += 1
+
+    def decide(self, queue_depth: int = 0) -> float:
+        """Return (and remember) the delay to apply to the current keystroke."""
+        if self.iki_ewma is None:
+            delay, reason = self.delay * 0.9, "idle"
+        else:
+            cadence_delay = self.iki_ewma * AdaptiveDebounce.default_cadence_factor
+            budget = self.freshness_target - (self.rtt_ewma or 0.0)
+            if cadence_delay <= budget:
+                delay, reason = cadence_delay, "cadence"
+            elif budget >= self.min_delay:
+                delay, reason = budget, "freshness"
+            else:
+                delay, reason = cadence_delay, "slow_backend"
+        if queue_depth >= self.backlog_threshold:
+            # Back-pressure overrides the model: grow the previous delay.
+            self.delay, reason = min(self.max_delay, self.delay * 1.5), "backlog"
+        else:
+            self.delay = min(self.max_delay, max(self.min_delay, delay))
+        self.reasons[reason] += 1
+        self.last_reason = reason
+        return self.delay
+
+    def metrics(self) -> dict:
+        """Return the controller state and decision counters, e.g. for tuning."""
+        return {
+            "delay_ms": self.delay * 1000,
+            "rtt_ewma_ms": None if self.rtt_ewma is None else self.rtt_ewma * 1000,
+            "iki_ewma_ms": None if self.iki_ewma is None else self.iki_ewma * 1000,
+            "keystrokes": self.keystrokes,
+            "emitted": self.emitted,
+            "absorbed": max(0, self.keystrokes - self.emitted),
+            "last_reason": self.last_reason,
+            "reasons": dict(self.reasons),
+        }
+
+
 class SubmittableText(Text):
     """A ipywidgets Text class enhanced with an on_submit() method"""
 
@@ -72,7 +181,15 @@ class SubmittableText(Text):
 
 
 class SubmittableTextBox(HBox):
-    """A ipywidgets HBox made of a SubmittableText and a lens Button"""
+    """A ipywidgets HBox made of a SubmittableText and a lens Button
+
+    The debounce delay is chosen per keystroke by an :class:`AdaptiveDebounce`
+    controller (``self.debounce``); feed it autosuggest round-trip times with
+    ``self.debounce.observe_rtt``.
+
+    When a ``tracer`` keyword is given, the delay between the last keystroke
+    and the emitted transient intent is recorded as its ``debounce`` stage.
+    """
 
     default_icon = "search"
     default_button_width = "32px"
@@ -80,6 +197,7 @@ class SubmittableTextBox(HBox):
     min_debounce_delay = 0.05
     max_debounce_delay = 0.4
     queue_backlog_threshold = 3
+    freshness_target = AdaptiveDebounce.default_freshness_target
     default_simulation_delay_sec = 0.02
 
     def __init__(self, queue: asyncio.Queue, state: SearchState, *args, **kwargs):
@@ -93,7 +211,16 @@ class SubmittableTextBox(HBox):
         self._queue_get_nowait = queue.get_nowait
         self.state = state
         self._debounce_delay = text_kwargs.pop("debounce_delay", self.default_debounce_delay)
+        self.debounce = AdaptiveDebounce(
+            delay=self._debounce_delay,
+            min_delay=self.min_debounce_delay,
+            max_delay=self.max_debounce_delay,
+            backlog_threshold=self.queue_backlog_threshold,
+            freshness_target=text_kwargs.pop("freshness_target", self.freshness_target),
+        )
         self.max_transient_keep = text_kwargs.pop("max_transient_keep", 3)
+        self.tracer: LatencyTracer | None = text_kwargs.pop("tracer", None)
+        self._last_keystroke_ns: int | None = None
         self._debounce_task: asyncio.Task | None = None
         self._pending_transient_value: str | None = None
         self._last_queued_transient_value: str | None = None
@@ -113,9 +240,11 @@ class SubmittableTextBox(HBox):
                 self.state.set_query_text(value)
                 if value:
                     if value != self._last_queued_transient_value:
-                        self._queue_put(
-                            SearchIntent(kind="transient_text", materialization=value, time=perf_counter_ns())
-                        )
+                        intent = SearchIntent(kind="transient_text", materialization=value, time=perf_counter_ns())
+                        if self.tracer is not None and self._last_keystroke_ns is not None:
+                            self.tracer.record(intent, "debounce", self._last_keystroke_ns, intent.time)
+                        self._queue_put(intent)
+                        self.debounce.observe_emit()
                         self._last_queued_transient_value = value
                         self._trim_transients(self.max_transient_keep)
                 else:
@@ -133,12 +262,11 @@ class SubmittableTextBox(HBox):
                 depth = int(raw_depth)
             except Exception:
                 depth = 0
-            if depth >= self.queue_backlog_threshold:
-                self._debounce_delay = min(self.max_debounce_delay, self._debounce_delay * 1.5)
-            else:
-                self._debounce_delay = max(self.min_debounce_delay, self._debounce_delay * 0.9)
+            self._debounce_delay = self.debounce.decide(depth)
 
         def on_value_change(change: Bunch):
+            self._last_keystroke_ns = perf_counter_ns()
+            self.debounce.observe_keystroke(self._last_keystroke_ns / 1e9)
             self._pending_transient_value = change.new or ""
             adjust_debounce_delay()
             cancel_debounce()
@@ -0,0 +1,142 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Collapsible JSON tree widget that only renders the subtrees the user opens.
+
+Rendering a whole response with ``IPython.display.JSON`` or an indented dump
+serializes and ships every item, fuel price and media block on each display.
+:class:`JsonTree` instead starts collapsed: an object or array is a single
+toggle line (``▸ items [20]``) whose children are built the first time it is
+expanded, and large containers show their children ``page_size`` at a time.
+Consecutive scalar members share one ``HTML`` widget.
+"""
+
+from html import escape
+
+import orjson
+from ipywidgets import HTML, Button, Layout, VBox, Widget
+
+_toggle_layout = {"width": "auto", "height": "18px", "padding": "0", "margin": "0"}
+_children_layout = {"padding": "0 0 0 12px", "margin": "0"}
+
+
+def _summary(value: dict | list) -> str:
+    if isinstance(value, dict):
+        return f"{{{len(value)}}}"
+    return f"[{len(value)}]"
+
+
+class _JsonNode(VBox):
+    """One object or array of the tree: a toggle line and, once expanded, its members."""
+
+    def __init__(self, key: str, value: dict | list, page_size: int, expanded: bool = False):
+        self.key = key
+        self.value = value
+        self.page_size = page_size
+        self.expanded = False
+        self.shown = 0
+        self._members = list(value.items()) if isinstance(value, dict) else list(enumerate(value))
+        self.toggle = Button(description="", layout=Layout(**_toggle_layout))
+        self.toggle.style.button_color = "transparent"
+        self.toggle.on_click(lambda _: self.set_expanded(not self.expanded))
+        self.body: VBox | None = None
+        self.more: Button | None = None
+        super().__init__([self.toggle], layout=Layout(margin="0"))
+        self._update_toggle()
+        if expanded:
+            self.set_expanded(True)
+
+    def _update_toggle(self) -> None:
+        arrow = "▾" if self.expanded else "▸"
+        self.toggle.description = f"{arrow} {self.key} {_summary(self.value)}"
+
+    def set_expanded(self, expanded: bool) -> None:
+        """Show or hide the members, building the first page on first expansion."""
+        self.expanded = expanded
+        self._update_toggle()
+        if expanded and self.body is None:
+            self.body = VBox([], layout=Layout(**_children_layout))
+            self.show_more()
+        if self.body is not None:
+            self.children = [self.toggle, self.body] if expanded else [self.toggle]
+
+    def show_more(self) -> None:
+        """Append the next ``page_size`` members."""
+        start, stop = self.shown, min(len(self._members), self.shown + self.page_size)
+        widgets = list(self.body.children)
+        if widgets and widgets[-1] is self.more:
+            widgets.pop()
+        scalars: list[str] = []
+        for key, value in self._members[start:stop]:
+            if isinstance(value, (dict, list)) and value:
+                if scalars:
+                    widgets.append(_scalars_html(scalars))
+                    scalars = []
+                widgets.append(_JsonNode(str(key), value, self.page_size))
+            else:
+                scalars.append(_scalar_line(key, value))
+        if scalars:
+            widgets.append(_scalars_html(scalars))
+        self.shown = stop
+        if stop < len(self._members):
+            if self.more is None:
+                self.more = Button(layout=Layout(**_toggle_layout))
+                self.more.style.button_color = "transparent"
+                self.more.on_click(lambda _: self.show_more())
+            self.more.description = f"… {len(self._members) - stop} more"
+            widgets.append(self.more)
+        self.body.children = widgets
+
+    def close(self) -> None:
+        if self.body is not None:
+            for child in self.body.children:
+                child.close()
+            self.body.close()
+        if self.more is not None:
+            self.more.close()
+        self.toggle.close()
+        super().close()
+
+
+def _scalar_line(key, value) -> str:
+    return f"<b>{escape(str(key))}</b>: {escape(orjson.dumps(value).decode())}"
+
+
+def _scalars_html(lines: list[str]) -> HTML:
+    return HTML(
+        value="<div style='font-family: monospace; font-size: 11px; line-height: 1.4; white-space: nowrap;'>"
+        + "<br>".join(lines)
+        + "</div>",
+        layout=Layout(margin="0"),
+    )
+
+
+class JsonTree(VBox):
+    """Lazily expanded view of a JSON value.
+
+    :param value: JSON value (``dict``, ``list`` or scalar)
+    :param root: Label of the root line
+    :param expanded: Whether the root starts expanded; nested containers always start collapsed
+    :param page_size: Members shown per expansion step of large containers
+    """
+
+    default_page_size = 50
+
+    def __init__(self, value, root: str = "root", expanded: bool = False, page_size: int | None = None, **kwargs):
+        self.value = value
+        page_size = page_size or JsonTree.default_page_size
+        if isinstance(value, (dict, list)):
+            self.node: Widget = _JsonNode(root, value, page_size, expanded=expanded)
+        else:
+            self.node = _scalars_html([_scalar_line(root, value)])
+        super().__init__([self.node], **kwargs)
+
+    def close(self) -> None:
+        self.node.close()
+        super().close()
@@ -0,0 +1,127 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Pixel-space collision index for map text labels.
+
+:class:`LabelCollisionGrid` buckets placed label bounding boxes (as returned by
+:func:`~here_search_demo.widgets.output_helpers.label_pixel_bbox`) into a
+uniform grid so that testing a candidate label only looks at the boxes sharing
+its cells instead of every box placed so far.  With labels a few cells wide
+this makes each placement close to O(1) rather than O(n).
+
+:func:`collision_min_zooms` uses it to precompute, once per result set, the
+zoom level from which each label is displayed ("collision zoom"), so that zoom
+changes only toggle the labels whose threshold was crossed.
+"""
+
+import math
+from collections.abc import Callable
+
+from here_search_demo.widgets.output_helpers import pixel_bboxes_overlap
+
+_BBox = tuple[float, float, float, float]
+
+
+class LabelCollisionGrid:
+    """Uniform grid of placed ``(x_min, y_min, x_max, y_max)`` pixel boxes.
+
+    Overlap uses :func:`~here_search_demo.widgets.output_helpers.pixel_bboxes_overlap`
+    semantics: boxes that merely touch do not collide.
+
+    :param cell_size: Grid cell edge, in pixels.  Cells about the size of a
+        label line keep both the per-query cell count and the per-cell
+        population small.
+    """
+
+    default_cell_size = 128.0
+
+    def __init__(self, cell_size: float | None = None):
+        self.cell_size = cell_size or LabelCollisionGrid.default_cell_size
+        self._cells: dict[tuple[int, int], list[_BBox]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _cell_range(self, bbox: _BBox) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(bbox[0] / size),
+            math.floor(bbox[1] / size),
+            math.floor(bbox[2] / size),
+            math.floor(bbox[3] / size),
+        )
+
+    def overlaps(self, bbox: _BBox) -> bool:
+        """Return ``True`` when *bbox* overlaps any placed box."""
+        cx_min, cy_min, cx_max, cy_max = self._cell_range(bbox)
+        cells = self._cells
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                for placed in cells.get((cx, cy), ()):
+                    if pixel_bboxes_overlap(bbox, placed):
+                        return True
+        return False
+
+    def insert(self, bbox: _BBox) -> None:
+        """Add *bbox* to the index without checking for collisions."""
+        cx_min, cy_min, cx_max, cy_max = self._cell_range(bbox)
+        cells = self._cells
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                cells.setdefault((cx, cy), []).append(bbox)
+        self._count += 1
+
+    def place(self, bbox: _BBox) -> bool:
+        """Insert *bbox* if it overlaps no placed box; return whether it was placed."""
+        if self.overlaps(bbox):
+            return False
+        self.insert(bbox)
+        return True
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._count = 0
+
+
+def collision_min_zooms(
+    count: int,
+    bbox_at: Callable[[int, int], _BBox],
+    min_zoom: int,
+    max_zoom: int,
+) -> list[int | None]:
+    """Return, for each of *count* labels, the lowest zoom from which it is displayed.
+
+    Labels are indexed in priority order: a label is displayed at a zoom when
+    it does not overlap any higher-priority label displayed at that zoom, and
+    a label displayed at some zoom stays displayed when zooming in.  Since
+    screen distances double with each zoom level while label sizes do not,
+    pairs that do not overlap at a zoom do not overlap at higher zooms either.
+    The levels are computed from ``max_zoom`` down: a label is displayed at
+    ``z`` if it is displayed at ``z + 1`` and does not collide, at ``z``, with
+    a higher-priority label displayed at ``z``.
+
+    :param count: Number of labels
+    :param bbox_at: Returns the pixel bbox of label ``index`` at ``zoom``
+    :param min_zoom: Lowest zoom level considered
+    :param max_zoom: Highest zoom level considered
+    :return: One zoom level per label, ``None`` for labels hidden even at
+        ``max_zoom``
+    """
+    result: list[int | None] = [None] * count
+    alive = range(count)
+    grid = LabelCollisionGrid()
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        grid.clear()
+        alive = [i for i in alive if grid.place(bbox_at(i, zoom))]
+        if not alive:
+            break
+        for i in alive:
+            result[i] = zoom
+    return result
@@ -18,6 +18,7 @@ from ipywidgets import HTML, Button, HBox, Label, Layout, VBox, Widget
 from here_search_demo.entity.endpoint import Endpoint
 from here_search_demo.entity.intent import ActionIntent, SearchIntent
 from here_search_demo.entity.response import LocationResponseItem, Response
+from here_search_demo.tracing import trace_stage
 from here_search_demo.widgets.state import SearchState
 
 from .output_details import ResultDetailsBox
@@ -165,7 +166,7 @@ class SearchResultButtons(VBox):
     default_overflow_y = "auto"
     default_overflow_x = "hidden"
     default_max_results_count = 20
-    default_button_pool_size = 200  # Pre-allocate buttons at init
+    default_button_pool_size = 200  # Target pool size, reached during idle ticks after show()
     default_button_pool_replenish_at = 0.1  # Trigger async replenish when <10% remain
     default_button_pool_chunk_size = 50  # Create buttons in chunks during replenish
     _collapse_intent_kinds = {
@@ -195,14 +196,14 @@ class SearchResultButtons(VBox):
         self.state = state or SearchState()
         self._max = max_results_number or self.default_max_results_count
         self._last_response_signature: tuple | None = None
-        # Pre-allocate button pool at init (one-time ~1.3s cost for 200 buttons)
-        # to eliminate per-search creation cost (~2.7ms for 5 buttons).
+        # Only the buttons of a first full result list are created here (~2.5ms each);
+        # the rest of the pool is built by warm_pool() across idle event-loop ticks
+        # to eliminate per-search creation cost without delaying construction.
         self.buttons: list[SearchResultButtonBox] = []
         self._button_pool_size = self.default_button_pool_size
         self._replenish_threshold = int(self._button_pool_size * self.default_button_pool_replenish_at)
         self._replenish_in_progress = False
         self._replenish_task: asyncio.Task | None = None
-        # Pre-populate the button pool
         self._initialize_button_pool()
         self._last_visible_ranks_signature: tuple[int, ...] = ()
         self._last_expanded_signature: tuple[int, ...] = ()
@@ -246,31 +247,55 @@ class SearchResultButtons(VBox):
         )
 
     def _initialize_button_pool(self) -> None:
-        """Pre-allocate button pool at init time (~1.3s for 200 buttons)."""
+        """Create the buttons needed by the first visible result list."""
+        initial_size = min(self._max, self._button_pool_size)
         start_ns = perf_counter_ns()
-        for _ in range(self._button_pool_size):
+        for _ in range(initial_size):
             self.buttons.append(SearchResultButtonBox(self.queue, self.state, on_result_click=self.on_result_click))
         elapsed_ns = perf_counter_ns() - start_ns
-        self._on_pool_initialized(elapsed_ns, self._button_pool_size)
+        self._on_pool_initialized(elapsed_ns, initial_size)
+
+    def warm_pool(self) -> None:
+        """Schedule the growth of the button pool up to its target size.
+
+        The buttons are created in chunks during idle event-loop ticks. Nothing
+        is scheduled when no event loop is running or when warming is already
+        in progress.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._replenish_task is None or self._replenish_task.done():
+            self._replenish_task = loop.create_task(self._warm_pool_async())
+
+    async def _warm_pool_async(self) -> None:
+        while len(self.buttons) < self._button_pool_size:
+            chunk_size = min(self.default_button_pool_chunk_size, self._button_pool_size - len(self.buttons))
+            await self._replenish_pool_async(chunk_size)
+            await asyncio.sleep(0)
 
     async def _replenish_pool_async(self, chunk_size: int | None = None) -> None:
         """Asynchronously replenish button pool during idle phases.
 
         Called when pool approaches exhaustion. Creates new buttons in chunks
-        to spread load across multiple event loop cycles.
+        to spread load across multiple event loop cycles. The pool never grows
+        past its target size, even when a warm-up runs alongside.
         """
-        chunk_size = chunk_size or self.default_button_pool_chunk_size
+        chunk_size = min(chunk_size or self.default_button_pool_chunk_size, self._button_pool_size - len(self.buttons))
         self._replenish_in_progress = True
         try:
             # Create new chunk
             start_ns = perf_counter_ns()
-            for _ in range(chunk_size):
+            created = 0
+            while created < chunk_size and len(self.buttons) < self._button_pool_size:
                 self.buttons.append(SearchResultButtonBox(self.queue, self.state, on_result_click=self.on_result_click))
                 # Yield to event loop every 10 buttons to avoid blocking
-                if _ % 10 == 0:
+                if created % 10 == 0:
                     await asyncio.sleep(0)
+                created += 1
             elapsed_ns = perf_counter_ns() - start_ns
-            self._on_pool_replenished(elapsed_ns, chunk_size)
+            self._on_pool_replenished(elapsed_ns, created)
         finally:
             self._replenish_in_progress = False
 
@@ -281,7 +306,12 @@ class SearchResultButtons(VBox):
             and len(self.buttons) < self._replenish_threshold
             and (self._replenish_task is None or self._replenish_task.done())
         ):
-            self._replenish_task = asyncio.create_task(self._replenish_pool_async())
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop (e.g. synchronous use before show()): _ensure_buttons grows the pool on demand.
+                return
+            self._replenish_task = loop.create_task(self._replenish_pool_async())
 
     def _ensure_buttons(self, up_to_rank: int) -> None:
         """Ensure button pool covers *up_to_rank* (buttons pre-allocated, no creation here)."""
@@ -307,11 +337,12 @@ class SearchResultButtons(VBox):
         start_ns = perf_counter_ns()
         ranks_visited = 0
         ranks_mutated = 0
-        for rank in visible_ranks:
-            if rank < len(self.buttons):
-                ranks_visited += 1
-                if self.buttons[rank].render(rank):
-                    ranks_mutated += 1
+        with trace_stage("render"):
+            for rank in visible_ranks:
+                if rank < len(self.buttons):
+                    ranks_visited += 1
+                    if self.buttons[rank].render(rank):
+                        ranks_mutated += 1
         elapsed_ns = perf_counter_ns() - start_ns
         ranks_noop = max(0, ranks_visited - ranks_mutated)
         self._on_buttons_rendered(elapsed_ns, len(visible_ranks), ranks_visited, ranks_mutated, ranks_noop)
@@ -9,7 +9,7 @@
 
 """Widgets for rendering HERE response item details.
 
-This module provides two components:
+This module provides three components:
 
 * :class:`DetailsMixin` — a mixin that generates an HTML summary string for a
   single HERE response item (place or location).  It covers opening hours,
@@ -18,6 +18,9 @@ This module provides two components:
   :class:`~here_search_demo.widgets.output_map.ResponseMap` (marker popups) and
   by :class:`ResultDetailsBox` (standalone panel).
 
+* :class:`DetailsHtmlCache` — the LRU cache of the generated HTML, keyed by
+  place ``id`` and a digest of the rendered item fields, with hit statistics.
+
 * :class:`ResultDetailsBox` — a ``VBox`` ipywidget that wraps
   :class:`DetailsMixin` output in a popup-styled container, suitable for
   embedding directly in a notebook or panel layout.
@@ -27,16 +30,95 @@ Pure price-formatting helpers live in
 ``_fuel_price_text`` there.
 """
 
+import hashlib
 import re
+from collections import OrderedDict
 from urllib.parse import urlparse
 
+import orjson
 from ipywidgets import HTML, Layout, VBox
 
 from here_search_demo.entity.place import ev_category_ids, gas_category_ids
 from here_search_demo.entity.response_data import LocationDataItemDict, PlaceDataItemDict
+from here_search_demo.offload import offload
 from here_search_demo.widgets import output_helpers as fr
 
 
+class DetailsHtmlCache:
+    """LRU cache of details HTML, keyed by content rather than object identity.
+
+    A key combines the place ``id``, the image variant and a digest of the
+    item fields the renderer reads, so the same place returned by
+    autosuggest, discover and lookup shares one entry, and an item whose
+    details changed (e.g. EV availability) gets a new one.
+
+    :param max_entries: Maximum number of retained HTML strings.
+    """
+
+    default_max_entries = 512
+    # Item fields read by DetailsMixin.html.
+    rendered_fields = (
+        "resultType",
+        "address",
+        "categories",
+        "openingHours",
+        "extended",
+        "contacts",
+        "media",
+        "references",
+    )
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or DetailsHtmlCache.default_max_entries
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def key(cls, data: dict, image_variant: str | None = None) -> tuple:
+        """Return the cache key of *data* rendered with *image_variant*."""
+        content = orjson.dumps({field: data.get(field) for field in cls.rendered_fields}, option=orjson.OPT_SORT_KEYS)
+        return data.get("id"), image_variant or "", hashlib.blake2b(content, digest_size=16).digest()
+
+    def get(self, key: tuple) -> str | None:
+        html = self._entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return html
+
+    def put(self, key: tuple, html: str) -> None:
+        self._entries[key] = html
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def stats(self) -> dict[str, float]:
+        """Return ``hits``, ``misses``, ``evictions``, ``entries`` and ``hit_rate``."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
 class DetailsMixin:
     ev_icon = (
         '<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 20010904//EN" "http://www.w3.org/TR/2001/REC-SVG-20010904/DTD/svg10.dtd">'
@@ -70,18 +152,66 @@ class DetailsMixin:
                  <img src='https://static.tacdn.com/img2/brand_refresh_2025/logos/logo.svg' style='height: 14px; margin-right: 4px;' />
                  <img src='https://static.tacdn.com/img2/ratings/traveler/ss{rating}.svg' style='height: 14px;' />
                  <span style='font-size: 10px; color: #333;'>/ Reviews: {reviews}</span></div>"""
-    _html_cache: dict[tuple[int, str], str] = {}
-    _html_cache_max_entries = 512
+    # Shared by all the details renderers of the session.
+    html_cache = DetailsHtmlCache()
 
     # Delegating alias — canonical implementation lives in feature_rendering.
     _fuel_price_text = staticmethod(fr.fuel_price_text)
 
     def html(self, data: PlaceDataItemDict | LocationDataItemDict, image_variant: str | None = None) -> str:
-        cache_key = (id(data), image_variant or "")
-        cached_html = self._html_cache.get(cache_key)
+        cache_key = DetailsHtmlCache.key(data, image_variant)
+        cached_html = self.html_cache.get(cache_key)
         if cached_html is not None:
             return cached_html
+        html = self._render_html(data, image_variant)
+        self.html_cache.put(cache_key, html)
+        return html
 
+    def prerender_html(self, items: list[dict], image_variant: str | None = None) -> int:
+        """Render and cache the details HTML of *items* not cached yet.
+
+        :param items: HERE response item dicts
+        :param image_variant: Image variant of the HTML to prepare
+        :return: number of items rendered
+        """
+        rendered = 0
+        for data in items:
+            cache_key = DetailsHtmlCache.key(data, image_variant)
+            if cache_key not in self.html_cache:
+                self.html_cache.put(cache_key, self._render_html(data, image_variant))
+                rendered += 1
+        return rendered
+
+    async def prerender_html_async(self, items: list[dict], image_variant: str | None = None) -> int:
+        """Like :meth:`prerender_html`, rendering off the event loop.
+
+        :param items: HERE response item dicts
+        :param image_variant: Image variant of the HTML to prepare
+        :return: number of items rendered
+        """
+        missing = {}
+        for data in items:
+            cache_key = DetailsHtmlCache.key(data, image_variant)
+            if cache_key not in self.html_cache:
+                missing[cache_key] = data
+        if not missing:
+            return 0
+        htmls = await offload(
+            self._render_html_batch, list(missing.values()), image_variant, key=("details-prerender", id(self))
+        )
+        for cache_key, html in zip(missing, htmls):
+            self.html_cache.put(cache_key, html)
+        return len(missing)
+
+    def _features_cache(self) -> dict[str, fr.ItemFeatures] | None:
+        """Return the derived item features shared with the search state, if any."""
+        state = getattr(self, "state", None)
+        return state.features_by_id if state is not None else None
+
+    def _render_html_batch(self, items: list[dict], image_variant: str | None) -> list[str]:
+        return [self._render_html(data, image_variant) for data in items]
+
+    def _render_html(self, data: PlaceDataItemDict | LocationDataItemDict, image_variant: str | None) -> str:
         html_parts = []
 
         address_label = data.get("address", {}).get("label", "")
@@ -94,80 +224,39 @@ class DetailsMixin:
             html_parts.append(
                 f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{no_place_name_address_label}</div>"
             )
-            primary_category = next((c for c in data.get("categories", []) if c.get("primary")), None)
-            category_id = primary_category.get("id") if primary_category else None
-            category_name = primary_category.get("name", "") if primary_category else ""
-
-            html_parts.append(f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{category_name}</div>")
-
-            opening_hours_list = data.get("openingHours", [])
-            if category_id and opening_hours_list:
-                is_open = None
-                text_lines = []
-                for oh in opening_hours_list:
-                    if any(cat.get("id") == category_id for cat in oh.get("categories", [])):
-                        is_open = oh.get("isOpen")
-                        text_lines = oh.get("text", [])
-                        break
-                else:
-                    # No opening hours for the primary category, take the first one without category restriction
-                    for oh in opening_hours_list:
-                        if "categories" not in oh or not oh["categories"]:
-                            is_open = oh.get("isOpen")
-                            text_lines = oh.get("text", [])
-                            break
-
-                if is_open is not None:
-                    status = "&#x1F7E2; Open" if is_open else "&#x1F534; Closed"
-                    details_html = (
-                        "<details style='margin: 4px 0; display: block;'>"
-                        "<summary style='"
-                        "display: list-item; "
-                        "margin: 0;  padding: 0; line-height: 1.2;"
-                        "font-weight: normal; "
-                        "font-size: 10px; "
-                        "line-height: 1.2; "
-                        "color: inherit; "
-                        "font-family: inherit;"
-                        "'>"
-                        f"{status}</summary>"
-                        + "".join(
-                            f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{line}</div>" for line in text_lines
-                        )
-                        + "</details>"
-                    )
-
-                    html_parts.append(details_html)
-
-            if category_id in self.ev_categories and "extended" in data:
-                for group in data["extended"].get("evStation", {}).get("connectors", []):
-                    connector_name = group["connectorType"]["name"]
-                    if connector_name[-1] == ")":
-                        connector_name = connector_name[: connector_name.rindex("(")].strip()
-                    power_kw = int(group.get("maxPowerLevel"))
-                    number_of_available = group.get("chargingPoint", {}).get("numberOfAvailable")
-                    number_of_connectors = group.get("chargingPoint", {}).get("numberOfConnectors")
-                    line = (
-                        f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{self.ev_icon}"
-                        f"{connector_name} / {power_kw}kW"
+            features = fr.item_features(data, self._features_cache())
+            category_id = features.category_id
+
+            html_parts.append(f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{features.category_name}</div>")
+
+            if category_id and features.is_open is not None:
+                status = "&#x1F7E2; Open" if features.is_open else "&#x1F534; Closed"
+                details_html = (
+                    "<details style='margin: 4px 0; display: block;'>"
+                    "<summary style='"
+                    "display: list-item; "
+                    "margin: 0;  padding: 0; line-height: 1.2;"
+                    "font-weight: normal; "
+                    "font-size: 10px; "
+                    "line-height: 1.2; "
+                    "color: inherit; "
+                    "font-family: inherit;"
+                    "'>"
+                    f"{status}</summary>"
+                    + "".join(
+                        f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{line}</div>"
+                        for line in features.opening_text
                     )
+                    + "</details>"
+                )
 
-                    if number_of_available is not None:
-                        line = f"{line} [{number_of_available}/{number_of_connectors}]</div>"
-                        html_parts.append(line)
-                    else:
-                        line = f"{line} [{number_of_connectors}]</div>"
-                        html_parts.append(line)
+                html_parts.append(details_html)
 
-            if category_id in self.fuel_categories and "extended" in data:
-                for fuel_type_element in data["extended"].get("fuelStation", {}).get("fuelTypes", []):
-                    fuel_type = fuel_type_element.get("type")
-                    price_txt_raw = self._fuel_price_text(fuel_type_element.get("price"))
-                    price_txt = f" - {price_txt_raw}" if price_txt_raw else ""
+            for line in features.ev_lines:
+                html_parts.append(f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{self.ev_icon}{line}</div>")
 
-                    html_parts.append(
-                        f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{self.fuel_icon}{fuel_type}{price_txt}</div>"
-                    )
+            for line in features.fuel_lines:
+                html_parts.append(f"<div style='margin: 0; padding: 0; line-height: 1.2;'>{self.fuel_icon}{line}</div>")
 
             contacts = data.get("contacts", [])
             for contact_type in ("phone", "www"):
@@ -226,11 +315,7 @@ class DetailsMixin:
                         f"""<div style='margin: 0; padding: 0; line-height: 1;'>{editorials[primary_reference]}</div>"""
                     )
 
-        html = "<div style='font-family: sans-serif; font-size: 14px;'>" + "\n".join(html_parts) + "</div>"
-        self._html_cache[cache_key] = html
-        if len(self._html_cache) > self._html_cache_max_entries:
-            self._html_cache.pop(next(iter(self._html_cache)))
-        return html
+        return "<div style='font-family: sans-serif; font-size: 14px;'>" + "\n".join(html_parts) + "</div>"
 
     @staticmethod
     def __get_labeled_contact_item(contacts, key, primary_category_id) -> str | None:
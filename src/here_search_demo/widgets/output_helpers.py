@@ -9,11 +9,22 @@
 
 """Pure functions for rendering a single HERE response item or GeoJSON feature.
 
-All functions in this module are stateless and dependency-free with respect to
-widget infrastructure — they operate only on plain dicts and primitive values.
+All functions in this module are dependency-free with respect to widget
+infrastructure — they operate only on plain dicts and primitive values.
+
+The attributes the renderers need from an item (primary category, opening
+status, marker colour, EV/fuel lines, TripAdvisor rating) are derived in a
+single pass by :func:`derive_item_features`.  The renderers take an optional
+cache of those features by item id (the
+:attr:`~here_search_demo.widgets.state.SearchState.features_by_id` of the
+displayed response), so that ``style_callback``, the map labels and the
+details HTML do not each walk the item again.  The cache lives outside the
+items, so it is neither sent with the GeoJSON features nor shown in the JSON
+pane, and it still applies to the copies ipyleaflet makes of the features.
 """
 
 import math
+from dataclasses import dataclass
 
 from here_search_demo.entity.place import ev_category_ids, gas_category_ids
 
@@ -40,6 +51,138 @@ def fuel_price_text(price_element) -> str | None:
     return None
 
 
+@dataclass(frozen=True, slots=True)
+class ItemFeatures:
+    """Rendering attributes of a HERE response item, derived once per item.
+
+    :ivar category_id: id of the primary category
+    :ivar category_name: name of the primary category
+    :ivar is_open: opening status for the primary category (or the
+        category-less opening hours), ``None`` when unknown
+    :ivar opening_text: opening hours text lines matching ``is_open``
+    :ivar color: marker fill colour, see :func:`item_color`
+    :ivar ev_lines: one ``"<connector> / <power>kW [<available>/<total>]"`` line per EV connector group
+    :ivar fuel_lines: one ``"<fuel type> - <price>"`` line per fuel type
+    :ivar diesel_text: formatted diesel price, for fuel stations
+    :ivar ta_rating: TripAdvisor rating rounded to the half star, ``None``
+        without TripAdvisor rating
+    """
+
+    category_id: str | None
+    category_name: str
+    is_open: bool | None
+    opening_text: tuple[str, ...]
+    color: str
+    ev_lines: tuple[str, ...]
+    fuel_lines: tuple[str, ...]
+    diesel_text: str | None
+    ta_rating: float | None
+
+
+def item_features(item: dict, cache: dict[str, ItemFeatures] | None = None) -> ItemFeatures:
+    """Return the :class:`ItemFeatures` of *item*, from *cache* when they were derived already.
+
+    :param item: HERE response item dict
+    :param cache: Derived features by item id, filled on first use; items
+        without id are derived on every call
+    """
+    item_id = item.get("id")
+    if cache is None or item_id is None:
+        return derive_item_features(item)
+    features = cache.get(item_id)
+    if features is None:
+        features = cache[item_id] = derive_item_features(item)
+    return features
+
+
+def derive_item_features(item: dict) -> ItemFeatures:
+    """Walk the categories, opening hours, EV/fuel and TripAdvisor data of *item* once.
+
+    :param item: HERE response item dict
+    """
+    primary_category = next((c for c in item.get("categories", []) if c.get("primary")), None)
+    category_id = primary_category.get("id") if primary_category else None
+    category_name = primary_category.get("name", "") if primary_category else ""
+
+    is_open = None
+    opening_text: tuple[str, ...] = ()
+    opening_hours = item.get("openingHours", [])
+    for oh in opening_hours:
+        if any(cat.get("id") == category_id for cat in oh.get("categories", [])):
+            is_open, opening_text = oh.get("isOpen"), tuple(oh.get("text", []))
+            break
+    else:
+        # No opening hours for the primary category, take the first one without category restriction
+        for oh in opening_hours:
+            if not oh.get("categories"):
+                is_open, opening_text = oh.get("isOpen"), tuple(oh.get("text", []))
+                break
+
+    extended = item.get("extended")
+    status = is_open
+    ev_lines: tuple[str, ...] = ()
+    fuel_lines: tuple[str, ...] = ()
+    diesel_text = None
+    if category_id in _ev_categories and extended is not None:
+        connectors = extended.get("evStation", {}).get("connectors", [])
+        ev_lines = tuple(_ev_connector_line(group) for group in connectors)
+        if status is True:
+            availability = [
+                available
+                for group in connectors
+                if (available := group.get("chargingPoint", {}).get("numberOfAvailable")) is not None
+            ]
+            status = any(availability) if availability else None
+    if category_id in _fuel_categories:
+        diesel_text = diesel_price_text(item)
+        if extended is not None:
+            fuel_lines = tuple(
+                f"{element.get('type')}{f' - {price}' if (price := fuel_price_text(element.get('price'))) else ''}"
+                for element in extended.get("fuelStation", {}).get("fuelTypes", [])
+            )
+
+    return ItemFeatures(
+        category_id=category_id,
+        category_name=category_name,
+        is_open=is_open,
+        opening_text=opening_text,
+        color={None: "blue", True: "green", False: "red"}.get(status, "blue"),
+        ev_lines=ev_lines,
+        fuel_lines=fuel_lines,
+        diesel_text=diesel_text,
+        ta_rating=_ta_rating(item),
+    )
+
+
+def _ev_connector_line(group: dict) -> str:
+    connector_name = group.get("connectorType", {}).get("name", "")
+    if connector_name.endswith(")") and "(" in connector_name:
+        connector_name = connector_name[: connector_name.rindex("(")].strip()
+    power = group.get("maxPowerLevel")
+    line = f"{connector_name} / {int(power)}kW" if power is not None else connector_name
+    number_of_available = group.get("chargingPoint", {}).get("numberOfAvailable")
+    number_of_connectors = group.get("chargingPoint", {}).get("numberOfConnectors")
+    if number_of_available is not None:
+        return f"{line} [{number_of_available}/{number_of_connectors}]"
+    return f"{line} [{number_of_connectors}]"
+
+
+def _ta_rating(item: dict) -> float | None:
+    media = item.get("media")
+    if not media:
+        return None
+    ratings_items = media.get("ratings", {}).get("items", [])
+    if not ratings_items or not ratings_items[0]:
+        return None
+    if not any(ref.get("supplier", {}).get("id") == "tripadvisor" for ref in item.get("references", [])):
+        return None
+    try:
+        rating = float(ratings_items[0].get("average", 0.0))
+    except (TypeError, ValueError):
+        return None
+    return round(rating * 2) / 2
+
+
 def diesel_price_text(item: dict) -> str | None:
     """Return a formatted diesel price string for *item*, or *None* if absent.
 
@@ -55,88 +198,67 @@ def diesel_price_text(item: dict) -> str | None:
     return None
 
 
-def gas_station_label_parts(item: dict) -> tuple[str, str | None] | None:
+def gas_station_label_parts(item: dict, cache: dict[str, ItemFeatures] | None = None) -> tuple[str, str | None] | None:
     """Return ``(title, diesel_price_text | None)`` for a fuel-station item.
 
     :param item: HERE response item dict
+    :param cache: Derived features by item id, see :func:`item_features`
     :return: ``(title, diesel_text)`` tuple or *None* when *item* is not a fuel station
     """
-    primary_category = next((c for c in item.get("categories", []) if c.get("primary")), None)
-    category_id = primary_category.get("id") if primary_category else None
-    if category_id not in _fuel_categories:
+    features = item_features(item, cache)
+    if features.category_id not in _fuel_categories:
         return None
     title = item.get("title")
     if not title:
         return None
-    diesel_price = diesel_price_text(item)
-    return title, f"diesel: {diesel_price}" if diesel_price else None
+    return title, f"diesel: {features.diesel_text}" if features.diesel_text else None
 
 
-def ta_label_html(item: dict) -> str | None:
+def ta_label_html(item: dict, cache: dict[str, ItemFeatures] | None = None) -> str | None:
     """Return a TripAdvisor rating ``<img>`` HTML snippet for the map label.
 
     :param item: HERE response item dict
+    :param cache: Derived features by item id, see :func:`item_features`
     :return: HTML string or *None* when no TA rating data is present
     """
-    media = item.get("media")
-    if not media:
-        return None
-    ratings_items = media.get("ratings", {}).get("items", [])
-    if not ratings_items or not ratings_items[0]:
-        return None
-    ta_refs = [ref for ref in item.get("references", []) if ref.get("supplier", {}).get("id") == "tripadvisor"]
-    if not ta_refs:
+    rating_rounded = item_features(item, cache).ta_rating
+    if rating_rounded is None:
         return None
-    try:
-        rating = float(ratings_items[0].get("average", 0.0))
-    except (TypeError, ValueError):
-        return None
-    rating_rounded = round(rating * 2) / 2
     return f"<img src='https://static.tacdn.com/img2/ratings/traveler/ss{rating_rounded}.svg' style='height: 10px;' />"
 
 
-def item_color(feature: dict) -> str:
+def item_color(feature: dict, cache: dict[str, ItemFeatures] | None = None) -> str:
     """Return a fill-colour string (``"blue"``, ``"green"``, or ``"red"``) for *feature*.
 
     Colour encodes opening status; EV-station availability refines the ``"green"``
     case when charger availability data is present.
 
     :param feature: GeoJSON Feature whose ``"properties"`` hold a HERE item dict
+    :param cache: Derived features by item id, see :func:`item_features`
     :return: colour name
     """
-    item = feature["properties"]
-    primary_category = next((c for c in item.get("categories", []) if c.get("primary")), None)
-    category_id = primary_category.get("id") if primary_category else None
-    is_open = None
-    if "openingHours" in item:
-        for oh in item["openingHours"]:
-            if any(cat.get("id") == category_id for cat in oh.get("categories", [])):
-                is_open = oh.get("isOpen")
-                break
-        else:
-            for oh in item["openingHours"]:
-                if "categories" not in oh or not oh["categories"]:
-                    is_open = oh.get("isOpen")
-                    break
-
-    if is_open is True and category_id in _ev_categories and "extended" in item:
-        availability = [
-            available
-            for group in item.get("extended", {}).get("evStation", {}).get("connectors", [])
-            if (available := group.get("chargingPoint", {}).get("numberOfAvailable")) is not None
-        ]
-        is_open = any(availability) if availability else None
-
-    return {None: "blue", True: "green", False: "red"}.get(is_open, "blue")
+    return item_features(feature["properties"], cache).color
 
 
-def style_callback(feature: dict) -> dict:
+def style_callback(feature: dict, cache: dict[str, ItemFeatures] | None = None) -> dict:
     """Return an ipyleaflet style dict for *feature*.
 
+    Cluster features (see :class:`~here_search_demo.widgets.clustering.ClusterIndex`)
+    get a neutral colour and a radius growing with their point count.
+
     :param feature: GeoJSON Feature
+    :param cache: Derived features by item id, see :func:`item_features`
     :return: ``{"fillColor": <colour>}``
     """
-    return {"fillColor": item_color(feature)}
+    properties = feature["properties"]
+    if properties.get("cluster"):
+        return {"fillColor": "purple", "radius": cluster_radius(properties.get("point_count", 2))}
+    return {"fillColor": item_color(feature, cache)}
+
+
+def cluster_radius(point_count: int) -> float:
+    """Return the circle radius, in pixels, of a cluster of *point_count* results."""
+    return min(24.0, 7 + 3 * math.log2(max(1, point_count)))
 
 
 def label_pixel_bbox(
@@ -8,6 +8,7 @@
 ###############################################################################
 
 import asyncio
+from collections.abc import Mapping
 
 from IPython.display import HTML, Code as ICode, JSON as IJSON, display as Idisplay
 from ipywidgets import Output, VBox, Widget
@@ -16,9 +17,18 @@ import orjson
 from here_search_demo.http import IS_BROWSER_RUNTIME
 from here_search_demo.entity.intent import SearchIntent
 from here_search_demo.entity.response import Response
+from here_search_demo.offload import offload
+from here_search_demo.widgets.json_tree import JsonTree
 from here_search_demo.widgets.state import SearchState, _get_vicinity
 
 
+def _json_default(obj):
+    """Serialize the read-only mappings of response payloads."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 class SearchResultList(VBox):
     default_layout = {
         "display": "flex",
@@ -54,9 +64,11 @@ class SearchResultList(VBox):
         return Output(layout=self.layout)
 
     def display(self, resp: Response, intent: SearchIntent | None = None) -> None:
+        self._replace(self._display(resp, intent=intent))
+
+    def _replace(self, out: Widget) -> None:
         # https://github.com/jupyterlab/jupyterlab/issues/3151#issuecomment-339476572
         old_out = self.children[0]
-        out = self._display(resp, intent=intent)
         self.children = [out]
         old_out.close()
 
@@ -71,11 +83,31 @@ class SearchResultList(VBox):
 
 
 class SearchResultJson(SearchResultList):
+    """JSON pane showing the raw payload and headers of the latest response.
+
+    With ``lazy=True`` the payload is shown as a collapsed
+    :class:`~here_search_demo.widgets.json_tree.JsonTree`, expanded on demand.
+    Displays are then throttled: responses arriving within ``throttle_s`` of
+    each other only render the latest one, and nothing is rendered while the
+    pane is hidden (``layout.display == "none"``); the latest response is
+    rendered when it is shown again.  The payload is parsed off the event
+    loop (see :mod:`here_search_demo.offload`).
+
+    :param state: Search state whose pre-computed ``_vicinity`` values are injected
+    :param lazy: Use the lazy tree view instead of ``IPython.display.JSON``/``Code``
+    """
+
     _pool_size = 20
     _style_injected = False
+    throttle_s = 0.1
 
-    def __init__(self, state: "SearchState | None" = None, **kwargs):
+    def __init__(self, state: "SearchState | None" = None, lazy: bool = False, **kwargs):
         super().__init__(**kwargs)
+        self.lazy = lazy
+        self._pending: tuple[Response, SearchIntent | None] | None = None
+        self._render_handle: asyncio.TimerHandle | None = None
+        self._render_task: asyncio.Task | None = None
+        self.layout.observe(self._on_display_change, names="display")
         self.add_class("search-json-pane")
         if not SearchResultJson._style_injected:
             Idisplay(
@@ -96,9 +128,71 @@ class SearchResultJson(SearchResultList):
         self._pool: list[Output] = [Output(layout=self.layout) for _ in range(self._pool_size)]
         self._pool_index = 0
 
-    def _display(self, resp: Response, intent: SearchIntent | None = None) -> Widget:
-        out: Output = self._next_output()
-        data = orjson.loads(resp.raw) if resp.raw is not None else resp.data
+    @property
+    def visible(self) -> bool:
+        return self.layout.display != "none"
+
+    def display(self, resp: Response, intent: SearchIntent | None = None) -> None:
+        if not self.lazy:
+            super().display(resp, intent=intent)
+            return
+        # Only the latest response is rendered.
+        self._pending = resp, intent
+        if self.visible:
+            self._schedule_render()
+
+    def clear(self):
+        self._pending = None
+        if self._render_handle is not None:
+            self._render_handle.cancel()
+            self._render_handle = None
+        if self._render_task is not None:
+            self._render_task.cancel()
+            self._render_task = None
+        super().clear()
+
+    def _schedule_render(self) -> None:
+        if self._render_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            resp, intent = self._pending
+            self._pending = None
+            super().display(resp, intent=intent)
+            return
+        self._render_handle = loop.call_later(self.throttle_s, self._render_pending)
+
+    def _render_pending(self) -> None:
+        self._render_handle = None
+        if self._pending is None or not self.visible:
+            return
+        resp, _ = self._pending
+        self._pending = None
+        self._render_task = asyncio.get_running_loop().create_task(self._render(resp))
+
+    async def _render(self, resp: Response) -> None:
+        state_data = dict(self._state.items_data_by_rank) if self._state is not None else {}
+        data = await offload(self._payload, resp, state_data, key=("json-pane", id(self)))
+        self._replace(self._tree(data, resp))
+
+    def _on_display_change(self, change) -> None:
+        if self.lazy and self._pending is not None and self.visible:
+            self._schedule_render()
+
+    def _payload(self, resp: Response, state_data: dict[int, dict]):
+        """Return a fresh copy of the response payload, with the ``_vicinity`` of its items.
+
+        The copy is parsed from the raw response body, or serialized from
+        ``resp.data`` when there is none (reranked, merged or limited
+        responses): their items are shared with the map and the search state,
+        possibly read on the event loop while this runs in a worker thread.
+
+        :param resp: Displayed response
+        :param state_data: Items data by rank of the hydrated search state
+        """
+        raw = resp.raw if resp.raw is not None else orjson.dumps(resp.data, default=_json_default)
+        data = orjson.loads(raw)
         # Inject _vicinity into the fresh JSON copy.  When a state reference is
         # available and has already been hydrated for this response (caller
         # guarantees result_buttons_w.display runs first), copy the pre-computed
@@ -106,7 +200,6 @@ class SearchResultJson(SearchResultList):
         if isinstance(data, dict):
             items_by_rank = {rank: item for rank, item in enumerate(data.get("items", [])) if isinstance(item, dict)}
             if items_by_rank:
-                state_data = self._state.items_data_by_rank if self._state is not None else {}
                 if state_data and all(rank in state_data for rank in items_by_rank):
                     for rank, item in items_by_rank.items():
                         state_item = state_data[rank]
@@ -114,6 +207,16 @@ class SearchResultJson(SearchResultList):
                             item["_vicinity"] = state_item["_vicinity"]
                 else:
                     _get_vicinity(items_by_rank)
+        return data
+
+    def _tree(self, data, resp: Response) -> JsonTree:
+        return JsonTree({"data": data, "headers": resp.x_headers}, root="response", expanded=True, layout=self.layout)
+
+    def _display(self, resp: Response, intent: SearchIntent | None = None) -> Widget:
+        data = self._payload(resp, self._state.items_data_by_rank if self._state is not None else {})
+        if self.lazy:
+            return self._tree(data, resp)
+        out: Output = self._next_output()
         if IS_BROWSER_RUNTIME:
             data_display_obj = ICode(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(), language="json")
             headers_display_object = ICode(
@@ -21,11 +21,14 @@ classes.  It assumes the host provides:
 
 from __future__ import annotations
 
+from bisect import bisect_right
+from dataclasses import dataclass
 from html import escape
 
 from ipyleaflet import DivIcon, Marker
 
 from here_search_demo.widgets import output_helpers as fr
+from here_search_demo.widgets.label_collision import collision_min_zooms
 from here_search_demo.widgets.util import load_css
 
 LABEL_ICON_WIDTH = 250
@@ -33,26 +36,70 @@ LABEL_LINE_HEIGHT = 20
 LABEL_CSS = load_css("label.css")
 
 
+@dataclass
+class _Label:
+    """One DivIcon label of the current result set.
+
+    :ivar min_zoom: lowest zoom at which the label is displayed
+        (see :func:`~here_search_demo.widgets.label_collision.collision_min_zooms`)
+    :ivar marker: the label marker, created the first time it is displayed
+    """
+
+    lat: float
+    lng: float
+    html: str
+    icon_height: int
+    min_zoom: int | None
+    marker: Marker | None = None
+
+    @property
+    def icon_anchor(self) -> tuple[int, int]:
+        return 0, self.icon_height // 2
+
+    @property
+    def key(self) -> tuple[float, float, str]:
+        return self.lat, self.lng, self.html
+
+
 class LabelsMixin:
     """Mixin for DivIcon text-label placement with overlap detection.
 
+    Label visibility is precomputed once per result set: each label gets the
+    lowest zoom at which it does not overlap a higher-priority label.  Zoom
+    changes then only toggle the ``visible`` trait of the markers whose
+    threshold was crossed.
+
+    Label markers stay on the map across result sets: a label identical to one
+    of the previous result set keeps its marker untouched, and markers no
+    longer needed are hidden and pooled for the next labels.
+
     Call :meth:`_init_labels` early in the host class ``__init__`` **after**
     ``super().__init__()`` so that ``self.observe`` is available.
     """
 
+    label_min_zoom = 0
+    label_max_zoom = 18
+
     def _init_labels(self) -> None:
         """Initialise label state and wire the zoom-change observer.
 
         Must be called after the Map widget has been initialised so that
         ``self.observe`` is available.
         """
+        # All label markers on the map, in use or pooled.
         self.fuel_text_markers: list[Marker] = []
-        self._label_render_cache: dict[tuple, tuple[tuple[float, float, float, float], str, int]] = {}
+        self._label_marker_pool: list[Marker] = []
+        self._label_icons: dict[tuple[str, int], DivIcon] = {}
+        self._label_render_cache: dict[tuple, tuple[str, int]] = {}
         self._last_geojson_data: dict | None = None
+        # Labels with a collision zoom, sorted by min_zoom, and the zoom they were last shown for.
+        self._labels: list[_Label] = []
+        self._labels_min_zooms: list[int] = []
+        self._labels_zoom: int | None = None
 
         def _on_zoom_change(change):
             if change.get("name") == "zoom" and self._last_geojson_data is not None:
-                self._redraw_labels(self._last_geojson_data)
+                self._apply_labels_zoom()
 
         self.observe(_on_zoom_change, names=["zoom"])
 
@@ -61,33 +108,102 @@ class LabelsMixin:
         for marker in list(self.fuel_text_markers):
             self.remove(marker)
         self.fuel_text_markers.clear()
+        self._label_marker_pool.clear()
+        self._labels = []
+        self._labels_min_zooms = []
+        self._labels_zoom = None
+
+    def _labels_zoom_level(self) -> int:
+        zoom = int(self.zoom) if self.zoom is not None else 13
+        return max(self.label_min_zoom, min(self.label_max_zoom, zoom))
 
     def _redraw_labels(self, geojson_data: dict) -> None:
-        """Remove and re-place all DivIcon text markers with overlap detection.
+        """Compute the labels of *geojson_data* and show those visible at the current zoom.
 
-        Called from :meth:`display` after new results arrive and from the zoom
-        observer so labels stay correctly sized and positioned.
+        Called from :meth:`display` after new results arrive.  The collision
+        zoom of every label is computed here, once.  Markers of unchanged labels
+        are kept, the others are pooled.
 
         :param geojson_data: GeoJSON FeatureCollection to label
         """
-        self._clear_labels()
-        features = geojson_data.get("features", [])
-        placed_label_bboxes: list[tuple[float, float, float, float]] = []
-        for feature in features:
-            self._redraw_label(feature, placed_label_bboxes)
-
-    def _redraw_label(
-        self,
-        feature: dict,
-        placed_label_bboxes: list[tuple[float, float, float, float]],
-    ) -> None:
-        """Compute and conditionally place a single DivIcon label.
-
-        The label is skipped when its bounding box overlaps any already-placed
-        label at the current zoom level.
+        previous_markers = {label.key: label.marker for label in self._labels if label.marker is not None}
+        labels = [self._build_label(feature) for feature in geojson_data.get("features", [])]
+
+        def bbox_at(index: int, zoom: int) -> tuple[float, float, float, float]:
+            label = labels[index]
+            return fr.label_pixel_bbox(
+                label.lat, label.lng, zoom, LABEL_ICON_WIDTH, label.icon_height, *label.icon_anchor
+            )
+
+        min_zooms = collision_min_zooms(len(labels), bbox_at, self.label_min_zoom, self.label_max_zoom)
+        for label, min_zoom in zip(labels, min_zooms):
+            label.min_zoom = min_zoom
+        self._labels = sorted((label for label in labels if label.min_zoom is not None), key=lambda lb: lb.min_zoom)
+        self._labels_min_zooms = [label.min_zoom for label in self._labels]
+        for label in self._labels:
+            label.marker = previous_markers.pop(label.key, None)
+        for marker in previous_markers.values():
+            marker.visible = False
+            self._label_marker_pool.append(marker)
+        self._labels_zoom = None
+        self._apply_labels_zoom()
+
+    def _apply_labels_zoom(self) -> None:
+        """Show or hide the labels whose collision zoom lies between the previous and current zoom."""
+        zoom = self._labels_zoom_level()
+        previous = self._labels_zoom
+        if previous == zoom:
+            return
+        self._labels_zoom = zoom
+        if previous is None:
+            visible_count = bisect_right(self._labels_min_zooms, zoom)
+            for label in self._labels[:visible_count]:
+                self._show_label(label)
+            for label in self._labels[visible_count:]:
+                if label.marker is not None:
+                    label.marker.visible = False
+        elif zoom > previous:
+            lo, hi = bisect_right(self._labels_min_zooms, previous), bisect_right(self._labels_min_zooms, zoom)
+            for label in self._labels[lo:hi]:
+                self._show_label(label)
+        else:
+            lo, hi = bisect_right(self._labels_min_zooms, zoom), bisect_right(self._labels_min_zooms, previous)
+            for label in self._labels[lo:hi]:
+                label.marker.visible = False
+
+    def _show_label(self, label: _Label) -> None:
+        if label.marker is None:
+            icon = self._label_icon(label)
+            if self._label_marker_pool:
+                label.marker = self._label_marker_pool.pop()
+                label.marker.location = (label.lat, label.lng)
+                label.marker.icon = icon
+            else:
+                label.marker = Marker(location=(label.lat, label.lng), draggable=False, icon=icon)
+                self.fuel_text_markers.append(label.marker)
+                self.add(label.marker)
+        label.marker.visible = True
+
+    def _label_icon(self, label: _Label) -> DivIcon:
+        """Return a shared DivIcon for the label content, so identical labels reuse one widget."""
+        key = (label.html, label.icon_height)
+        icon = self._label_icons.get(key)
+        if icon is None:
+            if len(self._label_icons) > 512:
+                in_use = {id(marker.icon) for marker in self.fuel_text_markers}
+                self._label_icons = {k: v for k, v in self._label_icons.items() if id(v) in in_use}
+            icon = DivIcon(
+                html=label.html,
+                icon_size=[LABEL_ICON_WIDTH, label.icon_height],
+                icon_anchor=list(label.icon_anchor),
+            )
+            self._label_icons[key] = icon
+        return icon
+
+    def _build_label(self, feature: dict) -> _Label:
+        """Compute the DivIcon label of a single GeoJSON feature.
 
         :param feature: GeoJSON Feature
-        :param placed_label_bboxes: list of already-placed pixel bboxes, mutated in place
         """
         item = feature.get("properties", {})
         lng, lat = feature["geometry"]["coordinates"]
@@ -105,30 +221,24 @@ class LabelsMixin:
             else ""
         )
         extra_line = ""
-        label_parts = fr.gas_station_label_parts(item)
+        label_parts = fr.gas_station_label_parts(item, self.state.features_by_id)
         if label_parts:
             _, diesel_text = label_parts
             extra_line = (
                 f"<br><span class='here-search-demo-label-line'>{escape(diesel_text)}</span>" if diesel_text else ""
             )
         if not extra_line:
-            ta_html = fr.ta_label_html(item)
+            ta_html = fr.ta_label_html(item, self.state.features_by_id)
             if ta_html:
                 extra_line = f"<br><span class='here-search-demo-label-line'>{ta_html}</span>"
         extra_lines = vicinity_line + extra_line
-        icon_anchor_x = 0
-        zoom = int(self.zoom) if self.zoom is not None else 13
-        cache_key = (zoom, rank, lat, lng, label_first, extra_lines)
+        cache_key = (label_first, extra_lines)
         cached = self._label_render_cache.get(cache_key)
         if cached is not None:
-            candidate_bbox, label_html, icon_height = cached
+            label_html, icon_height = cached
         else:
             line_count = 1 + extra_lines.count("<br>")
             icon_height = line_count * LABEL_LINE_HEIGHT
-            icon_anchor_y = icon_height // 2
-            candidate_bbox = fr.label_pixel_bbox(
-                lat, lng, zoom, LABEL_ICON_WIDTH, icon_height, icon_anchor_x, icon_anchor_y
-            )
             label_html = (
                 f"<style>{LABEL_CSS}</style>"
                 "<div class='here-search-demo-label'>"
@@ -136,20 +246,7 @@ class LabelsMixin:
                 f"{extra_lines}"
                 "</div>"
             )
-            self._label_render_cache[cache_key] = (candidate_bbox, label_html, icon_height)
+            self._label_render_cache[cache_key] = (label_html, icon_height)
             if len(self._label_render_cache) > 2048:
                 self._label_render_cache.clear()
-        icon_anchor_y = icon_height // 2
-        if not any(fr.pixel_bboxes_overlap(candidate_bbox, placed) for placed in placed_label_bboxes):
-            placed_label_bboxes.append(candidate_bbox)
-            marker = Marker(
-                location=(lat, lng),
-                draggable=False,
-                icon=DivIcon(
-                    html=label_html,
-                    icon_size=[LABEL_ICON_WIDTH, icon_height],
-                    icon_anchor=[icon_anchor_x, icon_anchor_y],
-                ),
-            )
-            self.fuel_text_markers.append(marker)
-            self.add(marker)
+        return _Label(lat=lat, lng=lng, html=label_html, icon_height=icon_height, min_zoom=None)
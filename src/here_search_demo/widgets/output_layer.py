@@ -0,0 +1,145 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Keyed map layer of search result features, updated by diff.
+
+Replacing a single ``GeoJSON`` layer on every response ships the whole
+FeatureCollection over the widget comm, even when typing one more character
+returns mostly the same places.  :class:`ResultLayer` instead holds one small
+``GeoJSON`` sub-layer per result, keyed by the item ``id``: on update, only
+added features take a layer, only features whose content changed resend their
+data, and removed features are dropped from the group.  The annotations that
+only follow the response order (``_rank``, ``_detour``) are left out of that
+comparison, so a reorder resends nothing: click handlers are given the current
+feature of the clicked layer rather than the one the frontend holds.
+The layers of removed features are reused for the added ones, and closed when
+no added feature takes them, so that their widget models are not leaked.
+
+The baseline layer was created with ``show_bubble=True``, which is not a
+``GeoJSON`` trait (traitlets only warned about the unknown argument): result
+popups are opened by the map click handler instead, so it is not passed.
+"""
+
+from collections.abc import Callable, Hashable
+from functools import partial
+
+import orjson
+from ipyleaflet import GeoJSON, LayerGroup
+
+#: Item annotations that follow the response order, not the result itself.
+_ORDER_ANNOTATIONS = frozenset({"_rank", "_detour"})
+
+
+class ResultLayer(LayerGroup):
+    """``LayerGroup`` of per-result ``GeoJSON`` layers.
+
+    :param point_style: ``GeoJSON.point_style`` of every result layer
+    :param style_callback: ``GeoJSON.style_callback`` of every result layer
+    :param on_click: ``GeoJSON.on_click`` handler of every result layer
+    """
+
+    def __init__(
+        self,
+        point_style: dict,
+        style_callback: Callable[[dict], dict],
+        on_click: Callable | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._point_style = point_style
+        self._style_callback = style_callback
+        self._on_click = on_click
+        self._entries: dict[Hashable, tuple[bytes, GeoJSON, dict]] = {}
+        self.features: list[dict] = []
+
+    @property
+    def data(self) -> dict:
+        """FeatureCollection of the displayed results, in response order."""
+        return {"type": "FeatureCollection", "features": self.features}
+
+    @staticmethod
+    def _feature_key(feature: dict) -> Hashable:
+        properties = feature.get("properties", {})
+        item_id = properties.get("id")
+        if item_id is not None:
+            return item_id
+        return properties.get("title"), tuple(feature.get("geometry", {}).get("coordinates", ()))
+
+    @staticmethod
+    def _fingerprint(feature: dict) -> bytes:
+        # Item dicts are annotated in place, so compare serialized snapshots
+        # rather than the dicts themselves.
+        properties = {k: v for k, v in feature.get("properties", {}).items() if k not in _ORDER_ANNOTATIONS}
+        return orjson.dumps({**feature, "properties": properties}, option=orjson.OPT_SORT_KEYS)
+
+    def _on_layer_click(self, layer: GeoJSON, event=None, feature=None, **kwargs) -> None:
+        for _, entry_layer, current in self._entries.values():
+            if entry_layer is layer:
+                feature = current
+                break
+        self._on_click(event=event, feature=feature, **kwargs)
+
+    def update(self, geojson_data: dict) -> tuple[int, int, int]:
+        """Display the features of *geojson_data*, reusing the layers of unchanged results.
+
+        :param geojson_data: GeoJSON FeatureCollection
+        :return: numbers of added, removed and changed result layers
+        """
+        features = geojson_data.get("features", [])
+        entries: dict[Hashable, tuple[bytes, GeoJSON | None, dict]] = {}
+        occurrences: dict[Hashable, int] = {}
+        new_features: list[tuple[Hashable, dict]] = []
+        changed = 0
+        for feature in features:
+            key = self._feature_key(feature)
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            if occurrence:
+                # Same id twice in a response: keep both, keyed by occurrence.
+                key = (key, occurrence)
+            fingerprint = self._fingerprint(feature)
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                new_features.append((key, feature))
+                entries[key] = (fingerprint, None, feature)
+                continue
+            previous_fingerprint, layer, _ = entry
+            if previous_fingerprint != fingerprint:
+                layer.data = feature
+                changed += 1
+            entries[key] = (fingerprint, layer, feature)
+        # The layers of the removed results are reused for the added ones.
+        spare = [layer for _, layer, _ in self._entries.values()]
+        removed = len(spare)
+        for key, feature in new_features:
+            if spare:
+                layer = spare.pop()
+                layer.data = feature
+            else:
+                layer = GeoJSON(data=feature, point_style=self._point_style, style_callback=self._style_callback)
+                if self._on_click is not None:
+                    layer.on_click(partial(self._on_layer_click, layer))
+            entries[key] = (entries[key][0], layer, feature)
+        self._entries = entries
+        self.features = list(features)
+        layers = tuple(layer for _, layer, _ in entries.values())
+        if layers != self.layers:
+            self.layers = layers
+        for layer in spare:
+            layer.close()
+        return len(new_features), removed, changed
+
+    def clear(self) -> None:
+        """Remove all result layers."""
+        self.update({"features": []})
+
+    def close(self) -> None:
+        """Close the result layers, then the group."""
+        self.clear()
+        super().close()
@@ -9,17 +9,20 @@
 
 import asyncio
 import time
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
-from ipyleaflet import GeoJSON, Popup
+from ipyleaflet import Popup
 from ipywidgets import HTML
 
 from ..entity.intent import ActionIntent, SearchIntent
 from ..entity.response import Response
+from ..tracing import trace_stage
 from .state import MapState, SearchState
 from .input_map import PositionMap
 from .output_details import DetailsMixin
 from .output_labels import LabelsMixin
+from .output_layer import ResultLayer
+from .clustering import ClusterIndex
 from . import output_helpers as fr
 
 
@@ -28,6 +31,12 @@ class ResponseMap(PositionMap, DetailsMixin, LabelsMixin):
 
     The map displays results as GeoJSON markers, optionally adds extra labels
     (fuel prices / TripAdvisor), and can fit bounds to returned items.
+    Result markers live in a keyed :class:`~here_search_demo.widgets.output_layer.ResultLayer`
+    so that successive responses only send the features that changed.
+    Responses with at least ``cluster_min_results`` items are clustered by a
+    :class:`~here_search_demo.widgets.clustering.ClusterIndex` built once per
+    response: only the clusters and results within (a margin around) the
+    viewport are displayed, and they are recomputed on zoom and pan.
     It is also interactive: marker clicks push ``ActionIntent`` instances to
     ``queue`` so upper layers can retrieve details or trigger detour logic.
 
@@ -35,10 +44,20 @@ class ResponseMap(PositionMap, DetailsMixin, LabelsMixin):
     :param state: Shared state containing ranked response items.
     :param search_center_handler: Callback invoked when the map center changes.
     :param tile_opacity: Base map tile opacity.
+    :param detour_polylines: Coroutine function returning the ``(to, from)``
+        excursion polylines of a selected result that were not routed with the
+        results (``None`` when they cannot be routed).
     :param kwargs: Forwarded to :class:`~here_search_demo.widgets.input_map.PositionMap`.
     """
 
     maximum_zoom_level = 18
+    # Largest backend limit of the Search API: only full-size responses cluster.
+    cluster_min_results = 100
+    cluster_max_zoom = 16
+    # Fraction of the viewport size added on each side of the clustered area.
+    cluster_view_margin = 0.5
+    # Top results whose popup HTML is rendered ahead of a click.
+    details_prerender_count = 3
     default_point_style = {
         "strokeColor": "white",
         "lineWidth": 1,
@@ -52,47 +71,68 @@ class ResponseMap(PositionMap, DetailsMixin, LabelsMixin):
         state: SearchState | None = None,
         search_center_handler: Callable[[tuple[float, float]], None] = None,
         tile_opacity: float = PositionMap.default_tile_opacity,
+        detour_polylines: Callable[[dict], Awaitable[tuple[str, str] | None]] | None = None,
         **kwargs,
     ):
         self.queue = queue
         self.state = state or SearchState()
-        self.collection = None
+        self.collection: ResultLayer | None = None
+        self._clusters: ClusterIndex | None = None
+        self._clusters_view: tuple[int, tuple[tuple[float, float], tuple[float, float]] | None] | None = None
         self.map_state = MapState()
         self._last_intent: SearchIntent | None = None
         self._fit_task: asyncio.Task | None = None
+        self._details_prerender: asyncio.Task | None = None
+        self.detour_polylines = detour_polylines
+        self._detour_task: asyncio.Task | None = None
         super().__init__(position_handler=search_center_handler, tile_opacity=tile_opacity, **kwargs)
         self._init_labels()
+        self.observe(self._on_clusters_view_change, names=["zoom", "bounds"])
 
     def clear_results(self) -> None:
         self.route.clear_detour_routes()
         if self.collection:
             self.remove(self.collection)
+            self.collection.close()
             self.collection = None
+        self._clusters = None
 
         self._clear_labels()
         self._last_geojson_data = None
         self.close_popups()
 
     def display(self, resp: Response, intent: SearchIntent | None = None, fit: bool = False):
-
-        self.clear_results()
+        self.route.clear_detour_routes()
+        self.close_popups()
 
         self._last_resp = resp
         self._last_intent = intent
         bbox = resp.bbox()
         if bbox:
-            geojson_data = resp.geojson()
-            self._last_geojson_data = geojson_data
+            with trace_stage("geojson"):
+                geojson_data = resp.geojson()
+                self._last_geojson_data = geojson_data
+                if self.collection is None:
+                    self.collection = ResultLayer(
+                        point_style=ResponseMap.default_point_style,
+                        style_callback=self._style_callback,
+                        on_click=self._on_feature_click,
+                    )
+                    self.add(self.collection)
+                features = geojson_data.get("features", [])
+                if len(features) >= self.cluster_min_results:
+                    self._clusters = ClusterIndex(features, max_zoom=self.cluster_max_zoom)
+                else:
+                    self._clusters = None
+                    self.collection.update(geojson_data)
 
-            self.collection = GeoJSON(
-                data=geojson_data,
-                show_bubble=True,
-                point_style=ResponseMap.default_point_style,
-                style_callback=fr.style_callback,
-            )
-            self.add(self.collection)
-
-            self._redraw_labels(geojson_data)
+            if self._clusters is not None:
+                self._clusters_view = None
+                self._paint_clusters()
+            else:
+                with trace_stage("labels"):
+                    self._redraw_labels(geojson_data)
+            self._schedule_details_prerender(geojson_data.get("features", []))
 
             if fit and bbox[0] != bbox[1] and bbox[2] != bbox[3]:
                 south, north, east, west = bbox
@@ -107,22 +147,94 @@ class ResponseMap(PositionMap, DetailsMixin, LabelsMixin):
                 south, north, east, west = bbox
                 if None not in (south, west):
                     self._fit_task = asyncio.create_task(self.recenter(south, west))
-
-            self.collection.on_click(self._on_feature_click)
         else:
             self._last_geojson_data = None
+            self._clusters = None
+            if self.collection is not None:
+                self.collection.clear()
+            self._redraw_labels({"features": []})
+
+    def _style_callback(self, feature: dict) -> dict:
+        return fr.style_callback(feature, self.state.features_by_id)
 
     def _on_feature_click(self, event, feature, **kwargs) -> None:
         """Handle a click on a GeoJSON feature: emit an action intent and show the popup."""
         if self.long_press_popup is not None:
             return
         item = feature["properties"]
+        if item.get("cluster"):
+            self._expand_cluster(item)
+            return
         rank = item.get("_rank")
         self._emit_action_intent(rank)
         self._show_item_popup(item, rank=rank)
         if self.route.has_route and self.route.ranking_mode.travel_time:
             self._show_detour_route(item)
 
+    def _clusters_viewport(self) -> tuple[tuple[float, float], tuple[float, float]] | None:
+        """Return the viewport bounds extended by ``cluster_view_margin``, ``None`` for the whole world."""
+        if not self._bounds_ready(self.bounds):
+            return None
+        (south, west), (north, east) = self.bounds
+        lat_margin = (north - south) * self.cluster_view_margin
+        lng_margin = (east - west) * self.cluster_view_margin
+        return (south - lat_margin, west - lng_margin), (north + lat_margin, east + lng_margin)
+
+    def _on_clusters_view_change(self, change) -> None:
+        if self._clusters is None:
+            return
+        if self._clusters_view is not None and self._bounds_ready(self.bounds):
+            zoom, painted = self._clusters_view
+            if painted is not None and zoom == self._clusters.level_zoom(self.zoom):
+                (south, west), (north, east) = self.bounds
+                (p_south, p_west), (p_north, p_east) = painted
+                if p_south <= south and north <= p_north and p_west <= west and east <= p_east:
+                    # Still within the area painted for this zoom level.
+                    return
+        self._paint_clusters()
+
+    def _paint_clusters(self) -> None:
+        """Display the clusters and results of the current response around the viewport."""
+        viewport = self._clusters_viewport()
+        zoom = self._clusters.level_zoom(self.zoom)
+        self._clusters_view = zoom, viewport
+        query = viewport
+        if viewport is not None:
+            (south, west), (north, east) = viewport
+            if east - west >= 360:
+                query = (south, -180.0), (north, 180.0)
+            else:
+                # Leaflet longitudes are not wrapped when panning across the antimeridian.
+                query = (south, (west + 180) % 360 - 180), (north, (east + 180) % 360 - 180)
+        with trace_stage("clusters"):
+            features = self._clusters.clusters(query, zoom)
+            self.collection.update({"type": "FeatureCollection", "features": features})
+        with trace_stage("labels"):
+            self._redraw_labels({"features": [f for f in features if not f["properties"].get("cluster")]})
+
+    def _expand_cluster(self, cluster: dict) -> None:
+        """Zoom in on a clicked cluster until it splits."""
+        if self._clusters is None:
+            return
+        position = cluster["position"]
+        zoom = min(self.maximum_zoom_level, self._clusters.expansion_zoom(cluster["cluster_id"]))
+        with self.hold_sync():
+            self.center = (position["lat"], position["lng"])
+            self.zoom = max(zoom, int(self.zoom or 0))
+
+    def _schedule_details_prerender(self, features: list[dict]) -> None:
+        """Render the popup HTML of the top results in the background."""
+        if self._details_prerender is not None:
+            self._details_prerender.cancel()
+            self._details_prerender = None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        items = [feature["properties"] for feature in features[: self.details_prerender_count]]
+        if items:
+            self._details_prerender = loop.create_task(self.prerender_html_async(items, "original"))
+
     def _emit_action_intent(self, rank: int | None) -> None:
         if rank is None:
             return
@@ -144,9 +256,25 @@ class ResponseMap(PositionMap, DetailsMixin, LabelsMixin):
             return
         cache_key = "via", start_lat, start_lon, via_lat, via_lon, stop_lat, stop_lon
         cached = self.route._route_cache.get(cache_key)
+        if self._detour_task is not None:
+            self._detour_task.cancel()
+            self._detour_task = None
         if isinstance(cached, tuple):
             _, _, poly_to, _, _, poly_from = cached
             self.route.draw_detour_routes(poly_from, poly_to)
+        elif self.detour_polylines is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._detour_task = loop.create_task(self._draw_fetched_detour_route(item_data))
+
+    async def _draw_fetched_detour_route(self, item_data: dict) -> None:
+        """Route and draw the excursion to a result reranked without its polylines."""
+        polylines = await self.detour_polylines(item_data)
+        if polylines is not None:
+            poly_to, poly_from = polylines
+            self.route.draw_detour_routes(poly_from, poly_to)
 
     def _show_item_popup(self, item_data: dict, rank: int | None = None) -> None:
         if self.long_press_popup is not None:
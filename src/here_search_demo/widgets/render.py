@@ -0,0 +1,121 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Render transactions: one comm message per widget per paint.
+
+Painting a response touches many traits of many widgets (button icons and
+descriptions, box children, map layers, markers, …) and ipywidgets sends each
+trait change as its own comm message.  :func:`render_transaction` holds the
+sync of the widgets a paint touches (see :meth:`ipywidgets.Widget.hold_sync`)
+so that, when the transaction exits, each of them sends all its changed traits
+in a single ``update`` message.
+
+The transaction counts the comm messages the paint actually sends: the
+coalesced updates, the updates of the widgets it does not hold, custom
+messages and the comm opens of the widgets created by the paint.  For that,
+:meth:`ipywidgets.Widget._send` and :meth:`ipywidgets.Widget.open` are wrapped
+while the outermost transaction is open, and restored when it is committed.
+
+Paints are synchronous: a transaction is only open while its block runs, and
+tasks scheduled from the block run after it was committed.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from ipywidgets import Widget
+
+
+@dataclass
+class RenderTransaction:
+    """Widgets held and comm messages counted during one paint.
+
+    :ivar messages: comm messages sent by the paint, comm opens included
+    :ivar held: widgets whose updates were coalesced
+    """
+
+    messages: int = 0
+    held: dict[int, Widget] = field(default_factory=dict)
+    on_commit: list[Callable[["RenderTransaction"], None]] = field(default_factory=list)
+    _holds: ExitStack = field(default_factory=ExitStack, repr=False)
+
+    def hold(self, widgets: Iterable[Widget]) -> None:
+        """Hold the sync of *widgets* until the transaction is committed."""
+        for widget in widgets:
+            if widget is None or id(widget) in self.held:
+                continue
+            self.held[id(widget)] = widget
+            self._holds.enter_context(widget.hold_sync())
+
+    @contextmanager
+    def _counting(self) -> Iterator[None]:
+        """Count the comm messages sent by any widget in the enclosed block."""
+        send, open_ = Widget._send, Widget.open
+
+        def counting_send(widget: Widget, msg, buffers=None):
+            if widget.comm is not None:
+                self.messages += 1
+            send(widget, msg, buffers=buffers)
+
+        def counting_open(widget: Widget):
+            opening = widget.comm is None
+            open_(widget)
+            if opening and widget.comm is not None:
+                self.messages += 1
+
+        Widget._send, Widget.open = counting_send, counting_open
+        try:
+            yield
+        finally:
+            Widget._send, Widget.open = send, open_
+
+    def _commit(self) -> None:
+        # Releasing the holds sends the coalesced updates, then stops the counting.
+        self._holds.close()
+        for callback in self.on_commit:
+            callback(self)
+
+
+_current_transaction: RenderTransaction | None = None
+
+
+@contextmanager
+def render_transaction(
+    widgets: Iterable[Widget] = (),
+    on_commit: Callable[[RenderTransaction], None] | None = None,
+) -> Iterator[RenderTransaction]:
+    """Coalesce the widget state updates of *widgets* in the enclosed block.
+
+    Nested calls join the outermost transaction, which also holds their
+    widgets.
+
+    :param widgets: The widgets the block updates
+    :param on_commit: Called with the transaction once its updates were sent
+        (by the outermost transaction, for nested calls)
+    """
+    global _current_transaction
+    transaction = _current_transaction
+    if transaction is not None:
+        transaction.hold(widgets)
+        if on_commit is not None:
+            transaction.on_commit.append(on_commit)
+        yield transaction
+        return
+    transaction = RenderTransaction()
+    if on_commit is not None:
+        transaction.on_commit.append(on_commit)
+    _current_transaction = transaction
+    try:
+        transaction._holds.enter_context(transaction._counting())
+        transaction.hold(widgets)
+        yield transaction
+    finally:
+        _current_transaction = None
+        transaction._commit()
@@ -13,7 +13,7 @@ from traitlets.utils.bunch import Bunch
 
 from ..auth import Credentials
 from ..route_engine import RouteEngine
-from .route_geometry import build_corridor, haversine_m  # noqa: F401 – available to callers
+from .route_geometry import build_corridor, haversine_m, route_coords  # noqa: F401 – available to callers
 
 if TYPE_CHECKING:
     from .input_map import PositionMap
@@ -174,6 +174,17 @@ class RouteController:
         self.engine.set_mins_from_pos(mins)
         self._apply_mins_from_pos()
 
+    def set_time_window(self, window: tuple[int, int] | None):
+        """Restrict along-route searches to ``(from_mins, to_mins)`` ahead; ``None`` to lift it."""
+        self.engine.set_time_window(window)
+
+    def set_segmented_search(self, count: int | None, by: str = "distance"):
+        """Search long routes as *count* overlapping sub-corridors (see :meth:`RouteEngine.search_segments`)."""
+        self.engine.set_segmented_search(count, by)
+
+    def search_segments(self):
+        return self.engine.search_segments()
+
     def _apply_mins_from_pos(self, draw: bool = True):
         """Update ``future_position`` from ``current_position`` + ``mins_from_pos``.
 
@@ -402,12 +413,9 @@ class RouteController:
             # Render the raw route polyline (no corridor buffer).
             self.route_pl = Polyline(locations=waypoints, color="blue", weight=3, fill=False)
             self.map_instance.add(self.route_pl)
-            lats = [p[0] for p in waypoints]
-            lons = [p[1] for p in waypoints]
-            c_south, c_north = min(lats), max(lats)
-            c_west, c_east = min(lons), max(lons)
+            c_south, c_west, c_north, c_east = route_coords(waypoints).bounds()
         else:
-            corridor = await build_corridor(waypoints, self.width)
+            corridor = await build_corridor(waypoints, self.width, key=("corridor", id(self)))
             route_geojson = mapping(cast(ShapelyPolygon, corridor))
             self.geojson_w = GeoJSON(data=route_geojson, style={"color": "blue", "fillOpacity": 0.25})
             self.map_instance.add(self.geojson_w)
@@ -9,25 +9,41 @@
 """Pure-geometry helpers for route operations.
 
 ``build_corridor`` computes a metre-accurate buffer polygon around a route
-polyline using a local tangent-plane projection implemented with the Python
-standard library, avoiding heavy ``numpy``/``pyproj`` runtime dependencies.
+polyline using a local tangent-plane projection, avoiding a ``pyproj``
+runtime dependency.  It runs off the event loop (see
+:mod:`here_search_demo.offload`).
 ``simplify_polyline`` reduces a polyline to a maximum number of points using a
 GEOS Douglas–Peucker simplification.
+
+Route coordinates are packed once per route into a :class:`RouteCoords`
+(see :func:`route_coords`): a contiguous NumPy ``(n, 2)`` array together with
+the cumulative along-route distances, shared by the projection, bounding box,
+nearest-waypoint and distance-ahead computations.  Without NumPy the same
+functions fall back to ``array('d')`` containers and Python loops.
+
+Shapely and NumPy are imported inside the functions that need them so that
+headless callers (e.g. :mod:`here_search_demo.route_engine`) can import this
+module without paying the GEOS/numpy startup cost.
 """
 
 import math
 from array import array
-from typing import Any, Sequence
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from itertools import accumulate
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+from here_search_demo.offload import offload
 
-from shapely import LineString
-from shapely import get_coordinates, get_num_coordinates
-from shapely import simplify as _shapely_simplify
-from shapely.geometry import mapping  # noqa: F401 – re-exported for callers
-from shapely.ops import transform
+if TYPE_CHECKING:
+    from shapely import LineString
 
 _Point = tuple[float | Any, float | Any] | tuple[float | Any, float | Any, float | Any]
 _LatLon = tuple[float, float]
 _EARTH_RADIUS_M = 6_371_000.0
+_METRES_PER_DEGREE = _EARTH_RADIUS_M * math.pi / 180
 
 
 def _build_flat_coord_array(points: Sequence[_LatLon]) -> array:
@@ -71,48 +87,199 @@ def _local_metric_projectors(ref_lat: float, ref_lon: float):
 
     The forward projector maps ``(lon, lat)`` to local metres around a fixed
     reference point. The inverse projector maps local metres back to WGS84-like
-    lon/lat coordinates.
+    lon/lat coordinates.  Both accept floats as well as NumPy arrays.
     """
     cos_lat0 = math.cos(math.radians(ref_lat))
     cos_lat0 = max(cos_lat0, 1e-12)  # protect inverse projection near poles
+    y_scale = _EARTH_RADIUS_M * math.pi / 180
+    x_scale = y_scale * cos_lat0
 
-    def to_local(lon: float, lat: float) -> tuple[float, float]:
-        x = _EARTH_RADIUS_M * math.radians(lon - ref_lon) * cos_lat0
-        y = _EARTH_RADIUS_M * math.radians(lat - ref_lat)
-        return x, y
+    def to_local(lon, lat):
+        return (lon - ref_lon) * x_scale, (lat - ref_lat) * y_scale
 
-    def to_wgs84(x: float, y: float) -> tuple[float, float]:
-        lon = ref_lon + math.degrees(x / (_EARTH_RADIUS_M * cos_lat0))
-        lat = ref_lat + math.degrees(y / _EARTH_RADIUS_M)
-        return lon, lat
+    def to_wgs84(x, y):
+        return ref_lon + x / x_scale, ref_lat + y / y_scale
 
     return to_local, to_wgs84
 
 
+def _numpy():
+    """Return the ``numpy`` module, or ``None`` to use the pure-Python code paths."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - numpy ships with shapely
+        return None
+    return numpy
+
+
+class RouteCoords:
+    """Coordinates of a route packed once for the geometry functions of this module.
+
+    :param points: Route points in ``(lat, lon)`` or ``(lat, lon, z)`` order
+    :ivar array: Contiguous ``(n, 2)`` float64 NumPy array of ``(lat, lon)``,
+        ``None`` without NumPy
+    :ivar flat: ``array('d')`` of interleaved ``lat, lon`` values, used without NumPy
+    """
+
+    __slots__ = ("_cumulative_m", "array", "flat", "points", "simplified")
+
+    def __init__(self, points: Sequence[_Point]):
+        self.points = points
+        np = _numpy()
+        if np is not None:
+            values = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+            self.array = np.ascontiguousarray(values[:, :2]) if len(points) else np.empty((0, 2))
+            self.flat = None
+        else:
+            self.array = None
+            self.flat = _build_flat_coord_array([(p[0], p[1]) for p in points])
+        self._cumulative_m = None
+        #: :func:`simplify_polyline_within` results, by tolerance in metres
+        self.simplified: dict[float, list[_LatLon]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def point(self, index: int) -> _LatLon:
+        if self.array is not None:
+            lat, lon = self.array[index]
+        else:
+            index = index % len(self.points)
+            lat, lon = self.flat[2 * index], self.flat[2 * index + 1]
+        return float(lat), float(lon)
+
+    @property
+    def cumulative_m(self) -> Sequence[float]:
+        """Haversine distance, in metres, from the first point to each point."""
+        if self._cumulative_m is None:
+            if self.array is not None:
+                np = _numpy()
+                lat = np.radians(self.array[:, 0])
+                lon = np.radians(self.array[:, 1])
+                a = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2
+                seg = 2 * _EARTH_RADIUS_M * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+                self._cumulative_m = np.concatenate(([0.0], np.cumsum(seg)))
+            else:
+                flat = self.flat
+                cum = array("d", [0.0] * len(self.points))
+                for i in range(1, len(self.points)):
+                    cum[i] = cum[i - 1] + haversine_m(flat[2 * i - 2], flat[2 * i - 1], flat[2 * i], flat[2 * i + 1])
+                self._cumulative_m = cum
+        return self._cumulative_m
+
+    def nearest_index(self, lat: float, lon: float) -> int:
+        """Return the index of the point closest to ``(lat, lon)`` by squared degree distance."""
+        if not len(self.points):
+            return 0
+        if self.array is not None:
+            np = _numpy()
+            d2 = (self.array[:, 0] - lat) ** 2 + (self.array[:, 1] - lon) ** 2
+            return int(np.argmin(d2))
+        flat = self.flat
+        min_dist2 = float("inf")
+        closest_idx = 0
+        for i in range(len(self.points)):
+            d2 = (lat - flat[2 * i]) ** 2 + (lon - flat[2 * i + 1]) ** 2
+            if d2 < min_dist2:
+                min_dist2 = d2
+                closest_idx = i
+        return closest_idx
+
+    def bbox_scale(self) -> float:
+        """Return max(width, height) of the coordinate bounding box."""
+        if self.array is not None:
+            if len(self.array) < 2:
+                return 0.0
+            return float(_numpy().ptp(self.array, axis=0).max())
+        return _bbox_scale_from_flat(self.flat)
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Return ``(min_lat, min_lon, max_lat, max_lon)``."""
+        if self.array is not None:
+            (min_lat, min_lon), (max_lat, max_lon) = self.array.min(axis=0), self.array.max(axis=0)
+            return float(min_lat), float(min_lon), float(max_lat), float(max_lon)
+        lats, lons = self.flat[0::2], self.flat[1::2]
+        return min(lats), min(lons), max(lats), max(lons)
+
+
+_route_coords_cache: OrderedDict[int, tuple[Sequence, RouteCoords]] = OrderedDict()
+_route_coords_lock = Lock()  # corridors are built in worker threads
+_ROUTE_COORDS_CACHE_SIZE = 8
+
+
+def route_coords(points: "Sequence[_Point] | RouteCoords") -> RouteCoords:
+    """Return the :class:`RouteCoords` of a route, packing *points* only on first use.
+
+    Packed routes are kept for the most recent point lists (keyed by identity),
+    so successive calls on the same route waypoints share one array.
+    """
+    if isinstance(points, RouteCoords):
+        return points
+    key = id(points)
+    with _route_coords_lock:
+        cached = _route_coords_cache.get(key)
+        if cached is not None and cached[0] is points:
+            _route_coords_cache.move_to_end(key)
+            return cached[1]
+    coords = RouteCoords(points)
+    with _route_coords_lock:
+        _route_coords_cache[key] = (points, coords)
+        if len(_route_coords_cache) > _ROUTE_COORDS_CACHE_SIZE:
+            _route_coords_cache.popitem(last=False)
+    return coords
+
+
 async def build_corridor(
-    points: list[_Point],
+    points: "list[_Point] | RouteCoords",
     width: int,
+    key: Hashable = "corridor",
 ):
     """Return a Shapely polygon that is a ``width``-metre buffer around the polyline.
 
+    The buffer is computed by :func:`corridor_polygon` in the
+    :mod:`~here_search_demo.offload` worker pool; a newer call supersedes a
+    pending one.
+
     Parameters
     ----------
     points:
         Route points in ``(lat, lon)`` or ``(lat, lon, z)`` order.
     width:
         Buffer width in metres.
+    key:
+        Supersession key of the computation.
     """
-    if not points:
+    return await offload(corridor_polygon, points, width, key=key)
+
+
+def corridor_polygon(
+    points: "list[_Point] | RouteCoords",
+    width: int,
+):
+    """Synchronous body of :func:`build_corridor`."""
+    if not len(points):
         raise ValueError("points must not be empty")
 
-    line = LineString((float(p[1]), float(p[0])) for p in points)
+    from shapely import LineString
 
-    ref_lat = float(line.centroid.y)
-    ref_lon = float(line.centroid.x)
-    to_local, to_wgs84 = _local_metric_projectors(ref_lat, ref_lon)
+    coords = route_coords(points)
+    if coords.array is not None:
+        import shapely
+
+        np = _numpy()
+        line = shapely.linestrings(coords.array[:, ::-1])
+        to_local, to_wgs84 = _local_metric_projectors(float(line.centroid.y), float(line.centroid.x))
+        line_local = shapely.transform(line, lambda xy: np.column_stack(to_local(xy[:, 0], xy[:, 1])))
+        buffer_local = line_local.buffer(width)
+        return shapely.transform(buffer_local, lambda xy: np.column_stack(to_wgs84(xy[:, 0], xy[:, 1])))
+
+    import shapely
+
+    line = LineString([(lon, lat) for lat, lon in _pairs_from_flat(coords.flat)])
+    to_local, to_wgs84 = _local_metric_projectors(float(line.centroid.y), float(line.centroid.x))
     line_local = LineString([to_local(lon, lat) for lon, lat in line.coords])
     buffer_local = line_local.buffer(width)
-    return transform(to_wgs84, buffer_local)
+    return shapely.transform(buffer_local, lambda xy: [to_wgs84(x, y) for x, y in xy])
 
 
 def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -123,7 +290,7 @@ def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return _EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
-def elapsed_sec_at_position(spans: list, waypoints: list, lat: float, lon: float) -> float:
+def elapsed_sec_at_position(spans: list, waypoints: "list | RouteCoords", lat: float, lon: float) -> float:
     """Return the elapsed seconds from the route start to the waypoint closest to ``(lat, lon)``.
 
     Each span dict must contain ``offset`` (int) and ``duration`` (float, seconds).
@@ -131,13 +298,7 @@ def elapsed_sec_at_position(spans: list, waypoints: list, lat: float, lon: float
     but excluding ``spans[i]['offset']``.
     """
     # Find the closest waypoint by squared Euclidean distance (fast proxy).
-    min_dist2 = float("inf")
-    closest_idx = 0
-    for i, wp in enumerate(waypoints):
-        d2 = (lat - wp[0]) ** 2 + (lon - wp[1]) ** 2
-        if d2 < min_dist2:
-            min_dist2 = d2
-            closest_idx = i
+    closest_idx = route_coords(waypoints).nearest_index(lat, lon)
 
     elapsed = 0.0
     prev_offset = 0
@@ -153,14 +314,18 @@ def elapsed_sec_at_position(spans: list, waypoints: list, lat: float, lon: float
     return elapsed
 
 
-def position_at_x_sec_ahead(spans: list, waypoints: list, elapsed: float, x_sec: float) -> tuple[float, float]:
+def position_at_x_sec_ahead(
+    spans: list, waypoints: "list | RouteCoords", elapsed: float, x_sec: float
+) -> tuple[float, float]:
     """Return the ``(lat, lon)`` that is ``x_sec`` seconds ahead of ``elapsed`` along the route.
 
     If the target is beyond the end of the route the final waypoint is returned.
     """
-    if not waypoints:
+    if not len(waypoints):
         raise ValueError("waypoints must not be empty")
 
+    coords = route_coords(waypoints)
+    last = len(coords) - 1
     target = elapsed + x_sec
     acc = 0.0
     prev_offset = 0
@@ -170,28 +335,294 @@ def position_at_x_sec_ahead(spans: list, waypoints: list, elapsed: float, x_sec:
         span_end = span["offset"]
         if acc + span_dur > target:
             fraction = (target - acc) / span_dur if span_dur > 0 else 0.0
-            target_dist = span_len_m * fraction
-            pts = waypoints[prev_offset : span_end + 1]
-            if len(pts) < 2:
-                return pts[0] if pts else waypoints[-1]
-            cum = 0.0
-            for j in range(len(pts) - 1):
-                lat1, lon1 = pts[j]
-                lat2, lon2 = pts[j + 1]
-                seg = haversine_m(lat1, lon1, lat2, lon2)
-                if cum + seg >= target_dist:
-                    seg_frac = (target_dist - cum) / seg if seg > 1e-9 else 0.0
-                    return lat1 + (lat2 - lat1) * seg_frac, lon1 + (lon2 - lon1) * seg_frac
-                cum += seg
-            return pts[-1]
+            return _point_along_span(coords, prev_offset, span_end, span_len_m * fraction)
         acc += span_dur
         prev_offset = span_end
-    return waypoints[-1]
+    return coords.point(last)
+
+
+def _point_along_span(coords: RouteCoords, prev_offset: int, span_end: int, target_dist: float) -> _LatLon:
+    """Return the point ``target_dist`` metres after waypoint ``prev_offset``, within its span."""
+    last = len(coords) - 1
+    stop = min(span_end, last)
+    if prev_offset >= stop:
+        return coords.point(min(prev_offset, last))
+    # First point of the span at least target_dist metres from its start.
+    cum = coords.cumulative_m
+    base = float(cum[prev_offset])
+    j = bisect_left(cum, base + target_dist, prev_offset + 1, stop + 1)
+    if j > stop:
+        return coords.point(stop)
+    lat1, lon1 = coords.point(j - 1)
+    lat2, lon2 = coords.point(j)
+    seg = float(cum[j] - cum[j - 1])
+    seg_frac = (target_dist - (float(cum[j - 1]) - base)) / seg if seg > 1e-9 else 0.0
+    return lat1 + (lat2 - lat1) * seg_frac, lon1 + (lon2 - lon1) * seg_frac
+
+
+class RouteIndex:
+    """Route waypoints and spans indexed for repeated position queries.
+
+    Built once per route, it holds the elapsed seconds at each waypoint, the
+    cumulative span durations and a uniform grid over the route segments, so
+    that :meth:`elapsed_at` projects a position onto its nearest segment by
+    visiting only the grid cells around it, and :meth:`position_at` bisects
+    the cumulative arrays.  Both give the results of
+    :func:`elapsed_sec_at_position` and :func:`position_at_x_sec_ahead`,
+    except that a position is projected onto the route segments rather than
+    snapped to the closest waypoint.
+
+    :param spans: Route spans, as for :func:`elapsed_sec_at_position`
+    :param waypoints: Route points in ``(lat, lon)`` order
+    """
+
+    cell_segments = 4  # mean segment lengths per grid cell
+
+    def __init__(self, spans: list, waypoints: "Sequence[_Point] | RouteCoords"):
+        if not len(waypoints):
+            raise ValueError("waypoints must not be empty")
+        self.spans = spans
+        self.coords = route_coords(waypoints)
+        count = len(self.coords)
+        self._span_offsets = [span["offset"] for span in spans]
+        self._span_ends_s = list(accumulate(span.get("duration", 0) for span in spans))
+
+        # Elapsed seconds at each waypoint, interpolated by index within its span.
+        elapsed = array("d", [self._span_ends_s[-1] if spans else 0.0]) * count
+        acc, prev_offset = 0.0, 0
+        for span, span_end in zip(spans, self._span_offsets):
+            width = span_end - prev_offset
+            for i in range(max(prev_offset, 0), min(span_end, count - 1) + 1):
+                elapsed[i] = acc + (span["duration"] * (i - prev_offset) / width if width > 0 else 0.0)
+            acc += span["duration"]
+            prev_offset = span_end
+        self.elapsed_s = elapsed
+        self._build_grid()
+
+    def _local(self, lat, lon):
+        """Equirectangular coordinates, in degrees of latitude."""
+        return lon * self._cos_lat0, lat
+
+    def _build_grid(self) -> None:
+        coords = self.coords
+        min_lat, min_lon, max_lat, max_lon = coords.bounds()
+        self._cos_lat0 = max(math.cos(math.radians((min_lat + max_lat) / 2)), 1e-12)
+        self._x0, self._y0 = self._local(min_lat, min_lon)
+        x_max, y_max = self._local(max_lat, max_lon)
+        segments = len(coords) - 1
+        length_deg = float(coords.cumulative_m[-1]) / _METRES_PER_DEGREE
+        self._cell_size = max(
+            length_deg / max(segments, 1) * RouteIndex.cell_segments, (x_max - self._x0 + y_max - self._y0) / 4096, 1e-9
+        )
+        self._nx = int((x_max - self._x0) / self._cell_size) + 1
+        self._ny = int((y_max - self._y0) / self._cell_size) + 1
+        self._cells: dict[int, list[int]] = {}
+        if segments < 1:
+            return
+        # Segments are split into pieces no longer than a cell along either
+        # axis, and registered in the (at most 2 x 2) cells of each piece
+        # bounding box: a long segment is registered along its course rather
+        # than in every cell of its own bounding box.
+        if coords.array is not None:
+            np = _numpy()
+            x, y = self._local(coords.array[:, 0], coords.array[:, 1])
+            self._x, self._y = x, y
+            dx, dy = np.diff(x), np.diff(y)
+            pieces = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy)) / self._cell_size), 1).astype(np.int64)
+            piece_segs = np.repeat(np.arange(segments), pieces)
+            k = np.arange(len(piece_segs)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+            t0, t1 = k / pieces[piece_segs], (k + 1) / pieces[piece_segs]
+            xa, xb = x[piece_segs] + t0 * dx[piece_segs], x[piece_segs] + t1 * dx[piece_segs]
+            ya, yb = y[piece_segs] + t0 * dy[piece_segs], y[piece_segs] + t1 * dy[piece_segs]
+            cx0 = ((np.minimum(xa, xb) - self._x0) / self._cell_size).astype(np.int64)
+            cx1 = ((np.maximum(xa, xb) - self._x0) / self._cell_size).astype(np.int64)
+            cy0 = ((np.minimum(ya, yb) - self._y0) / self._cell_size).astype(np.int64)
+            cy1 = ((np.maximum(ya, yb) - self._y0) / self._cell_size).astype(np.int64)
+            # One (cell, segment) pair per cell of each piece bounding box.
+            w, h = cx1 - cx0 + 1, cy1 - cy0 + 1
+            counts = w * h
+            piece_ids = np.repeat(np.arange(len(piece_segs)), counts)
+            rank = np.arange(len(piece_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+            keys = (cy0[piece_ids] + rank // w[piece_ids]) * self._nx + cx0[piece_ids] + rank % w[piece_ids]
+            # Sorted by cell then segment, without the pairs shared by consecutive pieces.
+            pairs = np.unique(keys * segments + piece_segs[piece_ids])
+            keys, seg_ids = pairs // segments, pairs % segments
+            # Compressed rows: the segments of cell ``cell_keys[k]`` are
+            # ``cell_segments[cell_starts[k]:cell_starts[k + 1]]``.
+            self._cell_segments = seg_ids
+            first = np.flatnonzero(np.diff(keys, prepend=-1))
+            self._cell_keys = keys[first]
+            self._cell_starts = np.append(first, len(keys))
+        else:
+            points = [self._local(*coords.point(i)) for i in range(len(coords))]
+            self._x = array("d", (p[0] for p in points))
+            self._y = array("d", (p[1] for p in points))
+            for i in range(segments):
+                (xa, ya), (xb, yb) = points[i], points[i + 1]
+                pieces = max(math.ceil(max(abs(xb - xa), abs(yb - ya)) / self._cell_size), 1)
+                keys = set()
+                for k in range(pieces):
+                    t0, t1 = k / pieces, (k + 1) / pieces
+                    pxa, pxb = xa + t0 * (xb - xa), xa + t1 * (xb - xa)
+                    pya, pyb = ya + t0 * (yb - ya), ya + t1 * (yb - ya)
+                    for gy in range(
+                        int((min(pya, pyb) - self._y0) / self._cell_size),
+                        int((max(pya, pyb) - self._y0) / self._cell_size) + 1,
+                    ):
+                        for gx in range(
+                            int((min(pxa, pxb) - self._x0) / self._cell_size),
+                            int((max(pxa, pxb) - self._x0) / self._cell_size) + 1,
+                        ):
+                            keys.add(gy * self._nx + gx)
+                for key in keys:
+                    self._cells.setdefault(key, []).append(i)
+
+    def _cell(self, key: int):
+        """Return the segments registered in a grid cell, or ``None``."""
+        if self.coords.array is None:
+            return self._cells.get(key)
+        k = int(_numpy().searchsorted(self._cell_keys, key))
+        if k == len(self._cell_keys) or self._cell_keys[k] != key:
+            return None
+        return self._cell_segments[self._cell_starts[k] : self._cell_starts[k + 1]]
+
+    def _nearest_in(self, segment_ids, x: float, y: float) -> tuple[float, int, float]:
+        """Return ``(squared distance, segment, fraction)`` of the closest of *segment_ids*."""
+        if self.coords.array is not None:
+            np = _numpy()
+            xa, ya = self._x[segment_ids], self._y[segment_ids]
+            dx, dy = self._x[segment_ids + 1] - xa, self._y[segment_ids + 1] - ya
+            norm2 = dx * dx + dy * dy
+            t = np.clip(
+                np.divide((x - xa) * dx + (y - ya) * dy, norm2, out=np.zeros_like(norm2), where=norm2 > 0), 0, 1
+            )
+            d2 = (xa + t * dx - x) ** 2 + (ya + t * dy - y) ** 2
+            k = int(np.argmin(d2))
+            return float(d2[k]), int(segment_ids[k]), float(t[k])
+        best = (math.inf, 0, 0.0)
+        for i in segment_ids:
+            xa, ya, xb, yb = self._x[i], self._y[i], self._x[i + 1], self._y[i + 1]
+            dx, dy = xb - xa, yb - ya
+            norm2 = dx * dx + dy * dy
+            t = min(1.0, max(0.0, ((x - xa) * dx + (y - ya) * dy) / norm2)) if norm2 > 0 else 0.0
+            d2 = (xa + t * dx - x) ** 2 + (ya + t * dy - y) ** 2
+            if d2 < best[0]:
+                best = (d2, i, t)
+        return best
+
+    def _all_segments(self):
+        segments = len(self.coords) - 1
+        if self.coords.array is not None:
+            return _numpy().arange(segments)
+        return range(segments)
+
+    def project(self, lat: float, lon: float) -> tuple[int, float]:
+        """Return the ``(segment, fraction)`` of the route point closest to ``(lat, lon)``.
+
+        Segment *i* joins waypoints *i* and *i + 1*; the fraction is in ``[0, 1]``.
+        """
+        segment, t, _ = self.locate(lat, lon)
+        return segment, t
+
+    def locate(
+        self, lat: float, lon: float, first: int | None = None, stop: int | None = None
+    ) -> tuple[int, float, float]:
+        """Return the ``(segment, fraction, distance in metres)`` of the route point closest to ``(lat, lon)``.
+
+        :param first: First segment considered; with *stop*, only the segments
+            ``first`` to ``stop - 1`` are visited instead of the grid cells.
+        :param stop: End of the segments considered
+        """
+        if len(self.coords) < 2:
+            return 0, 0.0, haversine_m(lat, lon, *self.coords.point(0))
+        x, y = self._local(lat, lon)
+        if first is not None or stop is not None:
+            first, stop = max(0, first or 0), min(len(self.coords) - 1, len(self.coords) - 1 if stop is None else stop)
+            ids = _numpy().arange(first, stop) if self.coords.array is not None else range(first, stop)
+            d2, segment, t = self._nearest_in(ids, x, y) if stop > first else (math.inf, first, 0.0)
+        else:
+            d2, segment, t = self._project(x, y)
+        return segment, t, math.sqrt(d2) * _METRES_PER_DEGREE
+
+    def _project(self, x: float, y: float) -> tuple[float, int, float]:
+        cx, cy = int((x - self._x0) // self._cell_size), int((y - self._y0) // self._cell_size)
+        if not (-2 <= cx <= self._nx + 1 and -2 <= cy <= self._ny + 1):
+            # Far from the route: every cell would be visited anyway.
+            return self._nearest_in(self._all_segments(), x, y)
+        best = (math.inf, 0, 0.0)
+        for ring in range(max(self._nx, self._ny) + 3):
+            for gy in range(cy - ring, cy + ring + 1):
+                edge = gy in (cy - ring, cy + ring)
+                for gx in range(cx - ring, cx + ring + 1) if edge else (cx - ring, cx + ring):
+                    if not (0 <= gx < self._nx and 0 <= gy < self._ny):
+                        continue
+                    ids = self._cell(gy * self._nx + gx)
+                    if ids is not None and len(ids):
+                        candidate = self._nearest_in(ids, x, y)
+                        if candidate[0] < best[0]:
+                            best = candidate
+            # Cells of the next ring are at least ``ring`` cells away.
+            if best[0] <= (ring * self._cell_size) ** 2:
+                break
+        return best
+
+    def elapsed_at(self, lat: float, lon: float) -> float:
+        """Return the elapsed seconds from the route start to the route point closest to ``(lat, lon)``."""
+        return self.elapsed_on(*self.project(lat, lon))
+
+    def elapsed_on(self, segment: int, t: float) -> float:
+        """Return the elapsed seconds at fraction *t* of *segment*."""
+        if len(self.coords) < 2:
+            return self.elapsed_s[0]
+        return self.elapsed_s[segment] + t * (self.elapsed_s[segment + 1] - self.elapsed_s[segment])
+
+    def distance_on(self, segment: int, t: float) -> float:
+        """Return the along-route distance, in metres, at fraction *t* of *segment*."""
+        cum = self.coords.cumulative_m
+        if len(self.coords) < 2:
+            return 0.0
+        return float(cum[segment] + t * (cum[segment + 1] - cum[segment]))
+
+    def segment_at_distance(self, distance_m: float) -> int:
+        """Return the segment containing the along-route distance *distance_m*."""
+        return max(0, min(len(self.coords) - 2, bisect_right(self.coords.cumulative_m, distance_m) - 1))
+
+    def span_start_at(self, elapsed: float) -> int:
+        """Return the first waypoint of the span travelled ``elapsed`` seconds after the start."""
+        k = bisect_right(self._span_ends_s, elapsed)
+        if k == len(self.spans):
+            k -= 1
+        return max(0, min(self._span_offsets[k - 1] if k > 0 else 0, len(self.coords) - 1))
+
+    def span_end_at(self, elapsed: float) -> int:
+        """Return the last waypoint of the span travelled ``elapsed`` seconds after the start."""
+        k = bisect_right(self._span_ends_s, elapsed)
+        if k == len(self.spans):
+            return len(self.coords) - 1
+        return max(0, min(self._span_offsets[k], len(self.coords) - 1))
+
+    def position_at(self, elapsed: float) -> _LatLon:
+        """Return the route position reached ``elapsed`` seconds after the start."""
+        k = bisect_right(self._span_ends_s, elapsed)
+        if k == len(self.spans):
+            return self.coords.point(-1)
+        acc = self._span_ends_s[k - 1] if k else 0.0
+        span = self.spans[k]
+        span_dur = span.get("duration", 0)
+        fraction = (elapsed - acc) / span_dur if span_dur > 0 else 0.0
+        prev_offset = self._span_offsets[k - 1] if k else 0
+        return _point_along_span(self.coords, prev_offset, self._span_offsets[k], span.get("length", 0) * fraction)
+
+    def position_ahead(self, lat: float, lon: float, x_sec: float) -> _LatLon:
+        """Return the route position ``x_sec`` seconds ahead of the route point closest to ``(lat, lon)``."""
+        return self.position_at(self.elapsed_at(lat, lon) + x_sec)
 
 
 def _do_simplify_polyline(
-    bbox_scale: float, iterations: int, line: LineString, max_points: int, points: list[tuple[float, float]]
+    bbox_scale: float, iterations: int, line: "LineString", max_points: int, points: list[tuple[float, float]]
 ) -> list[tuple[float, float]]:
+    from shapely import get_coordinates, get_num_coordinates, simplify as _shapely_simplify
+
     eps_low, eps_high = 0.0, bbox_scale
     best_geo = None
 
@@ -210,20 +641,63 @@ def _do_simplify_polyline(
     return [tuple(row) for row in get_coordinates(best_geo)]
 
 
+def simplify_polyline_within(points: "Sequence[_Point] | RouteCoords", tolerance_m: float) -> list[_LatLon]:
+    """Simplify a route so that it stays within ``tolerance_m`` metres of the original.
+
+    A single GEOS Douglas–Peucker pass runs in the local tangent-plane
+    projection used by :func:`corridor_polygon`, so that the tolerance is
+    metric.  Results are cached on the :class:`RouteCoords` of the route, by
+    tolerance.
+    """
+    coords = route_coords(points)
+    simplified = coords.simplified.get(tolerance_m)
+    if simplified is not None:
+        return simplified
+    if len(coords) <= 2 or tolerance_m <= 0:
+        simplified = [coords.point(i) for i in range(len(coords))]
+    else:
+        import shapely
+
+        min_lat, min_lon, max_lat, max_lon = coords.bounds()
+        to_local, to_wgs84 = _local_metric_projectors((min_lat + max_lat) / 2, (min_lon + max_lon) / 2)
+        if coords.array is not None:
+            np = _numpy()
+            line = shapely.linestrings(np.column_stack(to_local(coords.array[:, 1], coords.array[:, 0])))
+            kept = shapely.get_coordinates(shapely.simplify(line, tolerance_m, preserve_topology=False))
+            lon, lat = to_wgs84(kept[:, 0], kept[:, 1])
+            simplified = list(zip(lat.tolist(), lon.tolist()))
+        else:
+            line = shapely.LineString([to_local(lon, lat) for lat, lon in _pairs_from_flat(coords.flat)])
+            kept = shapely.simplify(line, tolerance_m, preserve_topology=False).coords
+            simplified = [(lat, lon) for lon, lat in (to_wgs84(x, y) for x, y in kept)]
+    coords.simplified[tolerance_m] = simplified
+    return simplified
+
+
 def simplify_polyline(
-    points: list[tuple[float, float]],
+    points: "list[tuple[float, float]] | RouteCoords",
     max_points: int,
     iterations: int = 15,
 ) -> list[tuple[float, float]]:
     """Reduce ``points`` to at most ``max_points`` using GEOS Douglas–Peucker."""
     n = len(points)
     if n <= max_points:
-        return points
+        return points.points if isinstance(points, RouteCoords) else points
     if max_points < 2:
         raise ValueError("max_points must be >= 2")
 
-    flat = _build_flat_coord_array(points)
-    line = LineString(_pairs_from_flat(flat))
-    bbox_scale = _bbox_scale_from_flat(flat)
+    from shapely import LineString
+
+    coords = route_coords(points)
+    line = LineString(coords.array if coords.array is not None else _pairs_from_flat(coords.flat))
+    return _do_simplify_polyline(coords.bbox_scale(), iterations, line, max_points, coords.points)
+
+
+def __getattr__(name: str):
+    # ``mapping`` used to be re-exported from this module; keep it available
+    # without importing shapely eagerly.
+    if name == "mapping":
+        from shapely.geometry import mapping
 
-    return _do_simplify_polyline(bbox_scale, iterations, line, max_points, points)
+        return mapping
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
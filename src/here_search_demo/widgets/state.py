@@ -11,6 +11,8 @@ from here_search_demo.entity.response import (
     Response,
     ResponseItem,
 )
+from here_search_demo.tracing import trace_stage
+from here_search_demo.widgets.output_helpers import ItemFeatures, item_features
 
 
 _QUERY_RESULT_TYPES = {"chainQuery", "categoryQuery"}
@@ -46,111 +48,190 @@ def _get_vicinity(items_data_by_rank: dict[int, dict]) -> dict[int, str]:
     Parts are always displayed in their original left-to-right order.
     ``_vicinity`` is set on every disambiguated item.
     """
-    candidate_ranks = [r for r, d in items_data_by_rank.items() if d.get("resultType") not in _QUERY_RESULT_TYPES]
-    result: dict[int, str] = {r: d.get("title", "") for r, d in items_data_by_rank.items()}
-
-    if len(candidate_ranks) <= 1:
-        if len(candidate_ranks) == 1:
-            rank = candidate_ranks[0]
-            item = items_data_by_rank[rank]
-            parts = item.get("address", {}).get("label", "").split(", ")
-            if parts and parts[0]:
-                item["_vicinity"] = [parts[0]]
-        return result
-
-    items = [items_data_by_rank[r] for r in candidate_ranks]
-    parts_list = [item.get("address", {}).get("label", "").split(", ") for item in items]
-
-    # Determine whether the result set spans multiple countries.
-    countries = {parts[-1] for parts in parts_list if len(parts) > 1}
-    is_multi_country = len(countries) > 1
-
-    # active_indices[j] is the set of part indices (>0) currently included
-    # in the label for item j.  Parts are rendered in ascending index order
-    # (i.e. their original address order).
-    active_indices: list[set[int]] = [set() for _ in items]
-
-    if is_multi_country:
-        # Pre-include country for every item so that items in different
-        # countries are immediately distinguished.
-        for j, parts in enumerate(parts_list):
-            if len(parts) > 1:
-                active_indices[j].add(len(parts) - 1)
-
-    # For each item: order in which additional indices are tried.
-    # Go right-to-left through intermediate parts, then add
-    # country as a last resort only in single-country results.
-    def _try_order(n: int) -> list[int]:
-        order = [i for i in range(n - 2, 0, -1)]  # n-2, n-3, …, 1
+    return _VicinityIndex(items_data_by_rank).titles
+
+
+class _VicinityEntry:
+    """Disambiguation state of one candidate item of :class:`_VicinityIndex`."""
+
+    __slots__ = ("active", "base_name", "bracketed", "data", "key", "label", "order", "parts", "ptr")
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.parts = data.get("address", {}).get("label", "").split(", ")
+        self.base_name = (self.parts[0] if self.parts and self.parts[0] else None) or data.get("title", "")
+        # Equal labels always share their first ", "-separated component, so
+        # items with different keys can never collide.
+        self.key = self.base_name.partition(", ")[0]
+        self.bracketed = bool(_BRACKETED_RE.search(data.get("title", "")))
+        self.order: list[int] = []
+        self.ptr = 0
+        self.active: set[int] = set()
+        self.label = self.base_name
+
+    def reset(self, is_multi_country: bool) -> None:
+        # Go right-to-left through intermediate parts, then add
+        # country as a last resort only in single-country results.
+        n = len(self.parts)
+        self.order = [i for i in range(n - 2, 0, -1)]  # n-2, n-3, …, 1
         if not is_multi_country and n >= 2:
-            order.append(n - 1)  # country as final tie-breaker
-        return order
-
-    orders = [_try_order(len(p)) for p in parts_list]
-    order_ptrs = [0] * len(items)
-
-    # Cache the name part so build_label() doesn't recompute it each call.
-    base_names = [
-        (parts[0] if parts and parts[0] else None) or item.get("title", "") for parts, item in zip(parts_list, items)
-    ]
-
-    # Items whose *title* field already contains a parenthetical qualifier are
-    # self-disambiguating: item["title"] is used as-is as the display label
-    # and as the sole _vicinity entry.  They are excluded from the
-    # suffix-addition loop entirely.
-    bracketed = [bool(_BRACKETED_RE.search(item.get("title", ""))) for item in items]
-
-    def label_for(j: int) -> str:
-        if not active_indices[j]:
-            return base_names[j]
-        suffix = ", ".join(parts_list[j][i] for i in sorted(active_indices[j]))
-        return f"{base_names[j]}, {suffix}" if suffix else base_names[j]
-
-    labels = [label_for(j) for j in range(len(items))]
-
-    # Iteratively resolve ambiguity: each pass finds labels shared by more than
-    # one item and extends each of them by the next candidate address part
-    # (following the pre-built per-item order).  Stops as soon as all labels
-    # are unique, no more parts are available to add, or the safety-cap on
-    # iterations (one more than the longest part order) is reached.
-    max_iters = max((len(o) for o in orders), default=0) + 1
-    for _ in range(max_iters):
-        # Only non-bracketed items participate in duplicate resolution.
-        duplicate_labels = {
-            label
-            for label, count in Counter(labels[j] for j in range(len(items)) if not bracketed[j]).items()
-            if count > 1
-        }
-        if not duplicate_labels:
-            break
-        changed = False
-        for j in range(len(items)):
-            if not bracketed[j] and labels[j] in duplicate_labels and order_ptrs[j] < len(orders[j]):
-                active_indices[j].add(orders[j][order_ptrs[j]])
-                order_ptrs[j] += 1
-                labels[j] = label_for(j)
-                changed = True
-        if not changed:
-            break
-
-    for j, rank in enumerate(candidate_ranks):
-        label = labels[j]
-        parts = parts_list[j]
+            self.order.append(n - 1)  # country as final tie-breaker
+        self.ptr = 0
+        # Pre-include country in multi-country results so that items in
+        # different countries are immediately distinguished.
+        self.active = {n - 1} if is_multi_country and n > 1 else set()
+        self._relabel()
+
+    def extend(self) -> None:
+        self.active.add(self.order[self.ptr])
+        self.ptr += 1
+        self._relabel()
+
+    def _relabel(self) -> None:
+        if not self.active:
+            self.label = self.base_name
+            return
+        suffix = ", ".join(self.parts[i] for i in sorted(self.active))
+        self.label = f"{self.base_name}, {suffix}" if suffix else self.base_name
+
+
+class _VicinityIndex:
+    """Incremental form of :func:`_get_vicinity`.
+
+    Ambiguity is only ever resolved between items whose labels share their
+    leading component, so candidates are bucketed by that key and each bucket
+    is resolved on its own.  :meth:`replace` re-resolves the buckets of the
+    replaced and the replacing item only, and falls back to a full
+    :meth:`rebuild` when a result-set-wide input changes (number of
+    candidates, multi-country flag or iteration cap).  ``titles`` and the
+    ``_vicinity`` entries are identical to a full recomputation.
+
+    :param items_data_by_rank: Item data dicts; ``_vicinity`` is set in place
+        and the index keeps a reference to the mapping.
+    """
+
+    def __init__(self, items_data_by_rank: dict[int, dict]):
+        self.rebuild(items_data_by_rank)
+
+    def rebuild(self, items_data_by_rank: dict[int, dict]) -> None:
+        self.items_data_by_rank = items_data_by_rank
+        self.titles: dict[int, str] = {r: d.get("title", "") for r, d in items_data_by_rank.items()}
+        self._entries: dict[int, _VicinityEntry] = {}
+        self._buckets: defaultdict[str, set[int]] = defaultdict(set)
+        self._countries: Counter[str] = Counter()
+        self._part_counts: Counter[int] = Counter()
+        for rank, data in items_data_by_rank.items():
+            if data.get("resultType") not in _QUERY_RESULT_TYPES:
+                self._add(rank, _VicinityEntry(data))
+        self._is_multi_country = len(self._countries) > 1
+
+        if len(self._entries) <= 1:
+            for entry in self._entries.values():
+                if entry.parts and entry.parts[0]:
+                    entry.data["_vicinity"] = [entry.parts[0]]
+            return
+
+        for ranks in self._buckets.values():
+            self._resolve(ranks)
+        for rank in self._entries:
+            self._publish(rank)
+
+    def replace(self, rank: int) -> None:
+        """Re-resolve labels after ``items_data_by_rank[rank]`` was set or replaced."""
+        data = self.items_data_by_rank[rank]
+        old = self._entries.get(rank)
+        new = _VicinityEntry(data) if data.get("resultType") not in _QUERY_RESULT_TYPES else None
+        candidates_count = len(self._entries) - (old is not None) + (new is not None)
+        if len(self._entries) <= 1 or candidates_count <= 1:
+            self.rebuild(self.items_data_by_rank)
+            return
+
+        max_iters = self._max_iters()
+        if old is not None:
+            self._remove(rank, old)
+        if new is not None:
+            self._add(rank, new)
+        if (len(self._countries) > 1) != self._is_multi_country or self._max_iters() != max_iters:
+            self.rebuild(self.items_data_by_rank)
+            return
+
+        self.titles[rank] = data.get("title", "")
+        touched = {entry.key for entry in (old, new) if entry is not None and not entry.bracketed}
+        for key in touched:
+            ranks = self._buckets.get(key, set())
+            self._resolve(ranks)
+            for r in ranks:
+                self._publish(r)
+        if new is not None and new.bracketed:
+            self._publish(rank)
+
+    def _add(self, rank: int, entry: _VicinityEntry) -> None:
+        self._entries[rank] = entry
+        # Bracketed items are self-disambiguating and never join a bucket.
+        if not entry.bracketed:
+            self._buckets[entry.key].add(rank)
+        if len(entry.parts) > 1:
+            self._countries[entry.parts[-1]] += 1
+        self._part_counts[len(entry.parts)] += 1
+
+    def _remove(self, rank: int, entry: _VicinityEntry) -> None:
+        del self._entries[rank]
+        if not entry.bracketed:
+            bucket = self._buckets[entry.key]
+            bucket.discard(rank)
+            if not bucket:
+                del self._buckets[entry.key]
+        if len(entry.parts) > 1:
+            self._countries[entry.parts[-1]] -= 1
+            if not self._countries[entry.parts[-1]]:
+                del self._countries[entry.parts[-1]]
+        self._part_counts[len(entry.parts)] -= 1
+        if not self._part_counts[len(entry.parts)]:
+            del self._part_counts[len(entry.parts)]
+
+    def _max_iters(self) -> int:
+        # One more than the longest part order (see _VicinityEntry.reset).
+        n = max(self._part_counts, default=0)
+        return max(0, n - 2) + int(not self._is_multi_country and n >= 2) + 1
+
+    def _resolve(self, ranks: set[int]) -> None:
+        """Iteratively resolve ambiguity between the items of one bucket.
+
+        Each pass finds labels shared by more than one item and extends each
+        of them by the next candidate address part.  Stops as soon as all
+        labels are unique, no more parts are available to add, or the
+        result-set-wide safety cap on iterations is reached.
+        """
+        entries = [self._entries[r] for r in ranks]
+        for entry in entries:
+            entry.reset(self._is_multi_country)
+        for _ in range(self._max_iters()):
+            duplicate_labels = {label for label, count in Counter(e.label for e in entries).items() if count > 1}
+            if not duplicate_labels:
+                break
+            changed = False
+            for entry in entries:
+                if entry.label in duplicate_labels and entry.ptr < len(entry.order):
+                    entry.extend()
+                    changed = True
+            if not changed:
+                break
+
+    def _publish(self, rank: int) -> None:
+        entry = self._entries[rank]
         # Exception: if item["title"] contains a bracketed qualifier, use the
         # title as-is as the display label and as the sole _vicinity entry.
-        if bracketed[j]:
-            title = items[j].get("title", label)
-            result[rank] = title
-            items_data_by_rank[rank]["_vicinity"] = [title]
+        if entry.bracketed:
+            title = entry.data.get("title", entry.label)
+            self.titles[rank] = title
+            entry.data["_vicinity"] = [title]
         else:
-            result[rank] = label if label else result[rank]
+            self.titles[rank] = entry.label or entry.data.get("title", "")
             # Expose the parts that compose the display label as _vicinity so they
             # are visible in the JSON output widget.  Always includes part[0] (the
             # place name) followed by any active suffix parts in address order.
-            used_indices = [0] + sorted(active_indices[j])
-            items_data_by_rank[rank]["_vicinity"] = [parts[i] for i in used_indices if i < len(parts)]
-
-    return result
+            used_indices = [0] + sorted(entry.active)
+            entry.data["_vicinity"] = [entry.parts[i] for i in used_indices if i < len(entry.parts)]
 
 
 @dataclass
@@ -184,6 +265,9 @@ class SearchState:
         self.items_by_rank: dict[int, ResponseItem] = {}
         self.items_data_by_rank: dict[int, dict] = {}
         self.display_titles_by_rank: dict[int, str] = {}
+        # Rendering features of the displayed items, see output_helpers.item_features.
+        self.features_by_id: dict[str, ItemFeatures] = {}
+        self._vicinity: _VicinityIndex | None = None
         self.last_endpoint: Endpoint | None = None
         self.expanded_ranks: set[int] = set()
         self.current_query: str = ""
@@ -194,20 +278,37 @@ class SearchState:
         self.items_by_rank.clear()
         self.items_data_by_rank.clear()
         self.expanded_ranks.clear()
+        self.features_by_id = {}
         self.last_endpoint = resp.req.endpoint if resp.req is not None else None
 
         for rank, item_data in self._iter_response_items(resp):
             self.items_by_rank[rank] = self._build_item(resp, item_data, rank)
             self.items_data_by_rank[rank] = item_data
 
-        self.display_titles_by_rank = _get_vicinity(self.items_data_by_rank)
+        with trace_stage("vicinity"):
+            self._vicinity = _VicinityIndex(self.items_data_by_rank)
+            self.display_titles_by_rank = self._vicinity.titles
+
+        with trace_stage("features"):
+            for item_data in self.items_data_by_rank.values():
+                item_features(item_data, self.features_by_id)
 
     def update_item(self, rank: int, data: dict, resp: Response) -> None:
         if self.last_endpoint is None and resp.req is not None:
             self.last_endpoint = resp.req.endpoint
+        previous = self.items_data_by_rank.get(rank)
+        if previous is not None:
+            self.features_by_id.pop(previous.get("id"), None)
+        self.features_by_id.pop(data.get("id"), None)
         self.items_by_rank[rank] = self._build_item(resp, data, rank)
         self.items_data_by_rank[rank] = data
-        self.display_titles_by_rank = _get_vicinity(self.items_data_by_rank)
+        with trace_stage("vicinity"):
+            if self._vicinity is None:
+                self._vicinity = _VicinityIndex(self.items_data_by_rank)
+            else:
+                self._vicinity.replace(rank)
+            self.display_titles_by_rank = self._vicinity.titles
+        item_features(data, self.features_by_id)
 
     def get_item(self, rank: int) -> ResponseItem | None:
         return self.items_by_rank.get(rank)
@@ -30,6 +30,19 @@ from here_search_demo.event import (
 from here_search_demo.widgets.input_text import PlaceTaxonomyButton
 
 
+def pytest_addoption(parser):
+    parser.addoption("--benchmarks", action="store_true", help="run the timing benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="timing benchmark, run with --benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def api_key():
     return "api_key"
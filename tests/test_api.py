@@ -125,6 +125,8 @@ async def test_get_uncache(api, a_dummy_request, session):
 
     assert second.data == first.data == {"items": []}
     assert second.req is first.req is a_dummy_request
+    assert not first.cached
+    assert second.cached
 
 
 @pytest.mark.asyncio
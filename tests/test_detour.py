@@ -9,6 +9,7 @@
 
 """Tests for here_search_demo.detour.DetourRanker."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -287,3 +288,382 @@ async def test_rerank_routing_preserves_response_metadata():
 
     assert result.req is original_req
     assert result.x_headers is original_headers
+
+
+# ---------------------------------------------------------------------------
+# matrix engine and routing backends
+# ---------------------------------------------------------------------------
+
+
+def _along_items(count: int) -> list[dict]:
+    # Spread between at_pos and stop_pos, alternately on and off the direct line.
+    return [
+        {
+            "id": str(i),
+            "title": f"P{i}",
+            "position": {"lat": 52.40 - 0.34 * i / count + 0.05 * (i % 3), "lng": 12.80 - 0.87 * i / count},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_matrix_engine_matches_via_engine_with_two_requests():
+    from here_search_demo.detour import StraightLineRouter
+
+    def ranker(engine, calls):
+        return DetourRanker(
+            credentials=MagicMock(),
+            at_pos=(52.40, 12.80),
+            stop_pos=(52.06, 11.93),
+            on_routing_request=lambda: calls.append(engine),
+            backend=StraightLineRouter(),
+            engine=engine,
+        )
+
+    resp = _make_response(_along_items(30))
+    via_calls, matrix_calls = [], []
+    with patch("here_search_demo.detour.HTTPSession"):
+        via = await ranker("via", via_calls).rerank(resp, all_along=True)
+        matrix_ranker = ranker("matrix", matrix_calls)
+        matrix = await matrix_ranker.rerank(resp, all_along=True)
+
+    assert len(via_calls) == 31
+    assert len(matrix_calls) == 2
+    assert [item["id"] for item in matrix.data["items"]] == [item["id"] for item in via.data["items"]]
+    for via_item, matrix_item in zip(via.data["items"], matrix.data["items"]):
+        via_detour, matrix_detour = via_item["_detour"], matrix_item["_detour"]
+        assert matrix_detour["label"] == via_detour["label"]
+        assert matrix_detour["excursion_m"] == pytest.approx(via_detour["excursion_m"], abs=2)
+        assert matrix_detour["polyline_to"] is None
+
+    # Polylines are routed once, on demand.
+    position = matrix.data["items"][0]["position"]
+    with patch("here_search_demo.detour.HTTPSession"):
+        poly_to, poly_from = await matrix_ranker.detour_polylines(position["lat"], position["lng"])
+        assert await matrix_ranker.detour_polylines(position["lat"], position["lng"]) == (poly_to, poly_from)
+    assert len(matrix_calls) == 3
+    assert poly_to and poly_from
+
+
+@pytest.mark.asyncio
+async def test_here_matrix_requests_are_split_in_blocks_and_skip_errors():
+    ranker = DetourRanker(
+        credentials=MagicMock(token="test-token"),
+        at_pos=(52.40, 12.80),
+        stop_pos=(52.06, 11.93),
+        engine="matrix",
+    )
+    items = _along_items(100)
+    bodies = []
+
+    async def fake_fetch_matrix(session, body, headers):
+        bodies.append(body)
+        rows, columns = len(body["origins"]), len(body["destinations"])
+        # Travel time encodes the origin latitude; the last item is unroutable.
+        times = [int(o["lat"] * 1000) for o in body["origins"] for _ in range(columns)]
+        errors = [3 if o["lat"] == items[-1]["position"]["lat"] else 0 for o in body["origins"] for _ in range(columns)]
+        return {
+            "numOrigins": rows,
+            "numDestinations": columns,
+            "travelTimes": times,
+            "distances": [100_000] * (rows * columns),
+            "errorCodes": errors,
+        }
+
+    with (
+        patch.object(ranker, "_fetch_matrix", side_effect=fake_fetch_matrix),
+        patch("here_search_demo.detour.HTTPSession"),
+    ):
+        result = await ranker.rerank(_make_response(items), all_along=True)
+
+    # at → (100 items, stop): 2 blocks of destinations; items → stop: 7 blocks of 15 origins.
+    assert len(bodies) == 2 + 7
+    assert max(len(body["origins"]) for body in bodies) == DetourRanker.matrix_max_origins
+    assert max(len(body["destinations"]) for body in bodies) == DetourRanker.matrix_max_destinations
+    reranked = result.data["items"]
+    assert len(reranked) == 99
+    assert reranked[0]["_detour"]["dur_from_sec"] == min(item["_detour"]["dur_from_sec"] for item in reranked)
+
+
+def test_detour_ranker_rejects_unknown_engines():
+    with pytest.raises(ValueError):
+        DetourRanker(credentials=MagicMock(), at_pos=(0, 0), stop_pos=(1, 1), engine="teleport")
+
+
+# ---------------------------------------------------------------------------
+# geometric pre-filter
+# ---------------------------------------------------------------------------
+
+
+def _straight_route_ranker(calls):
+    from here_search_demo.detour import StraightLineRouter
+    from here_search_demo.widgets.route_geometry import RouteIndex
+
+    # ~111 km northwards at 25 m/s.
+    waypoints = [(48.0 + i * 0.001, 2.3) for i in range(1001)]
+    spans = [{"offset": k, "duration": 444.8, "length": 11_120} for k in range(100, 1001, 100)]
+    return DetourRanker(
+        credentials=MagicMock(),
+        at_pos=waypoints[0],
+        stop_pos=waypoints[-1],
+        on_routing_request=lambda: calls.append("routing"),
+        backend=StraightLineRouter(circuity=1.0),
+        route_index=RouteIndex(spans, waypoints),
+    )
+
+
+def _off_route_item(name, lat, off_deg):
+    return {"id": name, "title": name, "position": {"lat": lat, "lng": 2.3 + off_deg}}
+
+
+@pytest.mark.asyncio
+async def test_prefilter_prunes_items_whose_estimated_excursion_exceeds_the_maximum():
+    calls = []
+    ranker = _straight_route_ranker(calls)
+    items = [
+        _off_route_item("near", 48.5, 0.002),
+        _off_route_item("far", 48.5, 1.5),
+        _off_route_item("behind", 47.7, 0.0),
+        _off_route_item("near2", 48.9, 0.01),
+    ]
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(items), max_excursion=5_000)
+
+    assert [item["id"] for item in result.data["items"]] == ["near", "near2"]
+    assert len(calls) == 3  # baseline + 2 routed items
+    report = ranker.last_report
+    assert (report.positioned, report.pruned_excursion, report.routed) == (4, 2, 2)
+    assert report.calls_avoided == 2
+
+
+@pytest.mark.asyncio
+async def test_prefilter_bound_never_exceeds_the_routed_excursion():
+    from here_search_demo.detour import estimate_detours
+
+    calls = []
+    ranker = _straight_route_ranker(calls)
+    items = [_off_route_item(str(i), 47.9 + 0.013 * i, 0.03 * (i % 5 - 2)) for i in range(20)]
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(items))
+
+    vias = [(item["position"]["lat"], item["position"]["lng"]) for item in items]
+    estimates = estimate_detours(ranker.route_index, ranker.at_pos, ranker.stop_pos, vias)
+    routed = {item["id"]: item["_detour"]["excursion_m"] for item in result.data["items"]}
+    for item, estimate in zip(items, estimates):
+        assert estimate.excursion_m <= routed[item["id"]] + 1
+
+
+@pytest.mark.asyncio
+async def test_prefilter_estimate_allows_for_a_position_off_the_route():
+    from here_search_demo.detour import estimate_detours
+
+    calls = []
+    ranker = _straight_route_ranker(calls)
+    ranker.at_pos = (48.0, 2.35)
+    items = [_off_route_item(str(i), 48.0 + 0.05 * i, 0.05) for i in range(20)]
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(items))
+
+    vias = [(item["position"]["lat"], item["position"]["lng"]) for item in items]
+    estimates = estimate_detours(ranker.route_index, ranker.at_pos, ranker.stop_pos, vias)
+    routed = {item["id"]: item["_detour"]["excursion_m"] for item in result.data["items"]}
+    for item, estimate in zip(items, estimates):
+        assert estimate.excursion_m <= routed[item["id"]] + 1
+
+
+@pytest.mark.asyncio
+async def test_prefilter_routes_only_the_top_k_estimates():
+    calls = []
+    ranker = _straight_route_ranker(calls)
+    # Increasingly far off the route.
+    items = [_off_route_item(str(i), 48.5, 0.001 * (10 - i)) for i in range(10)]
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(items), all_along=True, top_k=3)
+
+    assert sorted(item["id"] for item in result.data["items"]) == ["7", "8", "9"]
+    assert len(calls) == 4
+    assert ranker.last_report.pruned_top_k == 7
+    assert ranker.last_report.calls_avoided == 7
+
+
+# ---------------------------------------------------------------------------
+# streaming rerank
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_iter_scored_yields_in_completion_order_and_cancels_on_close():
+    ranker = _make_ranker()
+    items = [
+        {"title": "Slow", "position": {"lat": 52.3, "lng": 12.5}},
+        {"title": "Fast", "position": {"lat": 52.4, "lng": 12.6}},
+        {"title": "Hung", "position": {"lat": 52.2, "lng": 12.4}},
+    ]
+    cancelled = []
+
+    async def fake_get_route_summary(session, start_lat, start_lon, stop_lat, stop_lon, headers):
+        return (0, 200_000, "poly_baseline")
+
+    async def fake_get_route_with_via(
+        session, start_lat, start_lon, via_lat, via_lon, stop_lat, stop_lon, headers, name_hint=None
+    ):
+        delay = {52.3: 0.02, 52.4: 0.0, 52.2: 60}[via_lat]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(via_lat)
+            raise
+        return (60, 100_000, "to", 60, 100_000, "from")
+
+    with (
+        patch.object(ranker, "_get_route_summary", side_effect=fake_get_route_summary),
+        patch.object(ranker, "get_route_with_via", side_effect=fake_get_route_with_via),
+        patch("here_search_demo.detour.HTTPSession"),
+    ):
+        stream = ranker.iter_scored(_make_response(items))
+        titles = [(await anext(stream))[2]["title"], (await anext(stream))[2]["title"]]
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    assert titles == ["Fast", "Slow"]
+    assert cancelled == [52.2]
+
+
+# ---------------------------------------------------------------------------
+# bounded fan-out and deadline
+# ---------------------------------------------------------------------------
+
+
+def _bounded_ranker(**kwargs) -> DetourRanker:
+    return DetourRanker(credentials=MagicMock(token="t"), at_pos=(52.40, 12.80), stop_pos=(52.06, 11.93), **kwargs)
+
+
+def _route_patches(ranker, via_fn, baseline_delay=0.0):
+    async def fake_get_route_summary(session, start_lat, start_lon, stop_lat, stop_lon, headers):
+        await asyncio.sleep(baseline_delay)
+        return (3600, 75_000, "poly_baseline")
+
+    async def fake_get_route_with_via(
+        session, start_lat, start_lon, via_lat, via_lon, stop_lat, stop_lon, headers, name_hint=None
+    ):
+        return await via_fn(via_lat, via_lon)
+
+    return (
+        patch.object(ranker, "_get_route_summary", side_effect=fake_get_route_summary),
+        patch.object(ranker, "get_route_with_via", side_effect=fake_get_route_with_via),
+        patch("here_search_demo.detour.HTTPSession"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_via_routes_are_requested_within_the_concurrency_bound():
+    ranker = _bounded_ranker(max_concurrency=3)
+    in_flight = [0, 0]
+
+    async def via(lat, lon):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.005)
+        in_flight[0] -= 1
+        return (60, 40_000, "to", 60, 40_000, "from")
+
+    first, second, third = _route_patches(ranker, via)
+    with first, second, third:
+        result = await ranker.rerank(_make_response(_along_items(20)))
+
+    assert len(result.data["items"]) == 20
+    assert in_flight[1] == 3
+
+
+@pytest.mark.asyncio
+async def test_routes_missing_the_deadline_are_ranked_on_flagged_estimates():
+    ranker = _bounded_ranker(deadline_s=0.05)
+    items = _along_items(3)
+    cancelled = []
+
+    async def via(lat, lon):
+        if lat == items[1]["position"]["lat"]:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(lat)
+                raise
+        if lat == items[2]["position"]["lat"]:
+            raise ConnectionError("router down")
+        return (60, 40_000, "to", 60, 40_000, "from")
+
+    first, second, third = _route_patches(ranker, via)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with first, second, third:
+        result = await ranker.rerank(_make_response(items))
+    await asyncio.sleep(0)
+
+    assert loop.time() - start < 1
+    assert cancelled == [items[1]["position"]["lat"]]
+    detours = {item["id"]: item["_detour"] for item in result.data["items"]}
+    assert detours["0"]["estimated"] is False
+    assert detours["0"]["polyline_to"] == "to"
+    for late in ("1", "2"):
+        assert detours[late]["estimated"] is True
+        assert detours[late]["polyline_to"] is None
+        assert "~" in detours[late]["label"]
+        # Calibrated on the direct route: plausible durations and distances.
+        assert 0 < detours[late]["dur_to_sec"] < 3600
+        assert detours[late]["excursion_m"] > -75_000
+
+
+@pytest.mark.asyncio
+async def test_missing_direct_route_estimates_every_detour():
+    ranker = _bounded_ranker(deadline_s=0.05)
+
+    async def via(lat, lon):
+        return (60, 40_000, "to", 60, 40_000, "from")
+
+    first, second, third = _route_patches(ranker, via, baseline_delay=60)
+    with first, second, third:
+        result = await ranker.rerank(_make_response(_along_items(2)))
+
+    assert [item["_detour"]["estimated"] for item in result.data["items"]] == [True, True]
+    assert all(item["_detour"]["polyline_to"] == "to" for item in result.data["items"])
+
+
+class _FailingMatrixRouter:
+    """Backend whose matrix service fails, or cannot route the direct ``at → stop`` trip."""
+
+    def __init__(self, fail: bool):
+        from here_search_demo.detour import StraightLineRouter
+
+        self.fail = fail
+        self.router = StraightLineRouter()
+
+    async def matrix(self, session, origins, destinations):
+        if self.fail:
+            raise ConnectionError("matrix service down")
+        durations, lengths = await self.router.matrix(session, origins, destinations)
+        if len(origins) == 1:
+            # The stop is the last destination of the single origin.
+            durations[0][-1] = lengths[0][-1] = None
+        return durations, lengths
+
+
+@pytest.mark.asyncio
+async def test_failed_matrix_ranks_every_item_on_flagged_estimates():
+    ranker = _bounded_ranker(engine="matrix", backend=_FailingMatrixRouter(fail=True))
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(_along_items(3)))
+
+    assert len(result.data["items"]) == 3
+    assert all(item["_detour"]["estimated"] for item in result.data["items"])
+
+
+@pytest.mark.asyncio
+async def test_matrix_without_direct_route_estimates_it():
+    ranker = _bounded_ranker(engine="matrix", backend=_FailingMatrixRouter(fail=False))
+    with patch("here_search_demo.detour.HTTPSession"):
+        result = await ranker.rerank(_make_response(_along_items(3)))
+
+    assert len(result.data["items"]) == 3
+    assert all(item["_detour"]["estimated"] for item in result.data["items"])
+    assert all("~" in item["_detour"]["label"] for item in result.data["items"])
@@ -0,0 +1,38 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+import json
+import subprocess
+import sys
+
+# The headless modules must not pull in the widget or geometry stacks.
+_PROBE = """
+import json, sys
+import here_search_demo.api
+import here_search_demo.auth
+import here_search_demo.base
+import here_search_demo.detour
+import here_search_demo.entity.intent
+import here_search_demo.entity.request
+import here_search_demo.entity.response
+import here_search_demo.event
+import here_search_demo.route_engine
+import here_search_demo.util
+heavy = ("ipywidgets", "ipyleaflet", "anywidget", "IPython", "traitlets", "shapely", "flexpolyline", "numpy")
+print(json.dumps({"loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_headless_import_does_not_load_widget_or_geometry_dependencies():
+    assert _probe()["loaded"] == []
@@ -16,6 +16,7 @@ from here_search_demo.lite import (
     _ContextManagerMixing,
     ClientResponse,
     FetchResponseCM,
+    HTTPClientError,
     HTTPConnectionError,
     HTTPNetworkError,
     HTTPResponseError,
@@ -36,6 +37,11 @@ def test_http_response_error_is_exception():
     assert issubclass(HTTPResponseError, Exception)
 
 
+def test_http_errors_are_client_errors():
+    assert issubclass(HTTPConnectionError, HTTPClientError)
+    assert issubclass(HTTPResponseError, HTTPClientError)
+
+
 # ---------------------------------------------------------------------------
 # _BrowserFetchResponse
 # ---------------------------------------------------------------------------
@@ -0,0 +1,86 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the worker-pool offloading of CPU-heavy functions."""
+
+import asyncio
+import threading
+
+import pytest
+
+from here_search_demo import offload as offload_module
+from here_search_demo.offload import Offloader
+
+
+def _thread_name():
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_offloader_runs_in_a_worker_thread():
+    offloader = Offloader()
+    try:
+        assert await offloader.run(_thread_name) != threading.current_thread().name
+        assert offloader.stats()["submitted"] == 1
+    finally:
+        offloader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_offloader_runs_inline_without_workers_or_in_the_browser(monkeypatch):
+    assert await Offloader(max_workers=0).run(_thread_name) == threading.current_thread().name
+
+    monkeypatch.setattr(offload_module, "IS_BROWSER_RUNTIME", True)
+    offloader = Offloader()
+    assert await offloader.run(_thread_name) == threading.current_thread().name
+    assert offloader.stats()["inlined"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keyed_call_supersedes_the_pending_one():
+    offloader = Offloader(max_workers=1)
+    release = threading.Event()
+    try:
+        first = asyncio.ensure_future(offloader.run(release.wait, 5, key="k"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(offloader.run(lambda: "second", key="k"))
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "second"
+        assert offloader.stats() == {"submitted": 2, "inlined": 0, "superseded": 1, "pending": 0}
+    finally:
+        offloader.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_offloaded_job_keeps_the_loop_responsive():
+    offloader = Offloader(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_job():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    try:
+        job = asyncio.ensure_future(offloader.run(blocking_job))
+        ticks = 0
+        while ticks < 3 or not started.is_set():
+            await asyncio.sleep(0.001)
+            ticks += 1
+        # The loop kept ticking while the job blocked its worker.
+        assert not job.done()
+        release.set()
+        assert await job == "done"
+    finally:
+        release.set()
+        offloader.shutdown()
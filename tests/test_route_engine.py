@@ -7,11 +7,13 @@
 #
 ###############################################################################
 
+from itertools import pairwise
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from flexpolyline import encode as fp_encode
 
+from here_search_demo import route_engine as route_engine_module
 from here_search_demo.ranking import RankingMode
 from here_search_demo.route_engine import RouteEngine
 
@@ -112,6 +114,26 @@ async def test_route_engine_update_route_attributes_caches_and_counts_calls(engi
     engine._retrieve_route.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_route_engine_indexes_route_once_for_position_updates(engine):
+    waypoints = [(48.8 + i * 0.001, 2.3) for i in range(101)]
+    spans = [{"offset": 50, "duration": 300.0, "length": 5500.0}, {"offset": 100, "duration": 300.0, "length": 5500.0}]
+    route_response = {"routes": [{"sections": [{"polyline": fp_encode(waypoints), "summary": {}, "spans": spans}]}]}
+    engine.start_position = waypoints[0]
+    engine.stop_position = waypoints[-1]
+    engine._retrieve_route = AsyncMock(return_value=route_response)
+
+    cached = await engine.update_route_attributes()
+    index = engine.route_index
+    assert index is cached["index"]
+
+    engine.set_mins_from_pos(5)
+    engine.set_current_position((48.81, 2.3001))
+    assert engine.future_position == pytest.approx((48.86, 2.3), abs=1e-3)
+    engine.set_current_position((48.82, 2.3))
+    assert engine.route_index is index
+
+
 @pytest.mark.asyncio
 async def test_route_engine_uses_injected_retrieve_callable(mock_credentials):
     route_response = {
@@ -143,3 +165,167 @@ def test_route_engine_module_is_headless():
     source = inspect.getsource(RouteEngine)
     assert "ipyleaflet" not in source
     assert "ipywidgets" not in source
+
+
+def _long_route_engine(engine, count=2001):
+    from flexpolyline import decode
+
+    waypoints = [(48.0 + i * 0.0005, 2.3 + 0.001 * (i % 2)) for i in range(count)]  # ~55 m apart, zigzag of ~75 m
+    engine._current_waypoints = waypoints
+    engine._cached_spans = [{"offset": k, "duration": 2.0 * 100, "length": 5560.0} for k in range(100, count, 100)]
+    engine.build_flexpolyline(fp_encode(waypoints), waypoints)
+    return waypoints, decode
+
+
+def test_route_engine_trims_search_polyline_to_the_route_ahead(engine):
+    waypoints, decode = _long_route_engine(engine)
+    full = engine.search_flexpolyline
+
+    engine.set_current_position(waypoints[5])
+    assert engine.search_flexpolyline == full
+
+    engine.set_current_position(waypoints[1250])
+    trimmed = engine.search_flexpolyline
+    points = decode(trimmed)
+    assert len(points) < len(decode(full))
+    # Starts at a bucket boundary behind the span of the position, and runs to the stop.
+    assert waypoints[1000][0] <= points[0][0] <= waypoints[1200][0]
+    assert points[-1] == pytest.approx(waypoints[-1])
+
+    # Same progress bucket: the cached polyline is reused.
+    engine.set_current_position(waypoints[1260])
+    assert engine.search_flexpolyline is trimmed
+
+    # Searching ahead of the vehicle trims further.
+    engine.set_mins_from_pos(10)
+    assert decode(engine.search_flexpolyline)[0][0] > points[0][0]
+
+
+@pytest.mark.asyncio
+async def test_route_engine_encodes_trimmed_polylines_off_the_loop(engine):
+    waypoints, decode = _long_route_engine(engine)
+    full = engine.search_flexpolyline
+
+    engine.set_current_position(waypoints[1250])
+    assert engine.search_flexpolyline == full  # not encoded yet
+    await engine._slice_task
+    assert decode(engine.search_flexpolyline)[0][0] >= waypoints[1000][0]
+
+
+def test_route_engine_time_window_slices_the_search_polyline(engine):
+    waypoints, decode = _long_route_engine(engine)  # 200 s per 100 waypoints (~5.5 km)
+    full = engine.search_flexpolyline
+
+    engine.set_time_window((30, 60))
+    assert engine.ranking_mode.time_window == (30, 60)
+    assert engine.ranking_mode.needs_route_polyline
+    points = decode(engine.search_flexpolyline)
+    # From the route start: 30 to 60 minutes is waypoints 900 to 1800.
+    assert waypoints[800][0] <= points[0][0] <= waypoints[900][0]
+    assert waypoints[1800][0] <= points[-1][0] < waypoints[-1][0]
+    assert len(points) < len(decode(full))
+
+    engine.set_current_position(waypoints[300])  # 10 minutes driven
+    assert decode(engine.search_flexpolyline)[0][0] > points[0][0]
+
+    engine.all_along = True
+    assert engine.time_window == (30, 60)
+    engine.set_time_window(None)
+    assert engine.search_flexpolyline != full  # still trimmed to the route ahead
+    engine.set_current_position(waypoints[0])
+    assert engine.search_flexpolyline == full
+
+
+def test_route_engine_rejects_invalid_time_windows(engine):
+    with pytest.raises(ValueError):
+        engine.set_time_window((60, 30))
+
+
+def test_route_engine_simplifies_search_polyline_within_corridor_width(engine):
+    from flexpolyline import decode
+
+    waypoints = [(48.0 + i * 0.0005, 2.3 + 0.0001 * (i % 2)) for i in range(500)]  # ~7 m zigzag
+    raw = fp_encode(waypoints)
+
+    engine.build_flexpolyline(raw, waypoints)
+    assert decode(engine.route_flexpolyline) == pytest.approx(waypoints)
+    assert len(decode(engine.search_flexpolyline)) == 2
+
+    engine.set_route_width(10)
+    engine.build_flexpolyline(raw, waypoints)
+    assert len(decode(engine.search_flexpolyline)) == len(waypoints)
+
+
+def test_route_engine_splits_the_search_route_into_overlapping_segments(engine):
+    waypoints, decode = _long_route_engine(engine)
+    assert engine.search_segments() is None
+
+    engine.set_segmented_search(4)
+    segments = engine.search_segments()
+    assert [segment.index for segment in segments] == [0, 1, 2, 3]
+    assert segments[0].start_m == 0
+    assert segments[-1].end_m == pytest.approx(float(engine.route_index.coords.cumulative_m[-1]))
+    for before, after in pairwise(segments):
+        assert after.start_m == pytest.approx(before.end_m - engine.segment_overlap_m)
+    assert decode(segments[0].polyline)[0] == pytest.approx(waypoints[0])
+    assert decode(segments[-1].polyline)[-1] == pytest.approx(waypoints[-1])
+    # Cached until the searched slice or the width changes.
+    assert engine.search_segments() is segments
+
+    # Segments cover the route ahead only.
+    engine.set_current_position(waypoints[1250])
+    ahead = engine.search_segments()
+    assert ahead[0].start_m >= 50000
+    assert decode(ahead[0].polyline)[0][0] >= waypoints[900][0]
+
+    # Route progress orders the places along the route.
+    assert ahead.progress_m(*waypoints[1500]) < ahead.progress_m(*waypoints[1800])
+
+    engine.set_segmented_search(0)
+    assert engine.search_segments() is None
+    with pytest.raises(ValueError):
+        engine.set_segmented_search(3, by="stops")
+
+
+@pytest.mark.asyncio
+async def test_route_engine_encodes_segments_off_the_loop(engine, monkeypatch):
+    waypoints, _ = _long_route_engine(engine)
+    encoded = []
+    encode = route_engine_module._encode_search_flexpolylines
+    monkeypatch.setattr(
+        route_engine_module, "_encode_search_flexpolylines", lambda *args: encoded.append(args) or encode(*args)
+    )
+
+    engine.set_segmented_search(4)
+    assert engine.search_segments() is None  # not encoded yet
+    await engine._segments_task
+    whole = engine.search_segments()
+    assert len(whole) == 4
+    assert engine.search_segments() is whole
+    assert len(encoded) == 1
+
+    engine.set_current_position(waypoints[1250])
+    # The segments of the whole route are used until those of the route ahead are ready.
+    assert engine.search_segments() is whole
+    await engine._segments_task
+    assert engine.search_segments()[0].start_m >= 50000
+    assert len(encoded) == 2
+
+
+def test_route_engine_splits_segments_by_travel_time(engine):
+    waypoints, _ = _long_route_engine(engine)
+    # The first half of the route is driven three times slower.
+    engine._cached_spans = [
+        {"offset": k, "duration": 600.0 if k <= 1000 else 200.0, "length": 5560.0} for k in range(100, 2001, 100)
+    ]
+    engine.build_flexpolyline(engine.route_flexpolyline, waypoints)
+
+    engine.set_segmented_search(2, by="distance")
+    by_distance = engine.search_segments()
+    engine.set_segmented_search(2, by="time")
+    by_time = engine.search_segments()
+
+    middle_m = float(engine.route_index.coords.cumulative_m[-1]) / 2
+    assert by_distance[0].end_m - engine.segment_overlap_m / 2 == pytest.approx(middle_m)
+    # Half of the travel time is spent on the first (slow) third of the route.
+    assert by_time[0].end_m - engine.segment_overlap_m / 2 < middle_m * 0.8
@@ -0,0 +1,220 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the NumPy and pure-Python route geometry code paths."""
+
+import math
+import random
+import time
+from itertools import pairwise
+
+import pytest
+
+from here_search_demo.widgets import route_geometry as rg
+
+
+def _route(count):
+    return [(48.0 + 4.0 * i / count, 2.0 + 0.1 * math.sin(i / 100)) for i in range(count)]
+
+
+def _spans(count, parts=10):
+    step = count // parts
+    return [{"offset": min(count - 1, (k + 1) * step), "duration": 600.0, "length": 45_000.0} for k in range(parts)]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(rg, "_numpy", lambda: None)
+    rg._route_coords_cache.clear()
+    yield request.param
+    rg._route_coords_cache.clear()
+
+
+def test_route_coords_is_packed_once_per_route(backend):
+    points = _route(100)
+    coords = rg.route_coords(points)
+    assert rg.route_coords(points) is coords
+    assert rg.route_coords(coords) is coords
+    assert (coords.array is None) == (backend == "python")
+    assert coords.point(-1) == points[-1]
+
+
+def test_cumulative_distance_matches_haversine(backend):
+    points = _route(200)
+    cum = rg.route_coords(points).cumulative_m
+    expected = sum(rg.haversine_m(*a, *b) for a, b in pairwise(points))
+    assert cum[0] == 0.0
+    assert cum[-1] == pytest.approx(expected)
+
+
+def test_elapsed_and_position_ahead(backend):
+    points = _route(1000)
+    spans = _spans(1000)
+    elapsed = rg.elapsed_sec_at_position(spans, points, *points[250])
+    assert elapsed == pytest.approx(1500.0)
+
+    lat, _ = rg.position_at_x_sec_ahead(spans, points, elapsed, 600)
+    assert lat == pytest.approx(points[350][0], abs=0.01)
+    assert rg.position_at_x_sec_ahead(spans, points, elapsed, 10**6) == points[-1]
+
+
+def test_backends_agree():
+    points = _route(5000)
+    spans = _spans(5000)
+    results = {}
+    for name, numpy in (("numpy", rg._numpy), ("python", lambda: None)):
+        original, rg._numpy = rg._numpy, numpy
+        try:
+            coords = rg.RouteCoords(points)
+            results[name] = (
+                coords.bounds(),
+                coords.bbox_scale(),
+                coords.nearest_index(49.0, 2.05),
+                rg.position_at_x_sec_ahead(spans, coords, 1234.0, 321.0),
+                rg.corridor_polygon(coords, 200).area,
+            )
+        finally:
+            rg._numpy = original
+    for left, right in zip(results["numpy"], results["python"]):
+        assert left == pytest.approx(right)
+
+
+def test_simplify_accepts_route_coords(backend):
+    points = _route(3000)
+    simplified = rg.simplify_polyline(rg.route_coords(points), 100)
+    assert 2 <= len(simplified) <= 100
+    assert simplified[0] == pytest.approx(points[0])
+
+
+def test_route_index_matches_linear_functions(backend):
+    points = _route(2000)
+    spans = _spans(2000)
+    index = rg.RouteIndex(spans, points)
+    for i in (0, 1, 199, 200, 201, 777, 1998, 1999):
+        elapsed = rg.elapsed_sec_at_position(spans, points, *points[i])
+        assert index.elapsed_at(*points[i]) == pytest.approx(elapsed, abs=1e-6)
+        for x_sec in (0, 90, 1800, 10**6):
+            expected = rg.position_at_x_sec_ahead(spans, points, elapsed, x_sec)
+            assert index.position_ahead(*points[i], x_sec) == pytest.approx(expected)
+
+
+def test_route_index_projects_between_and_away_from_waypoints(backend):
+    points = [(48.0, 2.0), (48.0, 2.1), (48.1, 2.1)]
+    spans = [{"offset": 1, "duration": 100.0, "length": 7400.0}, {"offset": 2, "duration": 100.0, "length": 11100.0}]
+    index = rg.RouteIndex(spans, points)
+
+    assert index.project(48.001, 2.05) == (0, pytest.approx(0.5))
+    assert index.elapsed_at(48.001, 2.05) == pytest.approx(50.0)
+    # Far off the route, the closest point is still found.
+    assert index.project(60.0, 2.1) == (1, 1.0)
+    assert index.elapsed_at(40.0, -10.0) == 0.0
+
+
+def test_route_index_registers_long_segments_along_their_course(backend):
+    # A dense route followed by one 600 km diagonal segment (a ferry).
+    points = _route(2000)
+    points.append((points[-1][0] + 4.0, points[-1][1] + 6.0))
+    index = rg.RouteIndex(_spans(len(points)), points)
+
+    if backend == "numpy":
+        entries = len(index._cell_segments)
+    else:
+        entries = sum(len(segments) for segments in index._cells.values())
+    # Registering the bounding box cells of the segment took millions of entries.
+    assert entries < 4 * (index._nx + index._ny + len(points))
+
+    rng = random.Random(1)
+    for _ in range(50):
+        lat, lon = 48.0 + rng.uniform(-1, 9), 2.0 + rng.uniform(-1, 7)
+        expected = index._nearest_in(index._all_segments(), *index._local(lat, lon))
+        assert index.locate(lat, lon)[2] == pytest.approx(math.sqrt(expected[0]) * rg._METRES_PER_DEGREE)
+
+
+@pytest.mark.benchmark
+def test_long_route_benchmark():
+    points = _route(100_000)
+    spans = _spans(100_000, parts=500)
+    timings, results = {}, {}
+    for name, numpy in (("numpy", rg._numpy), ("python", lambda: None)):
+        original, rg._numpy = rg._numpy, numpy
+        try:
+            start = time.perf_counter()
+            coords = rg.RouteCoords(points)
+            elapsed = rg.elapsed_sec_at_position(spans, coords, *points[40_000])
+            ahead = rg.position_at_x_sec_ahead(spans, coords, elapsed, 1800)
+            area = rg.corridor_polygon(coords, 100).area
+            timings[name] = time.perf_counter() - start
+            results[name] = (elapsed, *ahead, area)
+        finally:
+            rg._numpy = original
+    assert results["numpy"] == pytest.approx(results["python"])
+    assert timings["numpy"] < timings["python"]
+
+
+@pytest.mark.benchmark
+def test_route_index_position_updates_benchmark():
+    points = _route(100_000)
+    spans = _spans(100_000, parts=500)
+    positions = points[::1000]
+
+    index = rg.RouteIndex(spans, points)
+    built = time.perf_counter()
+    indexed = [index.position_ahead(lat, lon, 600) for lat, lon in positions]
+    queried = time.perf_counter()
+    linear = [
+        rg.position_at_x_sec_ahead(spans, points, rg.elapsed_sec_at_position(spans, points, lat, lon), 600)
+        for lat, lon in positions
+    ]
+    done = time.perf_counter()
+
+    per_query_ms = (queried - built) * 1000 / len(positions)
+    linear_ms = (done - queried) * 1000 / len(positions)
+    for got, expected in zip(indexed, linear):
+        assert got == pytest.approx(expected, abs=1e-3)
+    assert per_query_ms < linear_ms
+
+
+def _winding_route(count, seed=0, turning=0.05):
+    rng = random.Random(seed)
+    lat, lon, heading = 48.0, 2.0, 0.0
+    points = []
+    for _ in range(count):
+        heading += rng.gauss(0, turning)
+        lat += 0.0002 * math.cos(heading)
+        lon += 0.0003 * math.sin(heading)
+        points.append((lat, lon))
+    return points
+
+
+def test_simplify_within_stays_in_tolerance(backend):
+    points = _winding_route(5000)
+    simplified = rg.simplify_polyline_within(points, 25.0)
+
+    assert 2 < len(simplified) < len(points) / 5
+    assert simplified[0] == pytest.approx(points[0])
+    assert simplified[-1] == pytest.approx(points[-1])
+    to_local, _ = rg._local_metric_projectors(48.0, 2.0)
+    from shapely import LineString
+
+    original = LineString([to_local(lon, lat) for lat, lon in points])
+    reduced = LineString([to_local(lon, lat) for lat, lon in simplified])
+    # Measured in a projection centred elsewhere than the simplification one.
+    assert original.hausdorff_distance(reduced) <= 25.0 * 1.01
+    assert rg.simplify_polyline_within(points, 25.0) is simplified
+
+
+def test_width_aware_search_payload_shrinks_polyline():
+    from flexpolyline import encode
+
+    # Below max_waypoints_count, routes used to be sent unsimplified.
+    points = _winding_route(1800, turning=0.01)
+    by_width = encode(rg.simplify_polyline_within(points, 100 * 0.25))
+    raw = encode(points)
+    assert len(by_width) < len(raw) / 10
@@ -0,0 +1,136 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the incremental route-progress tracker."""
+
+import math
+import random
+import time
+from itertools import pairwise
+
+import pytest
+
+from here_search_demo.route_tracker import RouteTracker
+from here_search_demo.widgets.route_geometry import RouteIndex
+
+_M_PER_DEG = 111_195.0
+
+
+def _out_and_back(count, gap_m=20.0):
+    """Route going east then coming back west on a carriageway ``gap_m`` metres north."""
+    lon_step = 0.0005
+    out = [(48.0, 2.0 + i * lon_step) for i in range(count)]
+    back = [(48.0 + gap_m / _M_PER_DEG, 2.0 + i * lon_step) for i in reversed(range(count))]
+    waypoints = out + back
+    spans = [{"offset": len(waypoints) - 1, "duration": len(waypoints) * 3.0, "length": 0}]
+    return waypoints, spans
+
+
+def _trace(waypoints, every=2, noise_m=8.0, seed=0):
+    """GPS fixes recorded along the waypoints, with ``noise_m`` metres of noise."""
+    rng = random.Random(seed)
+    return [
+        (
+            lat + rng.gauss(0, noise_m) / _M_PER_DEG,
+            lon + rng.gauss(0, noise_m) / _M_PER_DEG / math.cos(math.radians(lat)),
+        )
+        for lat, lon in waypoints[::every]
+    ]
+
+
+def test_tracker_follows_the_pass_being_driven():
+    waypoints, spans = _out_and_back(400)
+    index = RouteIndex(spans, waypoints)
+    tracker = RouteTracker(index)
+    fixes = _trace(waypoints)
+
+    progress = [tracker.update(*fix) for fix in fixes]
+
+    assert all(p.on_route for p in progress)
+    elapsed = [p.elapsed_s for p in progress]
+    # Monotonic within the GPS noise, the return leg included.
+    assert all(b > a - 30 for a, b in pairwise(elapsed))
+    assert elapsed[-1] == pytest.approx(index.elapsed_s[-1], abs=30)
+    assert tracker.stats() == {"fixes": len(fixes), "relocations": 0, "off_route": 0}
+
+    # Matched fix by fix against the whole route, the noisy fixes jump between passes.
+    global_elapsed = [index.elapsed_at(*fix) for fix in fixes]
+    assert any(b < a - 600 for a, b in pairwise(global_elapsed))
+
+
+def test_tracker_reports_off_route_fixes_and_keeps_the_last_match():
+    waypoints, spans = _out_and_back(100)
+    tracker = RouteTracker(RouteIndex(spans, waypoints), off_route_m=30)
+    on = tracker.update(*waypoints[10])
+
+    off = tracker.update(48.01, 2.005)
+
+    assert not off.on_route
+    assert off.offset_m > 1000
+    assert (off.segment, off.elapsed_s) == (on.segment, on.elapsed_s)
+    assert tracker.update(*waypoints[11]).segment in (10, 11)
+    assert tracker.stats()["off_route"] == 1
+
+
+def test_tracker_relocates_on_a_jump_along_the_route():
+    waypoints, spans = _out_and_back(400)
+    tracker = RouteTracker(RouteIndex(spans, waypoints), window_m=500)
+    tracker.update(*waypoints[5])
+
+    jumped = tracker.update(*waypoints[300])
+
+    assert jumped.on_route
+    assert jumped.segment in (299, 300)
+    assert tracker.stats()["relocations"] == 1
+
+
+def test_route_engine_tracks_streamed_positions(engine_with_route):
+    engine, waypoints = engine_with_route
+    engine.set_mins_from_pos(1)
+    for fix in waypoints[:50:5]:
+        engine.set_current_position(fix)
+    assert engine.progress.on_route
+    assert engine.progress.segment in (44, 45)
+    assert engine.future_position is not None
+    assert engine.tracker.stats()["fixes"] == 10
+
+
+@pytest.fixture
+def engine_with_route():
+    from unittest.mock import Mock
+
+    from here_search_demo.route_engine import RouteEngine
+
+    waypoints, spans = _out_and_back(200)
+    engine = RouteEngine(credentials=Mock())
+    engine._current_waypoints = waypoints
+    engine._cached_spans = spans
+    return engine, waypoints
+
+
+@pytest.mark.benchmark
+def test_replay_benchmark():
+    waypoints, spans = _out_and_back(50_000)
+    index = RouteIndex(spans, waypoints)
+    fixes = _trace(waypoints, every=10)
+
+    tracker = RouteTracker(index)
+    start = time.perf_counter()
+    for fix in fixes:
+        tracker.update(*fix)
+    tracked_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for fix in fixes[:1000]:
+        index.locate(*fix)
+    global_ms = (time.perf_counter() - start) * 1000 * len(fixes) / 1000
+
+    assert tracker.stats()["off_route"] == 0
+    assert tracker.last.distance_m == pytest.approx(float(index.coords.cumulative_m[-1]), abs=500)
+    assert tracked_ms < global_ms
@@ -0,0 +1,170 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the segmented corridor search."""
+
+import asyncio
+
+import pytest
+
+from here_search_demo.base import OneBoxCore
+from here_search_demo.entity.endpoint import DiscoverConfig, Endpoint
+from here_search_demo.entity.intent import SearchIntent
+from here_search_demo.entity.request import Request, RequestContext
+from here_search_demo.entity.response import Response
+from here_search_demo.event import PartialTextSearchEvent, TextSearchEvent
+from here_search_demo.segmented_search import RouteSegment, RouteSegments, SegmentedSearch
+from here_search_demo.tracing import LatencyTracer
+
+
+def _item(place_id, lat):
+    return {"id": place_id, "title": place_id, "resultType": "place", "position": {"lat": lat, "lng": 2.3}}
+
+
+class _SegmentAPI:
+    """Discover stub answering per segment polyline, recording the requests in flight."""
+
+    lookup_has_more_details = False
+
+    def __init__(self, items_by_polyline, delay=0.01, failing=()):
+        self.items_by_polyline = items_by_polyline
+        self.delay = delay
+        self.failing = failing
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.polylines = []
+
+    async def discover(self, *, polyline, **kwargs):
+        self.polylines.append(polyline)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if polyline in self.failing:
+            raise ConnectionError(polyline)
+        return Response(
+            req=Request(endpoint=Endpoint.DISCOVER, params={"route": polyline}),
+            data={"items": self.items_by_polyline[polyline]},
+        )
+
+
+def _segments(count):
+    # Progress along the route is the latitude.
+    return RouteSegments(
+        [RouteSegment(i, f"seg{i}", i * 1000.0, (i + 1) * 1000.0) for i in range(count)], lambda lat, lon: lat
+    )
+
+
+def _event(segments):
+    context = RequestContext(latitude=48.0, longitude=2.3, polyline="full", width=100, route_segments=segments)
+    return TextSearchEvent(context=context, query_text="fuel")
+
+
+async def test_segments_are_searched_concurrently_within_the_bound():
+    api = _SegmentAPI({f"seg{i}": [_item(f"p{i}", 48.0 + i)] for i in range(6)})
+    search = SegmentedSearch(max_concurrency=2)
+
+    resp = await search.get_response(_event(_segments(6)), api, DiscoverConfig(limit=20), session=None)
+
+    assert sorted(api.polylines) == [f"seg{i}" for i in range(6)]
+    assert api.max_in_flight == 2
+    assert [item["id"] for item in resp.data["items"]] == [f"p{i}" for i in range(6)]
+    assert [m.index for m in search.last_metrics] == list(range(6))
+    assert all(m.items == 1 and m.error is None and m.elapsed_ms > 0 for m in search.last_metrics)
+
+
+async def test_merge_deduplicates_and_orders_by_route_progress():
+    api = _SegmentAPI(
+        {
+            # Overlapping segments both return "b"; the server ranking is not the route order.
+            "seg0": [_item("b", 48.5), _item("a", 48.1), {"id": "nowhere", "title": "x"}],
+            "seg1": [_item("c", 48.9), _item("b", 48.5)],
+        }
+    )
+    resp = await SegmentedSearch().get_response(_event(_segments(2)), api, DiscoverConfig(limit=20), session=None)
+
+    assert [item["id"] for item in resp.data["items"]] == ["a", "b", "c", "nowhere"]
+    assert resp.req.params == {"route": "seg0"}
+
+
+async def test_merge_keeps_the_best_ranked_items_of_every_segment():
+    # Each segment returns 10 items, ranked by the server from the end of the segment.
+    api = _SegmentAPI({f"seg{i}": [_item(f"p{i}-{k}", 48.0 + i + (9 - k) / 10) for k in range(10)] for i in range(3)})
+    search = SegmentedSearch(max_items=6)
+
+    resp = await search.get_response(_event(_segments(3)), api, DiscoverConfig(limit=10), session=None)
+
+    # Not the six items closest to the route start: the two best of each segment.
+    assert [item["id"] for item in resp.data["items"]] == ["p0-1", "p0-0", "p1-1", "p1-0", "p2-1", "p2-0"]
+
+
+def test_oneboxmap_limits_segmented_results_to_the_displayed_rows():
+    from here_search_demo.widgets.app import OneBoxMap
+    from here_search_demo.widgets.output_json import SearchResultList
+
+    assert OneBoxMap(map_only=True, on_map=True).segmented_search.max_items == OneBoxMap.default_results_limit
+    app = OneBoxMap(map_only=True, on_map=True, recommendations=True)
+    assert app.segmented_search.max_items == SearchResultList.default_max_results_count
+
+
+async def test_failed_segments_are_tolerated_unless_all_fail():
+    api = _SegmentAPI({"seg0": [_item("a", 48.1)], "seg1": [_item("b", 48.6)]}, failing={"seg1"})
+    search = SegmentedSearch()
+
+    resp = await search.get_response(_event(_segments(2)), api, DiscoverConfig(limit=20), session=None)
+
+    assert [item["id"] for item in resp.data["items"]] == ["a"]
+    assert search.stats()["errors"] == 1
+    assert "ConnectionError" in search.last_metrics[1].error
+
+    api.failing = {"seg0", "seg1"}
+    with pytest.raises(RuntimeError, match="all 2 segment requests failed"):
+        await search.get_response(_event(_segments(2)), api, DiscoverConfig(limit=20), session=None)
+
+
+async def test_segment_programming_errors_are_not_swallowed():
+    class _BrokenAPI(_SegmentAPI):
+        async def discover(self, *, polyline, **kwargs):
+            if polyline == "seg1":
+                raise TypeError("a bug, not a failed request")
+            return await super().discover(polyline=polyline, **kwargs)
+
+    api = _BrokenAPI({"seg0": [_item("a", 48.1)], "seg1": [_item("b", 48.6)]})
+
+    with pytest.raises(TypeError):
+        await SegmentedSearch().get_response(_event(_segments(2)), api, DiscoverConfig(limit=20), session=None)
+
+
+def test_supports_only_multi_segment_discover_and_browse():
+    search = SegmentedSearch()
+    assert search.supports(_event(_segments(3)))
+    assert not search.supports(_event(_segments(1)))
+    assert not search.supports(_event(None))
+    context = RequestContext(latitude=48.0, longitude=2.3, route_segments=_segments(3))
+    assert not search.supports(PartialTextSearchEvent(context=context, query_text="fu"))
+
+
+async def test_onebox_core_routes_segmented_events_and_traces_segments():
+    api = _SegmentAPI({f"seg{i}": [_item(f"p{i}", 48.0 + i)] for i in range(3)})
+    tracer = LatencyTracer()
+    core = OneBoxCore(api=api, tracer=tracer, segmented_search=SegmentedSearch(max_concurrency=3))
+    core._get_context = lambda: RequestContext(
+        latitude=48.0, longitude=2.3, polyline="full", width=100, route_segments=_segments(3)
+    )
+    core.handle_result_list = lambda intent, resp: None
+    core.queue.put_nowait(SearchIntent(kind="submitted_text", materialization="fuel", time=0.0))
+
+    _, _, resp = await core.handle_search_event(session=None)
+
+    assert len(resp.data["items"]) == 3
+    assert api.max_in_flight == 3
+    (trace,) = tracer.completed()
+    assert {f"segment {i}" for i in range(3)} <= set(trace.durations_ms())
@@ -0,0 +1,133 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from here_search_demo.base import OneBoxCore
+from here_search_demo.entity.intent import SearchIntent
+from here_search_demo.tracing import LatencyTracer, LoopLagMonitor, current_trace, trace_stage
+
+
+def _intent(value="re", time=1_000_000):
+    return SearchIntent(kind="transient_text", materialization=value, time=time)
+
+
+def test_trace_stage_is_noop_without_active_trace():
+    with trace_stage("vicinity"):
+        pass
+    assert current_trace() is None
+
+
+def test_tracer_records_explicit_and_contextual_stages():
+    tracer = LatencyTracer()
+    intent = _intent()
+    tracer.record(intent, "debounce", 0, intent.time)
+    tracer.activate(intent)
+    with trace_stage("render"):
+        pass
+    tracer.finish(intent)
+
+    trace = tracer.trace_for(intent)
+    assert [span.name for span in trace.spans] == ["debounce", "render"]
+    assert trace.origin_ns == 0
+    assert trace.done_ns is not None
+    assert current_trace() is None
+
+
+def test_tracer_finish_unpainted_drops_trace():
+    tracer = LatencyTracer()
+    intent = _intent()
+    tracer.activate(intent)
+    tracer.finish(intent, painted=False)
+    assert tracer.traces == {}
+
+
+def test_tracer_keeps_only_max_traces():
+    tracer = LatencyTracer(max_traces=2)
+    for t in range(3):
+        tracer.trace_for(_intent(time=t + 1))
+    assert [key[1] for key in tracer.traces] == [2, 3]
+
+
+def test_tracer_aggregates_export_and_waterfall():
+    tracer = LatencyTracer()
+    for i, network_ms in enumerate((10, 20, 30)):
+        intent = _intent(time=i * 100_000_000)
+        tracer.record(intent, "network", intent.time, intent.time + network_ms * 1_000_000)
+        tracer.trace_for(intent).done_ns = intent.time + (network_ms + 5) * 1_000_000
+
+    aggregates = tracer.aggregates()
+    assert list(aggregates) == ["network", "total"]
+    assert aggregates["network"]["count"] == 3
+    assert aggregates["network"]["mean_ms"] == pytest.approx(20)
+    assert aggregates["network"]["p50_ms"] == pytest.approx(20)
+    assert aggregates["network"]["max_ms"] == pytest.approx(30)
+    assert aggregates["total"]["p95_ms"] == pytest.approx(35)
+
+    rows = tracer.export()
+    assert len(rows) == 3
+    assert rows[0]["stage"] == "network" and rows[0]["duration_ms"] == pytest.approx(10)
+
+    waterfall = tracer.waterfall(last=1, width=10)
+    assert waterfall.splitlines()[0] == "transient_text 're': 35.0 ms"
+    assert "network" in waterfall.splitlines()[1]
+
+
+@pytest.mark.asyncio
+async def test_onebox_core_traces_queue_triage_and_paint():
+    tracer = LatencyTracer()
+    app = OneBoxCore(api=Mock(lookup_has_more_details=False), tracer=tracer)
+    intent = _intent(time=0)
+    app.queue.put_nowait(intent)
+
+    painted = []
+
+    def handler(intent_, resp):
+        with trace_stage("render"):
+            painted.append(resp)
+
+    app.handle_suggestion_list = handler
+    event_resp = Mock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("here_search_demo.event.PartialTextSearchEvent.get_response", AsyncMock(return_value=event_resp))
+        await app.handle_search_event(session=Mock())
+    await asyncio.sleep(0)
+
+    trace = tracer.trace_for(intent)
+    names = [span.name for span in trace.spans]
+    assert names[:2] == ["queue", "triage"]
+    assert "paint" in names and "render" in names
+    assert painted == [event_resp]
+    assert trace.done_ns is not None
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_measures_blocking_work(monkeypatch):
+    # The monitor reads a fake clock that only advances while the loop is blocked,
+    # so the samples do not depend on how busy the test machine is.
+    clock = [0.0]
+    monkeypatch.setattr("here_search_demo.tracing.perf_counter", lambda: clock[0])
+    monitor = LoopLagMonitor(interval_s=0.005).start()
+    await asyncio.sleep(0.02)
+    clock[0] += 0.05
+    time.sleep(0.01)  # noqa: ASYNC251 -- blocking the event loop is the behaviour under test
+    await asyncio.sleep(0.02)
+    monitor.stop()
+
+    # Exactly one sample spans the blocking call, and it holds its lag.
+    assert [lag for lag in monitor.samples_ms if lag > 0] == [pytest.approx(45)]
+    stats = monitor.stats()
+    assert stats["count"] >= 2
+    assert stats["p50_ms"] <= stats["max_ms"] == pytest.approx(45)
+    monitor.clear()
+    assert monitor.stats()["count"] == 0
@@ -7,16 +7,19 @@
 #
 ###############################################################################
 
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import MagicMock, patch
 
 from ipywidgets import Label
 
 from here_search_demo.auth import Credentials
+from here_search_demo.detour import StraightLineRouter
 from here_search_demo.entity.endpoint import Endpoint
 from here_search_demo.entity.intent import SearchIntent
 from here_search_demo.entity.request import Request
 from here_search_demo.entity.response import Response
 from here_search_demo.widgets.app import OneBoxMap
+from here_search_demo.widgets.output_json import SearchResultList
 
 
 def _widget_controls(app: OneBoxMap) -> list:
@@ -67,6 +70,18 @@ def test_oneboxmap_status_label_includes_api_counters():
     assert "api: 0/1" in app.search_center_label_w.value
 
 
+def test_oneboxmap_debounce_ignores_cached_autosuggest_round_trips():
+    app = OneBoxMap(map_only=True, on_map=True)
+    debounce = app.query_box_w.debounce
+    intent = SearchIntent(kind="transient_text", materialization="caf", time=0.0)
+    req = Request(endpoint=Endpoint.AUTOSUGGEST, params={})
+
+    app._on_search_round_trip(intent, Response(req=req, data={"items": []}), 200_000_000)
+    app._on_search_round_trip(intent, Response(req=req, data={"items": []}, cached=True), 1_000)
+
+    assert debounce.rtt_ewma == 0.2
+
+
 def test_oneboxmap_get_context_uses_route_state():
     app = OneBoxMap(map_only=True, on_map=True)
     route = app.map_w.route
@@ -120,6 +135,32 @@ def test_oneboxmap_handle_result_list_without_detour_displays_directly():
     assert app._rerank_task is None
 
 
+async def test_oneboxmap_recommendations_cluster_the_whole_response():
+    app = OneBoxMap(map_only=True, on_map=True, recommendations=True)
+    app.map_w.zoom = 8
+    count = app.recommendations_backend_limit
+    items = [
+        {
+            "id": str(i),
+            "title": f"Place {i}",
+            "resultType": "place",
+            "position": {"lat": 52.3 + (i % 10) * 0.04, "lng": 13.1 + (i // 10) * 0.06},
+        }
+        for i in range(count)
+    ]
+    intent = SearchIntent(kind="submitted_text", materialization="coffee", time=0.0)
+    resp = Response(req=Request(endpoint=Endpoint.DISCOVER, params={}), data={"items": items})
+
+    app.handle_result_list(intent, resp)
+
+    features = app.map_w.collection.data["features"]
+    assert app.map_w._clusters is not None
+    assert any(f["properties"].get("cluster") for f in features)
+    assert sum(f["properties"].get("point_count", 1) for f in features) == count
+    assert len(app.state.items_by_rank) == SearchResultList.default_max_results_count
+    app.map_w._fit_task.cancel()
+
+
 def test_oneboxmap_remove_route_clears_results():
     app = OneBoxMap(map_only=True, on_map=True)
     app.map_w.clear_results = MagicMock()
@@ -237,3 +278,138 @@ async def test_oneboxmap_search_box_hidden_when_token_retrieval_fails():
     await app._update_search_box_visibility()
 
     assert app.search_box.layout.display == "none"
+
+
+async def test_oneboxmap_paints_detour_results_progressively_and_cancels_superseded_reranks():
+    gates = {(48.85, 2.35): asyncio.Event(), (48.86, 2.36): asyncio.Event()}
+    cancelled = []
+
+    class GatedRouter(StraightLineRouter):
+        async def route(self, session, waypoints):
+            if len(waypoints) == 3:
+                try:
+                    await gates[waypoints[1]].wait()
+                except asyncio.CancelledError:
+                    cancelled.append(waypoints[1])
+                    raise
+            return await super().route(session, waypoints)
+
+    app = OneBoxMap(map_only=True, on_map=True, routing_backend=GatedRouter())
+    app.detour_repaint_interval_s = 0
+    route = app.map_w.route
+    route.minimal_detour = True
+    route.start_position = (48.8, 2.3)
+    route.stop_position = (48.9, 2.4)
+    route.current_position = (48.8, 2.3)
+    route.route_summary_length = 1000
+
+    painted = []
+    app._display_result_list = lambda _intent, resp, fit=True, clear_query=True: painted.append(
+        [item["title"] + ("*" if "_detour" in item else "") for item in resp.data["items"]]
+    )
+    items = [
+        {"title": "A", "position": {"lat": 48.85, "lng": 2.35}},
+        {"title": "B", "position": {"lat": 48.86, "lng": 2.36}},
+    ]
+    intent = SearchIntent(kind="submitted_text", materialization="coffee", time=0.0)
+    resp = Response(req=Request(endpoint=Endpoint.DISCOVER, params={}), data={"items": items})
+
+    with patch("here_search_demo.detour.HTTPSession"):
+        app.handle_result_list(intent, resp)
+        first = app._rerank_task
+        await asyncio.sleep(0.01)
+        # The original list is painted without waiting for any route.
+        assert painted == [["A", "B"]]
+
+        gates[(48.86, 2.36)].set()
+        await asyncio.sleep(0.01)
+        assert painted[-1] == ["B*", "A"]
+
+        # New results supersede the rerank and cancel its pending routes.
+        app.handle_result_list(intent, Response(req=resp.req, data={"items": []}))
+        await asyncio.wait([first])
+
+    assert first.cancelled()
+    assert cancelled == [(48.85, 2.35)]
+
+
+async def test_oneboxmap_detour_rerank_routes_only_the_displayed_rows():
+    app = OneBoxMap(map_only=True, on_map=True, routing_backend=StraightLineRouter())
+    route = app.map_w.route
+    route.minimal_detour = True
+    route.start_position = route.current_position = (48.8, 2.3)
+    route.stop_position = (48.9, 2.3)
+    route.route_summary_length = 11_000
+    route.engine._current_waypoints = [(48.8 + i * 0.001, 2.3) for i in range(101)]
+    route.engine._cached_spans = [{"offset": 100, "duration": 440.0, "length": 11_000}]
+    route.has_route = True
+
+    painted = []
+    app._display_result_list = lambda _intent, resp, fit=True, clear_query=True: painted.append(resp)
+    rows = app.result_buttons_w._max
+    # Increasingly far off the route.
+    items = [
+        {"id": str(i), "title": str(i), "position": {"lat": 48.85, "lng": 2.3 + 0.001 * i}} for i in range(rows + 10)
+    ]
+    intent = SearchIntent(kind="submitted_text", materialization="coffee", time=0.0)
+    resp = Response(req=Request(endpoint=Endpoint.DISCOVER, params={}), data={"items": items})
+
+    with patch("here_search_demo.detour.HTTPSession"):
+        app.handle_result_list(intent, resp)
+        await app._rerank_task
+
+    final = painted[-1].data["items"]
+    assert [item["id"] for item in final] == [str(i) for i in range(rows)]
+    # The direct route, then one route per displayed row.
+    assert app.routing_api_calls == rows + 1
+
+
+async def test_oneboxmap_repaints_skipped_detour_updates_without_pruned_results():
+    gates = {(48.85, 2.301): asyncio.Event(), (48.86, 2.302): asyncio.Event()}
+
+    class GatedRouter(StraightLineRouter):
+        async def route(self, session, waypoints):
+            if len(waypoints) == 3:
+                await gates[waypoints[1]].wait()
+            return await super().route(session, waypoints)
+
+    app = OneBoxMap(map_only=True, on_map=True, routing_backend=GatedRouter())
+    app.detour_top_k = 2
+    app.detour_repaint_interval_s = 0.05
+    route = app.map_w.route
+    route.minimal_detour = True
+    route.start_position = route.current_position = (48.8, 2.3)
+    route.stop_position = (48.9, 2.3)
+    route.route_summary_length = 11_000
+    route.engine._current_waypoints = [(48.8 + i * 0.001, 2.3) for i in range(101)]
+    route.engine._cached_spans = [{"offset": 100, "duration": 440.0, "length": 11_000}]
+    route.has_route = True
+
+    painted = []
+    app._display_result_list = lambda _intent, resp, fit=True, clear_query=True: painted.append(
+        [item["title"] + ("*" if "_detour" in item else "") for item in resp.data["items"]]
+    )
+    items = [
+        {"title": "A", "position": {"lat": 48.85, "lng": 2.301}},
+        {"title": "B", "position": {"lat": 48.86, "lng": 2.302}},
+        {"title": "far", "position": {"lat": 48.85, "lng": 2.6}},
+        {"title": "nowhere"},
+    ]
+    intent = SearchIntent(kind="submitted_text", materialization="coffee", time=0.0)
+    resp = Response(req=Request(endpoint=Endpoint.DISCOVER, params={}), data={"items": items})
+
+    with patch("here_search_demo.detour.HTTPSession"):
+        app.handle_result_list(intent, resp)
+        await asyncio.sleep(0.01)
+        gates[(48.86, 2.302)].set()
+        await asyncio.sleep(0.01)
+        # B arrived within the repaint interval of the first paint.
+        assert painted == [["A", "B", "far", "nowhere"]]
+
+        await asyncio.sleep(0.1)
+        # Repainted once the interval elapsed, without the pruned result.
+        assert painted[-1] == ["B*", "A"]
+
+        gates[(48.85, 2.301)].set()
+        await app._rerank_task
+    assert sorted(painted[-1]) == ["A*", "B*"]
@@ -7,8 +7,9 @@
 #
 ###############################################################################
 
-"""Test button pool pre-allocation and async replenishment."""
+"""Test button pool lazy initialization, warming and async replenishment."""
 
+import asyncio
 from unittest.mock import MagicMock
 
 import pytest
@@ -52,8 +53,8 @@ async def test_replenish_pool_async():
     buttons_widget = SearchResultButtons()
     initial_count = len(buttons_widget.buttons)
 
-    # Verify pool was pre-allocated
-    assert initial_count == 200
+    # Only the first result list is created eagerly
+    assert initial_count == SearchResultButtons.default_max_results_count
 
     # Test replenishment
     await buttons_widget._replenish_pool_async(chunk_size=30)
@@ -117,25 +118,69 @@ async def test_ensure_buttons_fallback_on_exhaustion():
 
 
 def test_pool_eliminates_per_search_cost():
-    """Validate that pool pre-allocation strategy eliminates per-search button creation cost.
+    """Validate that the eagerly created buttons cover a full result list.
 
-    Cost-benefit:
-    - One-time: ~1.3s at startup (200 buttons × ~6.5ms each)
-    - Per search: 0ms (buttons already allocated)
-
-    Break-even: After ~500 searches (1300ms / 2.7ms per search)
+    Searches never pay the button creation cost, even before warm_pool() ran.
     """
     buttons_widget = SearchResultButtons()
+    initial_count = len(buttons_widget.buttons)
 
-    # Pool is initialized
-    assert len(buttons_widget.buttons) == 200
-
-    # Multiple _ensure_buttons calls don't create
+    # Multiple _ensure_buttons calls up to the max results count don't create
     for _ in range(100):
-        buttons_widget._ensure_buttons(5)
+        buttons_widget._ensure_buttons(SearchResultButtons.default_max_results_count - 1)
 
     # Pool remains unchanged (no per-search cost)
-    assert len(buttons_widget.buttons) == 200
+    assert len(buttons_widget.buttons) == initial_count
+
+
+def test_warm_pool_without_running_loop_is_noop():
+    buttons_widget = SearchResultButtons()
+    buttons_widget.warm_pool()
+    assert buttons_widget._replenish_task is None
+    assert len(buttons_widget.buttons) == SearchResultButtons.default_max_results_count
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_reaches_target_size_and_reports_timings():
+    class MeteredButtons(SearchResultButtons):
+        def __init__(self, *args, **kwargs):
+            self.initialized = []
+            self.replenished = []
+            super().__init__(*args, **kwargs)
+
+        def _on_pool_initialized(self, elapsed_ns, pool_size):
+            self.initialized.append(pool_size)
+
+        def _on_pool_replenished(self, elapsed_ns, chunk_size):
+            self.replenished.append(chunk_size)
+
+    buttons_widget = MeteredButtons(max_results_number=5)
+    assert buttons_widget.initialized == [5]
+
+    buttons_widget.warm_pool()
+    task = buttons_widget._replenish_task
+    buttons_widget.warm_pool()  # already warming: no second task
+    assert buttons_widget._replenish_task is task
+    await task
+
+    assert len(buttons_widget.buttons) == SearchResultButtons.default_button_pool_size
+    assert sum(buttons_widget.replenished) == SearchResultButtons.default_button_pool_size - 5
+    assert max(buttons_widget.replenished) <= SearchResultButtons.default_button_pool_chunk_size
+
+
+@pytest.mark.asyncio
+async def test_concurrent_replenish_stops_at_target_size():
+    buttons_widget = SearchResultButtons()
+    buttons_widget.buttons = buttons_widget.buttons[:15]
+    buttons_widget._check_and_trigger_replenish()
+    replenish_task = buttons_widget._replenish_task
+
+    # A warm-up starting while the replenishment runs must not overshoot the pool size.
+    await asyncio.gather(replenish_task, buttons_widget._warm_pool_async())
+
+    assert len(buttons_widget.buttons) == SearchResultButtons.default_button_pool_size
+    await buttons_widget._replenish_pool_async()
+    assert len(buttons_widget.buttons) == SearchResultButtons.default_button_pool_size
 
 
 if __name__ == "__main__":
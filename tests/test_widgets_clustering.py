@@ -0,0 +1,162 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the result ClusterIndex and clustered ResponseMap display."""
+
+import random
+
+from here_search_demo.auth import Credentials
+from here_search_demo.entity.endpoint import Endpoint
+from here_search_demo.entity.request import Request
+from here_search_demo.entity.response import Response
+from here_search_demo.widgets import output_helpers as fr
+from here_search_demo.widgets.clustering import ClusterIndex
+from here_search_demo.widgets.output_map import ResponseMap
+
+
+def _feature(index, lat, lng):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lng, lat]},
+        "properties": {"id": str(index), "title": f"Place {index}", "_rank": index},
+    }
+
+
+def _random_features(count, seed=0):
+    rng = random.Random(seed)
+    return [_feature(i, 52.3 + rng.random() * 0.4, 13.1 + rng.random() * 0.6) for i in range(count)]
+
+
+def _point_count(feature):
+    return feature["properties"].get("point_count", 1)
+
+
+def test_every_level_accounts_for_all_points():
+    features = _random_features(500)
+    index = ClusterIndex(features)
+    for zoom in range(18):
+        assert sum(_point_count(f) for f in index.clusters(None, zoom)) == 500
+
+
+def test_low_zoom_clusters_and_high_zoom_points():
+    features = _random_features(300)
+    index = ClusterIndex(features, max_zoom=16)
+
+    (world,) = index.clusters(None, 2)
+    assert world["properties"]["cluster"] is True
+    assert world["properties"]["point_count"] == 300
+    assert index.clusters(None, 17) == features
+
+
+def test_distant_points_are_not_clustered():
+    features = [_feature(0, 52.5, 13.4), _feature(1, 48.85, 2.35)]
+    index = ClusterIndex(features)
+    assert index.clusters(None, 5) == features
+    assert len(index.clusters(None, 1)) == 1
+
+
+def test_clusters_are_restricted_to_the_viewport():
+    features = [_feature(0, 52.5, 13.4), _feature(1, 48.85, 2.35), _feature(2, 40.71, -74.0)]
+    index = ClusterIndex(features)
+    assert index.clusters(((50.0, 10.0), (55.0, 15.0)), 10) == [features[0]]
+    # Viewport crossing the antimeridian.
+    assert index.clusters(((30.0, 170.0), (60.0, 5.0)), 10) == [features[1], features[2]]
+
+
+def test_leaves_and_expansion_zoom():
+    features = [_feature(0, 52.5, 13.4), _feature(1, 52.5001, 13.4001), _feature(2, 48.85, 2.35)]
+    index = ClusterIndex(features)
+    cluster = next(f for f in index.clusters(None, 10) if f["properties"].get("cluster"))
+    cluster_id = cluster["properties"]["cluster_id"]
+
+    assert index.leaves(cluster_id) == features[:2]
+    zoom = index.expansion_zoom(cluster_id)
+    assert all(not f["properties"].get("cluster") for f in index.clusters(None, zoom))
+    assert any(f["properties"].get("cluster") for f in index.clusters(None, zoom - 1))
+
+
+def test_style_callback_sizes_clusters():
+    cluster = {"properties": {"cluster": True, "point_count": 64}}
+    style = fr.style_callback(cluster)
+    assert style["radius"] > ResponseMap.default_point_style["radius"]
+
+
+def _dense_response(count):
+    rng = random.Random(1)
+    items = [
+        {
+            "id": str(i),
+            "title": f"Place {i}",
+            "resultType": "place",
+            "position": {"lat": 52.3 + rng.random() * 0.4, "lng": 13.1 + rng.random() * 0.6},
+        }
+        for i in range(count)
+    ]
+    return Response(req=Request(endpoint=Endpoint.DISCOVER), data={"items": items}, x_headers={})
+
+
+def _response_map():
+    return ResponseMap(credentials=Credentials(), center=(52.5, 13.4))
+
+
+def _move(fmap, south, west, north, east):
+    # As synced by the frontend after a pan or zoom.
+    fmap.set_state({"south": south, "west": west, "north": north, "east": east})
+
+
+def test_response_map_clusters_dense_responses():
+    fmap = _response_map()
+    fmap.zoom = 8
+    fmap.display(_dense_response(ResponseMap.cluster_min_results))
+
+    features = fmap.collection.data["features"]
+    assert all(f["properties"].get("cluster") for f in features)
+    assert sum(_point_count(f) for f in features) == ResponseMap.cluster_min_results
+    assert fmap._labels == []
+
+    fmap.zoom = 17
+    features = fmap.collection.data["features"]
+    assert len(features) == ResponseMap.cluster_min_results
+    assert not any(f["properties"].get("cluster") for f in features)
+
+
+def test_response_map_recomputes_clusters_outside_the_painted_area():
+    fmap = _response_map()
+    fmap.zoom = 17
+    _move(fmap, 52.49, 13.39, 52.50, 13.40)
+    fmap.display(_dense_response(ResponseMap.cluster_min_results))
+    painted = fmap.collection.data["features"]
+    assert len(painted) < ResponseMap.cluster_min_results
+
+    # A small pan stays within the margin painted around the viewport.
+    _move(fmap, 52.491, 13.391, 52.501, 13.401)
+    assert fmap.collection.data["features"] is painted
+
+    _move(fmap, 52.59, 13.59, 52.60, 13.60)
+    assert fmap.collection.data["features"] is not painted
+
+
+def test_response_map_does_not_cluster_small_responses():
+    fmap = _response_map()
+    fmap.zoom = 2
+    fmap.display(_dense_response(10))
+    assert len(fmap.collection.data["features"]) == 10
+    assert fmap._clusters is None
+
+
+def test_cluster_click_zooms_in_until_it_splits():
+    fmap = _response_map()
+    fmap.zoom = 8
+    fmap.display(_dense_response(ResponseMap.cluster_min_results))
+    cluster = fmap.collection.data["features"][0]
+
+    fmap._on_feature_click(None, cluster)
+
+    assert fmap.zoom == fmap._clusters.expansion_zoom(cluster["properties"]["cluster_id"])
+    assert tuple(fmap.center) == (cluster["properties"]["position"]["lat"], cluster["properties"]["position"]["lng"])
@@ -7,11 +7,12 @@
 #
 ###############################################################################
 
+import copy
+
 import pytest
 
 from here_search_demo.widgets import output_helpers as fr
 
-
 # ---------------------------------------------------------------------------
 # fuel_price_text
 # ---------------------------------------------------------------------------
@@ -268,6 +269,101 @@ def test_item_color_uses_ev_availability():
     assert fr.item_color(feature) == "green"
 
 
+# ---------------------------------------------------------------------------
+# item_features
+# ---------------------------------------------------------------------------
+
+
+def _ev_station(available):
+    return {
+        "title": "Charger",
+        "categories": [{"primary": True, "id": "700-7600-0322", "name": "EV Charging Station"}],
+        "openingHours": [{"categories": [{"id": "700-7600-0322"}], "isOpen": True, "text": ["Mo-Su: 00:00 - 24:00"]}],
+        "extended": {
+            "evStation": {
+                "connectors": [
+                    {
+                        "connectorType": {"name": "IEC 62196-2 Type 2 (Socket)"},
+                        "maxPowerLevel": 22.0,
+                        "chargingPoint": {"numberOfAvailable": available, "numberOfConnectors": 2},
+                    }
+                ]
+            }
+        },
+    }
+
+
+def test_derive_item_features_walks_the_item_once():
+    features = fr.derive_item_features(_ev_station(available=1))
+
+    assert features.category_id == "700-7600-0322"
+    assert features.category_name == "EV Charging Station"
+    assert features.is_open is True
+    assert features.opening_text == ("Mo-Su: 00:00 - 24:00",)
+    assert features.color == "green"
+    assert features.ev_lines == ("IEC 62196-2 Type 2 / 22kW [1/2]",)
+    assert features.fuel_lines == ()
+    assert features.ta_rating is None
+
+
+def test_derive_item_features_color_reflects_ev_availability():
+    features = fr.derive_item_features(_ev_station(available=0))
+    assert features.is_open is True
+    assert features.color == "red"
+
+
+def test_derive_item_features_fuel_station():
+    item = {
+        "title": "Fuel",
+        "categories": [{"primary": True, "id": "700-7600-0116"}],
+        "extended": {
+            "fuelStation": {
+                "fuelTypes": [
+                    {"type": "Diesel", "price": {"amount": 1.679, "currency": "EUR"}},
+                    {"type": "Super"},
+                ]
+            }
+        },
+    }
+    features = fr.derive_item_features(item)
+    assert features.fuel_lines == ("Diesel - 1.679 EUR", "Super")
+    assert features.diesel_text == "1.679 EUR"
+
+
+def test_item_features_are_derived_once_per_cached_item(monkeypatch):
+    calls = []
+    derive = fr.derive_item_features
+    monkeypatch.setattr(fr, "derive_item_features", lambda item: calls.append(item) or derive(item))
+    item = {"id": "ev", **_ev_station(available=1)}
+    feature = {"properties": item}
+    cache = {}
+
+    fr.style_callback(feature, cache)
+    fr.gas_station_label_parts(item, cache)
+    fr.ta_label_html(item, cache)
+    assert calls == [item]
+
+    # Without cache, or without id, the item is derived on every call.
+    fr.item_color(feature)
+    fr.item_color({"properties": _ev_station(available=1)}, cache)
+    assert len(calls) == 3
+
+
+def test_item_features_cache_applies_to_feature_copies_and_stays_off_the_item(monkeypatch):
+    item = {"id": "ev", **_ev_station(available=1)}
+    cache = {}
+    features = fr.item_features(item, cache)
+    calls = []
+    monkeypatch.setattr(fr, "derive_item_features", lambda item: calls.append(item))
+
+    # ipyleaflet deep-copies the features before calling style_callback.
+    copied = copy.deepcopy({"properties": item})
+    assert fr.style_callback(copied, cache) == {"fillColor": features.color}
+    assert fr.item_features(copied["properties"], cache) == features
+    assert calls == []
+    assert item == {"id": "ev", **_ev_station(available=1)}
+
+
 # ---------------------------------------------------------------------------
 # style_callback
 # ---------------------------------------------------------------------------
@@ -276,7 +372,7 @@ def test_item_color_uses_ev_availability():
 def test_style_callback_delegates_to_item_color(monkeypatch):
     called = {}
 
-    def fake_item_color(feature):
+    def fake_item_color(feature, cache=None):
         called["feature"] = feature
         return "purple"
 
@@ -17,6 +17,7 @@ from here_search_demo.auth import Credentials
 from here_search_demo.entity.intent import SearchIntent
 from here_search_demo.entity.place import PlaceTaxonomy, PlaceTaxonomyItem
 from here_search_demo.widgets.input_text import (
+    AdaptiveDebounce,
     PlaceTaxonomyButton,
     PlaceTaxonomyButtons,
     SubmittableText,
@@ -347,6 +348,70 @@ async def test_adjust_debounce_delay_decreases_when_no_backlog():
         box._debounce_task.cancel()
 
 
+def _debounce(**kwargs):
+    return AdaptiveDebounce(delay=0.1, min_delay=0.05, max_delay=0.4, backlog_threshold=3, **kwargs)
+
+
+def test_adaptive_debounce_cadence_suppresses_mid_burst_requests():
+    """Fast backend: the delay follows typing cadence so a burst yields one request."""
+    controller = _debounce(freshness_target=0.5)
+    for i in range(5):
+        controller.observe_keystroke(i * 0.15)
+    controller.observe_rtt(0.1)
+
+    delay = controller.decide(queue_depth=0)
+
+    assert delay == pytest.approx(0.15 * AdaptiveDebounce.default_cadence_factor)
+    assert controller.last_reason == "cadence"
+
+
+def test_adaptive_debounce_freshness_caps_delay():
+    """Slow typist: the delay is capped so delay + RTT stays within the freshness target."""
+    controller = _debounce(freshness_target=0.5)
+    controller.observe_keystroke(0.0)
+    controller.observe_keystroke(0.6)
+    controller.observe_rtt(0.3)
+
+    assert controller.decide() == pytest.approx(0.2)
+    assert controller.last_reason == "freshness"
+
+
+def test_adaptive_debounce_slow_backend_minimizes_waste():
+    controller = _debounce(freshness_target=0.5)
+    controller.observe_keystroke(0.0)
+    controller.observe_keystroke(0.2)
+    controller.observe_rtt(0.8)
+
+    assert controller.decide() == pytest.approx(0.2 * AdaptiveDebounce.default_cadence_factor)
+    assert controller.last_reason == "slow_backend"
+
+
+def test_adaptive_debounce_ignores_pauses_and_exposes_metrics():
+    controller = _debounce()
+    controller.observe_keystroke(0.0)
+    controller.observe_keystroke(5.0)  # a pause, not typing cadence
+    controller.observe_emit()
+    controller.decide()
+
+    metrics = controller.metrics()
+    assert metrics["iki_ewma_ms"] is None
+    assert metrics["keystrokes"] == 2
+    assert metrics["emitted"] == 1
+    assert metrics["absorbed"] == 1
+    assert metrics["reasons"] == {"idle": 1}
+
+
+@pytest.mark.asyncio
+async def test_submittable_textbox_feeds_keystrokes_to_controller():
+    box = SubmittableTextBox(asyncio.Queue(), SearchState())
+    box.text_w.value = "a"
+    box.text_w.value = "ab"
+    assert box.debounce.keystrokes == 2
+    assert box._debounce_delay == box.debounce.delay
+    if box._debounce_task and not box._debounce_task.done():
+        box._debounce_task.cancel()
+
+
 # ---------------------------------------------------------------------------
 # TermsButtons click handler — token_index=-1 (append) and index=N (mid-replace)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,62 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the lazily expanded JsonTree widget."""
+
+from ipywidgets import HTML
+
+from here_search_demo.widgets.json_tree import JsonTree
+
+
+def test_tree_starts_collapsed_without_building_members():
+    tree = JsonTree({"items": [{"title": "A"}]}, root="data")
+    assert tree.node.toggle.description == "▸ data {1}"
+    assert tree.node.body is None
+    assert tree.node.children == (tree.node.toggle,)
+
+
+def test_expanding_builds_one_level_only():
+    tree = JsonTree({"title": "A", "n": 1, "items": [{"title": "B"}], "empty": []}, root="data", expanded=True)
+    scalars, items, tail = tree.node.body.children
+
+    assert isinstance(scalars, HTML)
+    assert "<b>title</b>: &quot;A&quot;" in scalars.value
+    assert items.toggle.description == "▸ items [1]"
+    assert items.body is None
+    assert "<b>empty</b>: []" in tail.value
+
+
+def test_toggle_collapses_and_reuses_members():
+    tree = JsonTree({"items": [{"title": "B"}]}, root="data", expanded=True)
+    items = tree.node.body.children[0]
+    items.toggle.click()
+    body = items.body
+    assert items.toggle.description == "▾ items [1]"
+
+    items.toggle.click()
+    assert items.children == (items.toggle,)
+    items.toggle.click()
+    assert items.body is body
+
+
+def test_large_containers_are_paged():
+    tree = JsonTree(list(range(120)), root="values", expanded=True, page_size=50)
+    body = tree.node.body
+    assert body.children[-1].description == "… 70 more"
+
+    body.children[-1].click()
+    assert body.children[-1].description == "… 20 more"
+    body.children[-1].click()
+    assert tree.node.shown == 120
+    assert "<b>119</b>: 119" in body.children[-1].value
+
+
+def test_scalar_root():
+    tree = JsonTree("<b>", root="value")
+    assert "&lt;b&gt;" in tree.node.value
@@ -0,0 +1,123 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests and placement benchmark for LabelCollisionGrid."""
+
+import random
+from time import perf_counter
+
+import pytest
+
+from here_search_demo.widgets import output_helpers as fr
+from here_search_demo.widgets.label_collision import LabelCollisionGrid, collision_min_zooms
+
+
+def test_place_rejects_overlapping_bbox():
+    grid = LabelCollisionGrid()
+    assert grid.place((0, 0, 250, 20)) is True
+    assert grid.place((100, 10, 350, 30)) is False
+    assert len(grid) == 1
+
+
+def test_place_accepts_touching_bbox():
+    grid = LabelCollisionGrid()
+    grid.place((0, 0, 250, 20))
+    assert grid.place((250, 0, 500, 20)) is True
+    assert grid.place((0, 20, 250, 40)) is True
+
+
+def test_overlap_detected_across_cells_and_negative_coordinates():
+    grid = LabelCollisionGrid(cell_size=10)
+    grid.insert((-35, -5, 35, 5))
+    assert grid.overlaps((30, 0, 40, 10))
+    assert grid.overlaps((-40, -10, -30, 0))
+    assert not grid.overlaps((35, -5, 45, 5))
+
+
+def test_clear_empties_grid():
+    grid = LabelCollisionGrid()
+    grid.insert((0, 0, 10, 10))
+    grid.clear()
+    assert len(grid) == 0
+    assert not grid.overlaps((0, 0, 10, 10))
+
+
+def _label_bboxes(count: int, seed: int = 0) -> list[tuple[float, float, float, float]]:
+    """Label boxes at zoom 13 scattered around Berlin, like a dense recommendation response."""
+    rng = random.Random(seed)
+    return [
+        fr.label_pixel_bbox(
+            52.45 + rng.random() * 0.15, 13.3 + rng.random() * 0.25, 13, 250, 20 * rng.randint(1, 3), 0, 30
+        )
+        for _ in range(count)
+    ]
+
+
+def _place_brute_force(bboxes):
+    placed = []
+    for bbox in bboxes:
+        if not any(fr.pixel_bboxes_overlap(bbox, other) for other in placed):
+            placed.append(bbox)
+    return placed
+
+
+def _place_with_grid(bboxes):
+    grid = LabelCollisionGrid()
+    return [bbox for bbox in bboxes if grid.place(bbox)]
+
+
+@pytest.mark.parametrize("count", [100, 500])
+def test_grid_placement_matches_pairwise_scan(count):
+    bboxes = _label_bboxes(count)
+    assert _place_with_grid(bboxes) == _place_brute_force(bboxes)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [500, 2000])
+def test_grid_placement_benchmark(count):
+    bboxes = _label_bboxes(count)
+
+    start = perf_counter()
+    expected = _place_brute_force(bboxes)
+    brute_force_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    placed = _place_with_grid(bboxes)
+    grid_ms = (perf_counter() - start) * 1000
+
+    assert placed == expected
+    assert grid_ms < brute_force_ms
+
+
+def test_collision_min_zooms_two_labels():
+    # 100 px apart at zoom 0: they collide up to zoom 1 and separate from zoom 2 on.
+    def bbox_at(index, zoom):
+        x = index * 100 * 2**zoom
+        return x, 0, x + 250, 20
+
+    assert collision_min_zooms(2, bbox_at, 0, 5) == [0, 2]
+
+
+def test_collision_min_zooms_hidden_at_max_zoom():
+    assert collision_min_zooms(2, lambda index, zoom: (0, 0, 10, 10), 0, 5) == [0, None]
+
+
+def test_collision_min_zooms_is_monotone_and_collision_free():
+    rng = random.Random(1)
+    positions = [(52.45 + rng.random() * 0.15, 13.3 + rng.random() * 0.25, 20 * rng.randint(1, 3)) for _ in range(300)]
+
+    def bbox_at(index, zoom):
+        lat, lng, height = positions[index]
+        return fr.label_pixel_bbox(lat, lng, zoom, 250, height, 0, height // 2)
+
+    min_zooms = collision_min_zooms(len(positions), bbox_at, 0, 18)
+    for zoom in range(19):
+        shown = [i for i, min_zoom in enumerate(min_zooms) if min_zoom is not None and min_zoom <= zoom]
+        grid = LabelCollisionGrid()
+        assert all(grid.place(bbox_at(i, zoom)) for i in shown)
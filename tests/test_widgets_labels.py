@@ -107,12 +107,27 @@ def _make_geojson(*titles):
     }
 
 
-def test_redraw_labels_clears_previous_markers():
+def test_redraw_labels_reuses_pooled_marker_for_new_label():
     host = _StubHost()
-    old_marker = MagicMock()
-    host.fuel_text_markers = [old_marker]
     host._redraw_labels(_make_geojson("Place A"))
-    assert old_marker in host.removed
+    (marker,) = host.fuel_text_markers
+    host._redraw_labels(_make_geojson("Place B"))
+    assert host.fuel_text_markers == [marker]
+    assert host.added == [marker]
+    assert host.removed == []
+    assert "Place B" in marker.icon.html
+    assert marker.visible
+
+
+def test_redraw_labels_keeps_marker_of_unchanged_label():
+    host = _StubHost()
+    host._redraw_labels(_make_geojson("Place A", "Place B"))
+    markers = [label.marker for label in host._labels]
+    icons = [marker.icon for marker in markers]
+    host._redraw_labels(_make_geojson("Place A", "Place B"))
+    assert [label.marker for label in host._labels] == markers
+    assert [marker.icon for marker in markers] == icons
+    assert len(host.added) == 2
 
 
 def test_redraw_labels_adds_markers_to_map():
@@ -121,13 +136,14 @@ def test_redraw_labels_adds_markers_to_map():
     assert len(host.added) == 1
 
 
-def test_redraw_labels_empty_collection_clears_only():
+def test_redraw_labels_empty_collection_hides_and_pools_markers():
     host = _StubHost()
-    old = MagicMock()
-    host.fuel_text_markers = [old]
+    host._redraw_labels(_make_geojson("Place A"))
+    (marker,) = host.fuel_text_markers
     host._redraw_labels({"type": "FeatureCollection", "features": []})
-    assert old in host.removed
-    assert host.fuel_text_markers == []
+    assert not marker.visible
+    assert host._label_marker_pool == [marker]
+    assert host.removed == []
 
 
 # ---------------------------------------------------------------------------
@@ -135,22 +151,59 @@ def test_redraw_labels_empty_collection_clears_only():
 # ---------------------------------------------------------------------------
 
 
-def test_zoom_observer_triggers_redraw_when_geojson_present():
-    """Regression: zoom observer must use _last_geojson_data (not the defunct
-    _last_response_geojson) so label redraw actually fires on zoom changes."""
-    host = _StubHost()
-    geojson = _make_geojson("Place A")
+def test_zoom_observer_toggles_marker_visibility_without_redraw():
+    """Zoom changes reuse the markers built for the result set and only flip ``visible``."""
+    host = _StubHost(zoom=18)
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [2.3 + i * 0.01, 48.8]},
+                "properties": {"title": f"Place {i}", "_rank": i, "resultType": "place"},
+            }
+            for i in range(2)
+        ],
+    }
     host._last_geojson_data = geojson
+    host._redraw_labels(geojson)
+    first, second = host.fuel_text_markers
+    assert [label.min_zoom for label in host._labels] == [0, 16]
 
     redraw_calls = []
     host._redraw_labels = lambda data: redraw_calls.append(data)  # type: ignore[method-assign]
-
-    # Simulate the zoom observer firing (it was registered in _init_labels)
     zoom_observer = next(cb for cb, names in host._observers if names == ["zoom"])
-    zoom_observer({"name": "zoom", "new": 14})
 
-    assert len(redraw_calls) == 1
-    assert redraw_calls[0] is geojson
+    host.zoom = 12
+    zoom_observer({"name": "zoom", "new": 12})
+    assert first.visible and not second.visible
+
+    host.zoom = 17
+    zoom_observer({"name": "zoom", "new": 17})
+    assert first.visible and second.visible
+
+    assert redraw_calls == []
+    assert host.added == [first, second]
+    assert host.removed == []
+
+
+def test_redraw_labels_creates_markers_lazily_for_current_zoom():
+    host = _StubHost(zoom=10)
+    host._redraw_labels(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [2.3 + i * 0.01, 48.8]},
+                    "properties": {"title": f"Place {i}", "_rank": i, "resultType": "place"},
+                }
+                for i in range(2)
+            ],
+        }
+    )
+    assert len(host.added) == 1
+    assert len(host._labels) == 2
 
 
 def test_zoom_observer_does_not_redraw_when_no_geojson():
@@ -11,13 +11,14 @@ import asyncio
 
 import pytest
 from unittest.mock import MagicMock
+from ipyleaflet import GeoJSON
 
 from here_search_demo.entity.endpoint import Endpoint
 from here_search_demo.entity.intent import SearchIntent
 from here_search_demo.entity.request import Request
 from here_search_demo.entity.response import LocationResponseItem, Response
 from here_search_demo.widgets.route import RouteController
-from here_search_demo.widgets.output_details import DetailsMixin, ResultDetailsBox
+from here_search_demo.widgets.output_details import DetailsHtmlCache, DetailsMixin, ResultDetailsBox
 from here_search_demo.widgets.output_map import ResponseMap
 from here_search_demo.widgets.output_buttons import SearchResultButtons
 from here_search_demo.widgets.state import MapState, SearchState
@@ -29,7 +30,8 @@ class _DetailsTester(DetailsMixin):
 
 
 @pytest.fixture
-def details_tester():
+def details_tester(monkeypatch):
+    monkeypatch.setattr(DetailsMixin, "html_cache", DetailsHtmlCache())
     return _DetailsTester()
 
 
@@ -138,6 +140,56 @@ def test_details_mixin_html_includes_fuel_types_without_price(details_tester):
     assert "e10" in html
 
 
+def _cafe(**overrides):
+    data = {
+        "id": "here:pds:place:cafe",
+        "resultType": "place",
+        "title": "Cafe",
+        "address": {"label": "Cafe, 1 Main St, City"},
+        "categories": [{"primary": True, "id": "100-1100-0010", "name": "Cafe"}],
+        "openingHours": [{"isOpen": True, "text": ["Mo-Fr: 08:00 - 18:00"]}],
+    }
+    data.update(overrides)
+    return data
+
+
+def test_details_html_cache_is_shared_by_equal_items(details_tester):
+    # The same place from autosuggest then lookup: different dicts, different extra fields.
+    html = details_tester.html(_cafe(_rank=3))
+    assert details_tester.html(_cafe(_rank=0, title="Café")) is html
+    assert details_tester.html_cache.stats()["hits"] == 1
+
+
+def test_details_html_cache_misses_on_rendered_content_change(details_tester):
+    open_html = details_tester.html(_cafe())
+    closed_html = details_tester.html(_cafe(openingHours=[{"isOpen": False, "text": []}]))
+    assert "Open" in open_html
+    assert "Closed" in closed_html
+    assert details_tester.html(_cafe(), image_variant="original") is not open_html
+    assert details_tester.html_cache.stats()["misses"] == 3
+
+
+def test_details_html_cache_evicts_least_recently_used():
+    cache = DetailsHtmlCache(max_entries=2)
+    keys = [DetailsHtmlCache.key(_cafe(id=str(i))) for i in range(3)]
+    cache.put(keys[0], "0")
+    cache.put(keys[1], "1")
+    assert cache.get(keys[0]) == "0"
+    cache.put(keys[2], "2")
+
+    assert keys[1] not in cache
+    assert keys[0] in cache and keys[2] in cache
+    assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 1, "entries": 2, "hit_rate": 1.0}
+
+
+def test_details_prerender_html_fills_the_cache(details_tester):
+    items = [_cafe(id="a"), _cafe(id="b")]
+    assert details_tester.prerender_html(items, image_variant="original") == 2
+    assert details_tester.prerender_html(items, image_variant="original") == 0
+    details_tester.html(items[1], image_variant="original")
+    assert details_tester.html_cache.stats()["hits"] == 1
+
+
 def test_result_details_box_uses_popup_like_container():
     details = ResultDetailsBox(
         {
@@ -164,8 +216,9 @@ def test_widget_css_resources_include_label_pointer_and_popup_rules():
     assert ".leaflet-popup-tip" in popup_css
 
 
-class _FakeGeoJSON:
+class _FakeGeoJSON(GeoJSON):
     def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self.kwargs = kwargs
         self._click = None
         self._hover = None
@@ -245,15 +298,19 @@ class _StubResponseMap(ResponseMap):
         self.queue = queue
         self.state = state
         self.collection = None
-        self.fuel_text_markers = []
-        self._label_render_cache = {}
-        self._last_geojson_data = None
         self.map_state = MapState()
         self.added = []
         self.removed = []
         self.long_press_popup = None
         self.short_press_popup = None
         self.route = RouteController(self, MagicMock())
+        self._details_prerender = None
+        self.detour_polylines = None
+        self._detour_task = None
+        self._init_labels()
+
+    def observe(self, *args, **kwargs):  # type: ignore[override]
+        pass
 
     def add(self, obj):  # type: ignore[override]
         # Record every object added (GeoJSON first, then Popup on click).
@@ -291,7 +348,7 @@ async def test_response_map_display_emits_more_details(monkeypatch):
     get_more_details handler.
     """
     geo_factory = _GeoFactory()
-    monkeypatch.setattr("here_search_demo.widgets.output_map.GeoJSON", geo_factory)
+    monkeypatch.setattr("here_search_demo.widgets.output_layer.GeoJSON", geo_factory)
     monkeypatch.setattr("here_search_demo.widgets.output_map.Popup", _FakePopup)
 
     queue = _DummyQueue()
@@ -302,17 +359,17 @@ async def test_response_map_display_emits_more_details(monkeypatch):
     fmap = _StubResponseMap(queue=queue, state=state)
     fmap.display(resp, fit=False)
 
-    # GeoJSON should be created once with the response
+    # One GeoJSON layer should be created for the single result
     assert len(geo_factory.instances) == 1
     fake_geo = geo_factory.instances[0]
-    feature = fake_geo.kwargs["data"]["features"][0]
+    feature = fake_geo.kwargs["data"]
 
     # Simulate a click; this should create and add a Popup.
     assert fake_geo._click is not None
     fake_geo._click(None, feature)
     await asyncio.sleep(0)
 
-    # First object added is the GeoJSON layer; second is the Popup for the click.
+    # First object added is the result layer; the last one is the Popup for the click.
     assert len(fmap.added) >= 2
     popup = fmap.added[-1]
     assert isinstance(popup, _FakePopup)
@@ -320,6 +377,24 @@ async def test_response_map_display_emits_more_details(monkeypatch):
     assert popup.close_button is True
 
 
+async def test_response_map_display_prerenders_top_result_details(monkeypatch):
+    monkeypatch.setattr("here_search_demo.widgets.output_layer.GeoJSON", _GeoFactory())
+    monkeypatch.setattr(DetailsMixin, "html_cache", DetailsHtmlCache())
+    state = SearchState()
+    resp = _sample_response()
+    state.hydrate(resp)
+    fmap = _StubResponseMap(queue=_DummyQueue(), state=state)
+
+    fmap.display(resp, fit=False)
+    item = resp.data["items"][0]
+    assert DetailsHtmlCache.key(item, "original") not in fmap.html_cache
+    assert await fmap._details_prerender == 1
+
+    assert DetailsHtmlCache.key(item, "original") in fmap.html_cache
+    fmap.html(item, image_variant="original")
+    assert fmap.html_cache.stats()["hits"] == 1
+
+
 def test_response_map_on_feature_click_calls_show_popup_and_emits_action(monkeypatch):
     """_on_feature_click is callable directly without display() wiring."""
     queue = _DummyQueue()
@@ -526,6 +601,34 @@ def test_response_map_click_result_uses_future_position_for_detour_lookup(monkey
     assert drawn == [("poly_from", "poly_to")]
 
 
+async def test_response_map_click_result_routes_uncached_detour_on_demand(monkeypatch):
+    queue = _DummyQueue()
+    state = SearchState()
+    state.hydrate(_search_response("Foo"))
+    fmap = _StubResponseMap(queue=queue, state=state)
+
+    fmap.route.has_route = True
+    fmap.route.ranking_mode.travel_time = True
+    fmap.route.current_position = (48.8, 2.3)
+    fmap.route.stop_position = (48.9, 2.4)
+
+    drawn, requested = [], []
+    monkeypatch.setattr(
+        fmap.route, "draw_detour_routes", lambda route_from, route_to: drawn.append((route_from, route_to))
+    )
+
+    async def detour_polylines(item):
+        requested.append(item["title"])
+        return "poly_to", "poly_from"
+
+    fmap.detour_polylines = detour_polylines
+    fmap.click_result(0, emit_action=False, recenter=False, show_details=False)
+    await fmap._detour_task
+
+    assert requested == ["Foo"]
+    assert drawn == [("poly_from", "poly_to")]
+
+
 def test_response_map_clear_results_removes_detour_routes(monkeypatch):
     queue = _DummyQueue()
     state = SearchState()
@@ -7,12 +7,17 @@
 #
 ###############################################################################
 
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch
 import orjson
 
-from here_search_demo.widgets.output_json import SearchResultJson, SearchResultList
+from here_search_demo.entity.endpoint import Endpoint
+from here_search_demo.entity.request import Request
 from here_search_demo.entity.response import Response
+from here_search_demo.widgets.json_tree import JsonTree
+from here_search_demo.widgets.output_json import SearchResultJson, SearchResultList
 
 
 class TestSearchResultList:
@@ -187,9 +192,11 @@ class TestSearchResultJson:
         from ipywidgets import Output
 
         assert isinstance(result, Output)
-        # Verify _vicinity was injected
-        assert response_data["items"][0]["_vicinity"] == "test vicinity"
-        assert response_data["items"][1]["_vicinity"] == "other vicinity"
+        # Verify _vicinity was injected in the displayed copy, not in the response
+        displayed = mock_ijson.call_args_list[0].args[0]
+        assert displayed["items"][0]["_vicinity"] == "test vicinity"
+        assert displayed["items"][1]["_vicinity"] == "other vicinity"
+        assert "_vicinity" not in response_data["items"][0]
 
     def test_pool_recycling_on_exhaustion(self):
         """Test pool is recycled when exhausted."""
@@ -214,3 +221,64 @@ class TestSearchResultJson:
 
         assert isinstance(cleared, Output)
         assert widget._pool_index == 1
+
+
+class TestSearchResultJsonLazy:
+    """Test the lazy, throttled SearchResultJson view."""
+
+    @staticmethod
+    def _response(title):
+        data = {"items": [{"id": "1", "title": title}]}
+        return Response(req=Request(endpoint=Endpoint.DISCOVER), data=data, x_headers={}, raw=orjson.dumps(data))
+
+    def test_display_renders_collapsed_tree(self):
+        widget = SearchResultJson(lazy=True)
+        widget.display(self._response("A"))
+
+        tree = widget.children[0]
+        assert isinstance(tree, JsonTree)
+        data_node, headers_node = tree.node.body.children
+        assert data_node.toggle.description == "▸ data {1}"
+        assert data_node.body is None
+        assert "<b>headers</b>" in headers_node.value
+
+    async def test_display_throttles_to_latest_response(self):
+        widget = SearchResultJson(lazy=True)
+        widget.throttle_s = 0.01
+        widget.display(self._response("A"))
+        widget.display(self._response("B"))
+        assert not isinstance(widget.children[0], JsonTree)
+
+        await asyncio.sleep(0.05)
+        tree = widget.children[0]
+        assert tree.value["data"]["items"][0]["title"] == "B"
+
+    def test_hidden_pane_renders_on_show(self):
+        widget = SearchResultJson(lazy=True)
+        widget.layout.display = "none"
+        widget.display(self._response("A"))
+        assert not isinstance(widget.children[0], JsonTree)
+
+        widget.layout.display = None
+        assert widget.children[0].value["data"]["items"][0]["title"] == "A"
+
+    def test_clear_drops_pending_response(self):
+        widget = SearchResultJson(lazy=True)
+        widget.layout.display = "none"
+        widget.display(self._response("A"))
+        widget.clear()
+        widget.layout.display = None
+        assert not isinstance(widget.children[0], JsonTree)
+
+    def test_payload_copies_responses_without_raw_body(self):
+        from here_search_demo.entity.response_data import make_response
+
+        items = [{"id": "1", "title": "A", "position": {"lat": 52.5, "lng": 13.4}}]
+        response = Response(req=Request(endpoint=Endpoint.DISCOVER), data=make_response({"items": items}))
+        widget = SearchResultJson(lazy=True)
+
+        data = widget._payload(response, {0: {"_vicinity": "Berlin"}})
+
+        assert data["items"][0]["_vicinity"] == "Berlin"
+        assert data["items"][0] is not items[0]
+        assert "_vicinity" not in items[0]
@@ -0,0 +1,152 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for the keyed, diffing ResultLayer."""
+
+from here_search_demo.widgets import output_helpers as fr
+from here_search_demo.widgets.output_layer import ResultLayer
+
+
+def _feature(item_id, rank, title=None, lng=13.4):
+    properties = {"title": title or f"Place {item_id}", "_rank": rank, "resultType": "place"}
+    if item_id is not None:
+        properties["id"] = item_id
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lng, 52.5]}, "properties": properties}
+
+
+def _collection(*features):
+    return {"type": "FeatureCollection", "features": list(features)}
+
+
+def _layer():
+    return ResultLayer(point_style={"radius": 7}, style_callback=fr.style_callback)
+
+
+def test_update_adds_one_layer_per_feature():
+    layer = _layer()
+    assert layer.update(_collection(_feature("a", 0), _feature("b", 1))) == (2, 0, 0)
+    assert len(layer.layers) == 2
+    assert [f["properties"]["id"] for f in layer.data["features"]] == ["a", "b"]
+
+
+def test_update_with_same_features_sends_nothing():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0), _feature("b", 1)))
+    layers = layer.layers
+    assert layer.update(_collection(_feature("a", 0), _feature("b", 1))) == (0, 0, 0)
+    assert layer.layers is layers
+
+
+def test_update_diffs_additions_removals_and_changes():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0), _feature("b", 1), _feature("c", 2)))
+    layer_a = layer.layers[0]
+
+    added, removed, changed = layer.update(_collection(_feature("c", 0), _feature("a", 1), _feature("d", 2)))
+
+    assert (added, removed, changed) == (1, 1, 0)  # d added, b removed, a and c only re-ranked
+    assert layer.layers[1] is layer_a
+    assert layer.data["features"][1]["properties"]["_rank"] == 1
+
+
+def test_update_detects_in_place_property_changes():
+    layer = _layer()
+    feature = _feature("a", 0)
+    layer.update(_collection(feature))
+    feature["properties"]["openingHours"] = [{"isOpen": True}]
+    assert layer.update(_collection(feature)) == (0, 0, 1)
+
+
+def test_update_leaves_order_annotations_out_of_the_diff():
+    layer = _layer()
+    features = [_feature("a", 0), _feature("b", 1)]
+    layer.update(_collection(*features))
+    data = {result: result.data for result in layer.layers}
+
+    features[0]["properties"]["_detour"] = {"label": "+3 min"}
+    assert layer.update(_collection(_feature("b", 0), features[0])) == (0, 0, 0)
+    assert {result: result.data for result in layer.layers} == data
+
+
+def test_clicks_see_the_current_feature_of_a_layer():
+    clicked = []
+    layer = ResultLayer(
+        point_style={"radius": 7},
+        style_callback=fr.style_callback,
+        on_click=lambda **kwargs: clicked.append(kwargs["feature"]["properties"]),
+    )
+    layer.update(_collection(_feature("a", 0), _feature("b", 1)))
+    layer_a = layer.layers[0]
+    layer.update(_collection(_feature("b", 0), _feature("a", 1)))
+
+    layer_a._handle_mouse_events(None, {"event": "click", "feature": layer_a.data}, [])
+
+    assert [(item["id"], item["_rank"]) for item in clicked] == [("a", 1)]
+
+
+def test_duplicate_ids_are_keyed_by_occurrence():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0), _feature("b", 1), _feature("a", 2, lng=13.5)))
+    layers = layer.layers
+
+    assert layer.update(_collection(_feature("b", 0), _feature("a", 1), _feature("a", 2, lng=13.5))) == (0, 0, 0)
+    assert set(layer.layers) == set(layers)
+
+
+def test_features_without_id_are_keyed_by_title_and_position():
+    layer = _layer()
+    layer.update(_collection(_feature(None, 0, "Foo"), _feature(None, 1, "Foo", lng=13.5)))
+    assert len(layer.layers) == 2
+    assert layer.update(_collection(_feature(None, 0, "Foo"))) == (0, 1, 0)
+
+
+def test_clear_removes_all_layers():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0)))
+    layer.clear()
+    assert layer.layers == ()
+    assert layer.data["features"] == []
+
+
+def test_update_reuses_features_derived_on_arrival(monkeypatch):
+    features = [_feature(str(i), i) for i in range(20)]
+    cache = {}
+    for feature in features:
+        fr.item_features(feature["properties"], cache)
+    derived = []
+    derive = fr.derive_item_features
+    monkeypatch.setattr(fr, "derive_item_features", lambda item: derived.append(item) or derive(item))
+
+    layer = ResultLayer(point_style={"radius": 7}, style_callback=lambda feature: fr.style_callback(feature, cache))
+    layer.update(_collection(*features))
+    assert derived == []
+    assert all("_features" not in layer.data["features"][i]["properties"] for i in range(20))
+
+
+def test_update_reuses_then_closes_the_layers_of_removed_results():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0), _feature("b", 1), _feature("c", 2)))
+    a, b, c = layer.layers
+
+    assert layer.update(_collection(_feature("a", 0), _feature("d", 1))) == (1, 2, 0)
+    assert layer.layers[0] is a
+    # One removed layer now shows "d", the other one is closed.
+    assert layer.layers[1] in (b, c)
+    assert layer.layers[1].data["properties"]["id"] == "d"
+    closed = c if layer.layers[1] is b else b
+    assert closed.comm is None
+
+
+def test_close_closes_the_result_layers():
+    layer = _layer()
+    layer.update(_collection(_feature("a", 0)))
+    (result,) = layer.layers
+    layer.close()
+    assert result.comm is None
+    assert layer.comm is None
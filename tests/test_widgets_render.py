@@ -0,0 +1,161 @@
+###############################################################################
+#
+# Copyright (c) 2026 HERE Europe B.V.
+#
+# SPDX-License-Identifier: MIT
+# License-Filename: LICENSE
+#
+###############################################################################
+
+"""Tests for render transactions."""
+
+import asyncio
+
+from ipywidgets import Button, Widget
+
+from here_search_demo.entity.endpoint import Endpoint
+from here_search_demo.entity.intent import SearchIntent
+from here_search_demo.entity.request import Request
+from here_search_demo.entity.response import Response
+from here_search_demo.widgets.app import OneBoxMap
+from here_search_demo.widgets.render import render_transaction
+
+_WIDGET_SEND = Widget._send
+
+
+def _record_sends(widget) -> list:
+    sent = []
+    widget.comm.send = lambda data=None, buffers=None, **kwargs: sent.append(data)
+    return sent
+
+
+def test_widget_updates_are_sent_one_by_one_outside_transaction():
+    button = Button()
+    sent = _record_sends(button)
+    button.description = "a"
+    button.icon = "search"
+    assert len(sent) == 2
+
+
+def test_transaction_coalesces_updates_of_a_widget_into_one_message():
+    button = Button()
+    sent = _record_sends(button)
+    with render_transaction([button]) as transaction:
+        button.description = "a"
+        button.icon = "search"
+        button.tooltip = "b"
+        assert sent == []
+    assert len(sent) == 1
+    assert sent[0]["state"] == {"description": "a", "icon": "search", "tooltip": "b"}
+    assert transaction.messages == 1
+    assert not button._holding_sync
+
+
+def test_transaction_sends_updates_of_widgets_it_does_not_hold():
+    held, other = Button(), Button()
+    sent = _record_sends(other)
+    with render_transaction([held]) as transaction:
+        other.description = "a"
+        assert len(sent) == 1
+    assert transaction.messages == 1
+
+
+def test_transaction_counts_the_opens_of_widgets_it_creates():
+    with render_transaction() as transaction:
+        button = Button()
+        sent = _record_sends(button)
+        button.description = "a"
+    assert len(sent) == 1
+    # The comm opens of the button, its layout and its style, and the update.
+    assert transaction.messages == 4
+    assert Widget._send is _WIDGET_SEND
+
+
+def test_transaction_does_not_count_after_commit():
+    button = Button()
+    _record_sends(button)
+    with render_transaction([button]) as transaction:
+        button.description = "a"
+    button.icon = "search"
+    assert transaction.messages == 1
+
+
+def test_transaction_does_not_count_unchanged_widgets():
+    button = Button()
+    _record_sends(button)
+    with render_transaction([button]) as transaction:
+        pass
+    assert transaction.messages == 0
+
+
+def test_nested_transactions_join_the_outermost_one():
+    commits = []
+    button = Button()
+    sent = _record_sends(button)
+    with render_transaction(on_commit=commits.append) as outer:
+        with render_transaction([button], on_commit=commits.append) as inner:
+            button.description = "a"
+        assert inner is outer
+        assert sent == []
+        button.icon = "search"
+    assert len(sent) == 1
+    assert commits == [outer, outer]
+
+
+def test_oneboxmap_records_paint_messages():
+    app = OneBoxMap(map_only=True, on_map=True)
+    resp = Response(
+        req=Request(endpoint=Endpoint.AUTOSUGGEST, params={}),
+        data={
+            "items": [
+                {"id": str(i), "title": f"Place {i}", "resultType": "place", "position": {"lat": 52.5, "lng": 13.4 + i}}
+                for i in range(3)
+            ],
+            "queryTerms": [{"term": "place"}],
+        },
+    )
+    intent = SearchIntent(kind="transient_text", materialization="pla", time=0.0)
+
+    app.handle_suggestion_list(intent, resp)
+
+    assert app.last_paint_messages > 0
+    first_paint = app.last_paint_messages
+    app.handle_suggestion_list(intent, resp)
+    # Nothing changed: the second paint reuses every widget and sends less.
+    assert app.last_paint_messages < first_paint
+
+
+async def test_tasks_spawned_by_a_paint_do_not_hold_the_map():
+    app = OneBoxMap(map_only=True, on_map=True)
+    sent = _record_sends(app.map_w)
+    resp = Response(
+        req=Request(endpoint=Endpoint.DISCOVER, params={}),
+        data={"items": [{"id": "1", "title": "Place", "resultType": "place", "position": {"lat": 52.5, "lng": 13.4}}]},
+    )
+    intent = SearchIntent(kind="submitted_text", materialization="place", time=0.0)
+
+    app.handle_result_list(intent, resp)
+    # The paint scheduled a recenter task, which now moves the map.
+    for _ in range(3):
+        await asyncio.sleep(0)
+    app.map_w._fit_task.cancel()
+
+    assert any("center" in message["state"] for message in sent)
+    assert not app.map_w._holding_sync
+    sent.clear()
+    app.map_w.zoom = 3
+    assert len(sent) == 1
+
+
+def test_oneboxmap_paint_holds_only_the_shown_rows():
+    app = OneBoxMap(map_only=True, on_map=True)
+    resp = Response(
+        req=Request(endpoint=Endpoint.DISCOVER, params={}),
+        data={"items": [{"id": str(i), "title": f"Place {i}", "resultType": "place"} for i in range(3)]},
+    )
+
+    held = list(app._paint_widgets(app._result_rows(resp)))
+
+    rows = app.result_buttons_w.buttons
+    assert rows[2] in held
+    assert not any(widget in held for widget in (rows[3], rows[3].button))
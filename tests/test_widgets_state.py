@@ -7,12 +7,16 @@
 #
 ###############################################################################
 
+import copy
+import random
+
 import pytest
 
 from here_search_demo.entity.endpoint import Endpoint
 from here_search_demo.entity.request import Request
 from here_search_demo.entity.response import Response
-from here_search_demo.widgets.state import MapState, SearchState, _get_vicinity
+from here_search_demo.widgets import output_helpers
+from here_search_demo.widgets.state import MapState, SearchState, _get_vicinity, _VicinityIndex
 
 
 @pytest.fixture
@@ -61,6 +65,25 @@ def test_search_state_update_item(autosuggest_response):
     assert state.get_item(1).data["title"] == "Baz"
 
 
+def test_search_state_derives_item_features_on_arrival(autosuggest_response, monkeypatch):
+    derived = []
+    derive = output_helpers.derive_item_features
+    monkeypatch.setattr(output_helpers, "derive_item_features", lambda item: derived.append(item) or derive(item))
+    state = SearchState()
+    state.hydrate(autosuggest_response)
+    assert derived == list(state.items_data_by_rank.values())
+
+    place = {"id": "here:pds:place:1", "title": "Foo", "resultType": "place", "position": {"lat": 1, "lng": 2}}
+    state.hydrate(Response(req=autosuggest_response.req, data={"items": [place]}))
+    listed = state.features_by_id["here:pds:place:1"]
+
+    details = {**place, "categories": [{"primary": True, "id": "100-1000-0000"}]}
+    state.update_item(0, details, autosuggest_response)
+    # The looked-up details replace the features derived for the listed item.
+    assert derived[-1] is details
+    assert state.features_by_id["here:pds:place:1"] is not listed
+
+
 def test_search_state_query_and_terms():
     state = SearchState()
     state.set_query_text("hello")
@@ -133,3 +156,62 @@ def test_non_bracketed_title_still_disambiguated():
     }
     result = _get_vicinity(items)
     assert result[0] != result[1]
+
+
+# ---------------------------------------------------------------------------
+# _VicinityIndex – incremental disambiguation
+# ---------------------------------------------------------------------------
+
+
+def test_search_state_update_item_redisambiguates_colliding_items():
+    resp = Response(
+        req=Request(endpoint=Endpoint.DISCOVER),
+        data={
+            "items": [
+                _item("Café", "Café, Rue de Rivoli, Paris, France"),
+                _item("Bar", "Bar, Rue de Rivoli, Paris, France"),
+            ]
+        },
+    )
+    state = SearchState()
+    state.hydrate(resp)
+    assert state.title_for(0) == "Café"
+
+    state.update_item(1, _item("Café", "Café, Boulevard Haussmann, Paris, France"), resp)
+    assert state.title_for(0) == "Café, Rue de Rivoli, Paris"
+    assert state.title_for(1) == "Café, Boulevard Haussmann, Paris"
+
+    state.update_item(1, _item("Bar", "Bar, Rue de Rivoli, Paris, France"), resp)
+    assert state.title_for(0) == "Café"
+    assert state.get_item_data(0)["_vicinity"] == ["Café"]
+
+
+def _random_item(rng: random.Random) -> dict:
+    if rng.random() < 0.1:
+        return {"title": rng.choice(["Café", "Fuel"]), "resultType": "categoryQuery"}
+    name = rng.choice(["Café", "Café, Bar", "Shell", "Post (Main)", ""])
+    parts = [name]
+    for choices in (["Main St 1", "Main St 2", ""], ["Berlin", "Paris", ""], ["BE", "IDF"]):
+        if rng.random() < 0.7:
+            parts.append(rng.choice(choices))
+    if rng.random() < 0.9:
+        parts.append(rng.choice(["Germany", "France"] if rng.random() < 0.3 else ["Germany"]))
+    item = {"title": rng.choice([name, "Café (Downtown)"]), "resultType": "place"}
+    if rng.random() < 0.9:
+        item["address"] = {"label": ", ".join(parts)}
+    return item
+
+
+def test_vicinity_index_replace_matches_full_recomputation():
+    rng = random.Random(0)
+    for _ in range(500):
+        items = {rank: _random_item(rng) for rank in range(rng.randint(0, 10))}
+        index = _VicinityIndex(items)
+        for _ in range(5):
+            rank = rng.randint(0, len(items))  # may also append a new rank
+            items[rank] = _random_item(rng)
+            expected_items = copy.deepcopy(items)
+            expected = _get_vicinity(expected_items)
+            index.replace(rank)
+            assert index.titles == expected
+            assert items == expected_items